@@ -0,0 +1,94 @@
+#
+#
+#
+"""Memory and allocation benchmarks of `AdapCfgBag` snapshots driven by
+`FakeWmiBackend`. Run it from the root of the repository:
+
+    python -m benchmarks.bench_memory --adaps 2000 --hosts 20
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+from time import perf_counter
+import tracemalloc
+from typing import Callable, TypeVar
+
+from ntwrk import AdapCfgBag, NetAdap
+from ntwrk.backend import setBackend
+from ntwrk.fake_backend import FakeWmiBackend
+
+
+_T = TypeVar('_T')
+
+
+def _traced(func: Callable[[], _T]) -> tuple[_T, int]:
+    """Calls `func` and returns its result alongside the bytes it kept
+    allocated.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        res = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return res, size
+
+
+def _countItems(bag: AdapCfgBag) -> int:
+    n = 0
+    for idx, _ in bag.iterAdaps():
+        n += 1 + sum(1 for _ in bag.iterConfigs(idx))
+    return n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--adaps', type=int, default=2000,
+        help='the number of adapters per host (default: %(default)s)')
+    parser.add_argument('--hosts', type=int, default=20,
+        help='the number of host snapshots held (default: %(default)s)')
+    args = parser.parse_args()
+    backends = [
+        FakeWmiBackend(n_physical=args.adaps, seed=seed)
+        for seed in range(args.hosts)]
+    try:
+        # Measuring a single snapshot...
+        setBackend(backends[0])
+        bag, size = _traced(NetAdap.anumWinNetAdaps)
+        nItems = _countItems(bag)
+        print(f'{"one snapshot":<28}{nItems:>9} items '
+            f'{size / 2**20:>9.2f} MiB {size / nItems:>9.0f} B/item')
+        # Measuring ACIdx allocations while iterating...
+        idxs, size = _traced(lambda: [
+            cfgIdx
+            for adapIdx, _ in bag.iterAdaps()
+            for cfgIdx, _ in bag.iterConfigs(adapIdx)])
+        print(f'{"ACIdx while iterating":<28}{len(idxs):>9} idxs '
+            f'{size / 2**20:>9.2f} MiB {size / len(idxs):>9.0f} B/idx')
+        startTime = perf_counter()
+        for _ in range(10):
+            for adapIdx, _ in bag.iterAdaps():
+                for _ in bag.iterConfigs(adapIdx):
+                    pass
+        rate = 10 * len(idxs) / (perf_counter() - startTime)
+        print(f'{"iterating":<28}{rate:>18,.0f} idxs/s')
+        del idxs
+        # Measuring a fleet of snapshots...
+        def readFleet() -> list[AdapCfgBag]:
+            bags = list[AdapCfgBag]()
+            for backend in backends:
+                setBackend(backend)
+                bags.append(NetAdap.anumWinNetAdaps())
+            return bags
+        bags, size = _traced(readFleet)
+        nItems = sum(_countItems(bag) for bag in bags)
+        print(f'{f"{args.hosts} host snapshots":<28}{nItems:>9} items '
+            f'{size / 2**20:>9.2f} MiB {size / nItems:>9.0f} B/item')
+    finally:
+        setBackend(None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#
+#
+#
+"""Benchmarks of the `ntwrk` layer driven by `FakeWmiBackend`. Run it from
+the root of the repository:
+
+    python -m benchmarks.bench_ntwrk --adaps 2000 --events 20000
+"""
+
+from __future__ import annotations
+import argparse
+from time import perf_counter
+from typing import Callable
+
+from ntwrk import MAC, AdapCfgBag, NetAdap, NetConfig, diffBags
+from ntwrk.backend import setBackend
+from ntwrk.fake_backend import ADAP_CLASS, FakeEvent, FakeWmiBackend
+
+
+def _timeIt(
+        name: str,
+        n_objs: int,
+        func: Callable[[], object],
+        repeat: int = 3,
+        ) -> float:
+    """Runs `func` `repeat` times and prints the best rate as objects per
+    second. It returns the best time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        startTime = perf_counter()
+        func()
+        best = min(best, perf_counter() - startTime)
+    rate = n_objs / best if best else float('inf')
+    print(f'{name:<32}{n_objs:>9} objs {best * 1000:>10.2f} ms '
+        f'{rate:>14,.0f} objs/s')
+    return best
+
+
+def renderConfig(config: NetConfig) -> None:
+    """Accesses the properties of the config the way the views do."""
+    config.connectivity()
+    config.dnsProvided()
+    config.dhcpAccess()
+    config.IPAddress
+    config.DNSServerSearchOrder
+    config.DefaultIPGateway
+    config.DHCPServer
+    config.MACAddress
+
+
+def applyEvent(bag: AdapCfgBag, event: FakeEvent) -> bool:
+    """Applies the event to the bag the way `DnsWin` handlers do, without
+    the views. It returns whether the bag changed.
+    """
+    isAdap = event.wmi_class == ADAP_CLASS
+    try:
+        item = NetAdap(event.ole_object) if isAdap else \
+            NetConfig(event.ole_object)
+    except TypeError:
+        return False
+    try:
+        idx = bag.indexAdap(item) if isAdap else bag.indexConfig(item) # type: ignore
+    except (IndexError, ValueError):
+        idx = None
+    match event.event_type:
+        case 'Modification':
+            return idx is not None and bool(bag[idx].update(item))
+        case 'Creation':
+            if idx is not None:
+                return False
+            try:
+                if isAdap:
+                    bag.addAdap(item) # type: ignore
+                else:
+                    bag.addConfig(item) # type: ignore
+            except (IndexError, ValueError):
+                return False
+            return True
+        case 'Deletion':
+            if idx is None:
+                return False
+            bag.delIdx(idx)
+            return True
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--adaps', type=int, default=2000,
+        help='the number of adapters (default: %(default)s)')
+    parser.add_argument('--virtual-ratio', type=float, default=0.6,
+        help='the ratio of virtual adapters (default: %(default)s)')
+    parser.add_argument('--vpn-ratio', type=float, default=0.2,
+        help='the ratio of VPN adapters (default: %(default)s)')
+    parser.add_argument('--events', type=int, default=20000,
+        help='the number of scripted events (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    nVirtual = int(args.adaps * args.virtual_ratio)
+    nVpn = int(args.adaps * args.vpn_ratio)
+    backend = FakeWmiBackend(
+        n_physical=args.adaps - nVirtual - nVpn,
+        n_virtual=nVirtual,
+        n_vpn=nVpn,
+        seed=args.seed)
+    setBackend(backend)
+    try:
+        rawAdaps = list(backend.readAdaps())
+        rawConfigs = list(backend.readConfigs())
+        _timeIt(
+            'NetAdap.__init__',
+            len(rawAdaps),
+            lambda: [NetAdap(obj) for obj in rawAdaps])
+        _timeIt(
+            'NetConfig.__init__',
+            len(rawConfigs),
+            lambda: [NetConfig(obj) for obj in rawConfigs])
+        nPhysical = len(NetAdap.readAll())
+        _timeIt('NetAdap.readAll', nPhysical, NetAdap.readAll)
+        _timeIt('NetConfig.readAll', len(rawConfigs), NetConfig.readAll)
+        _timeIt(
+            'AdapCfgBag (enumerate)',
+            nPhysical + len(rawConfigs),
+            NetAdap.anumWinNetAdaps)
+        configs = NetConfig.readAll()
+        mpIdxConfig = {config.Index: config for config in configs}
+        peers = [
+            (mpIdxConfig[config.Index], config)
+            for config in map(NetConfig, rawConfigs)]
+        _timeIt(
+            'NetConfig.update (no change)',
+            len(peers),
+            lambda: [config.update(peer) for config, peer in peers])
+        macs = [obj.MACAddress for obj in rawAdaps if obj.MACAddress]
+        _timeIt(
+            'MAC parse',
+            len(macs),
+            lambda: [MAC._parse(mac) for mac in macs])
+        _timeIt(
+            'MAC (cached)',
+            len(macs),
+            lambda: [MAC(mac) for mac in macs])
+        # Rendering configs, first with cold caches of parsed values...
+        configs = NetConfig.readAll()
+        _timeIt(
+            'NetConfig render (cold)',
+            len(configs),
+            lambda: [renderConfig(config) for config in configs],
+            repeat=1)
+        _timeIt(
+            'NetConfig render (warm)',
+            len(configs),
+            lambda: [renderConfig(config) for config in configs])
+        # Replaying an event stream on a bag...
+        bag = NetAdap.anumWinNetAdaps()
+        snapshot = NetAdap.anumWinNetAdaps()
+        events = list(backend.scriptEvents(args.events))
+        _timeIt(
+            'event stream on AdapCfgBag',
+            len(events),
+            lambda: [applyEvent(bag, event) for event in events],
+            repeat=1)
+        # Diffing the snapshot before the stream against a fresh one...
+        fresh = NetAdap.anumWinNetAdaps()
+        _timeIt(
+            'diffBags',
+            len(fresh._adaps) + len(fresh._mpCfgAdap),
+            lambda: diffBags(snapshot, fresh))
+    finally:
+        setBackend(None)
+
+
+if __name__ == '__main__':
+    main()
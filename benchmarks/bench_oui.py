@@ -0,0 +1,72 @@
+#
+#
+#
+"""Benchmarks of `OuiDb` vendor lookups on a synthetic IEEE registry. Run
+it from the root of the repository:
+
+    python -m benchmarks.bench_oui --entries 35000
+"""
+
+from __future__ import annotations
+import argparse
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import tracemalloc
+
+from ntwrk.oui import OuiDb, buildOuiDb
+
+
+def _writeRegistry(file: Path, n_entries: int, rand: Random) -> list[int]:
+    """Writes an `oui.txt`-shaped registry and returns its prefixes."""
+    ouis = rand.sample(range(0x1_00_00_00), n_entries)
+    with open(file, mode='wt', encoding='utf-8') as fileObj:
+        for oui in ouis:
+            hex_ = f'{oui:06X}'
+            fileObj.write(f'{hex_[:2]}-{hex_[2:4]}-{hex_[4:]}   (hex)\t\t'
+                f'Vendor {oui % 5000} Corporation\n')
+    return ouis
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=35000,
+        help='the number of registry entries (default: %(default)s)')
+    parser.add_argument('--lookups', type=int, default=200000,
+        help='the number of lookups (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rand = Random(args.seed)
+    with TemporaryDirectory() as tmpDir:
+        src = Path(tmpDir, 'oui.txt')
+        dst = Path(tmpDir, 'oui.bin')
+        ouis = _writeRegistry(src, args.entries, rand)
+        startTime = perf_counter()
+        nRecords = buildOuiDb(src, dst)
+        print(f'{"buildOuiDb":<24}{nRecords:>9} recs '
+            f'{(perf_counter() - startTime) * 1000:>10.2f} ms '
+            f'{dst.stat().st_size / 1024:>10.1f} KiB')
+        tracemalloc.start()
+        startTime = perf_counter()
+        db = OuiDb(dst)
+        openTime = perf_counter() - startTime
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{"OuiDb open":<24}{"":>14}{openTime * 1000:>10.3f} ms '
+            f'{size / 1024:>10.1f} KiB')
+        with db:
+            keys = [
+                rand.choice(ouis) if rand.random() < 0.8 else
+                    rand.randrange(0x1_00_00_00)
+                for _ in range(args.lookups)]
+            startTime = perf_counter()
+            for key in keys:
+                db.lookup(key)
+            elapsed = perf_counter() - startTime
+            print(f'{"OuiDb.lookup":<24}{len(keys):>9} keys '
+                f'{elapsed * 1e6 / len(keys):>10.2f} µs/lookup')
+
+
+if __name__ == '__main__':
+    main()
@@ -103,7 +103,8 @@ def main() -> None:
             _RES_DIR,
             _APP_DIR / 'LICENSE',
             _settings,
-            db,)
+            db,
+            _APP_DIR / 'adaps.cache',)
         dnsWin.mainloop()
     finally:
         db.close()
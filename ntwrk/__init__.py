@@ -5,9 +5,12 @@
 
 #### Types
 1. `NetAdap`
+2. `BagDiff`
 
 #### Functions
 1. `enumNetInts`
+2. `diffBags`
+3. `changedFields`
 """
 
 from __future__ import annotations
@@ -16,35 +19,20 @@ import enum
 from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
 import logging
 from os import PathLike
-import re
-from typing import Any, Iterable, Iterator, TypeVar, overload
+from typing import (Any, Callable, ClassVar, Iterable, Iterator, NamedTuple,
+    TypeVar, overload)
 from uuid import UUID
 
 
-class ACIdx:
-    """This class specifies the index of a `NetAdap` or `NetConfig` object
-    in a `AdapCfgBag` container. The `adapIdx` must always be an integer
-    but the `cfgIdx` can be `int` or `None`:
+class ACIdx(NamedTuple):
+    """This immutable value type specifies the index of a `NetAdap` or
+    `NetConfig` object in a `AdapCfgBag` container. The `adapIdx` must
+    always be an integer but the `cfgIdx` can be `int` or `None`:
     * `cfgIdx is None`: the index is called to be an adapter index
     * `cfgIdx: int`: the index is called to be a config index
     """
-
-    def __init__(self, a_idx: int, c_idx: int | None,) -> None:
-        self.adapIdx = a_idx
-        self.cfgIdx = c_idx
-    
-    def __eq__(self, value: object) -> bool:
-        if not isinstance(value, ACIdx):
-            return NotImplemented
-        if self.adapIdx != value.adapIdx:
-            return False
-        try:
-            return self.cfgIdx == value.cfgIdx
-        except Exception:
-            return False
-    
-    def __hash__(self) -> int:
-        return hash(self.toTuple())
+    adapIdx: int
+    cfgIdx: int | None
     
     def __repr__(self) -> str:
         return (f'<{self.__class__.__qualname__}(adapIdx={self.adapIdx}, '
@@ -84,15 +72,29 @@ class ACIdx:
         """Gets the adapter version of this index. If it is already an
         adapter index, it will returned unchanged.
         """
+        if self.cfgIdx is None:
+            return self
         return ACIdx(self.adapIdx, None)
     
     def toTuple(self) -> tuple[int, int | None]:
         return (self.adapIdx, self.cfgIdx,)
 
 
+_makeIdx = ACIdx._make
+"""Makes an `ACIdx` from a pair without the keyword handling of the
+constructor, for hot loops.
+"""
+
+
 class AdapCfgBag:
     def __init__(self) -> None:
         self._adaps = dict[int, NetAdap]()
+        self._mpCfgAdap = dict[int, int]()
+        """The mapping of config `Index` to the `Index` of its adapter."""
+        self._mpCaptionAdap = dict[str, list[int]]()
+        """The mapping of `Caption` to the `Index` of adapters with that
+        caption, in the order of addition. Configs are added to the first.
+        """
     
     def __getitem__(self, idx: ACIdx) -> NetAdap | NetConfig:
         try:
@@ -133,13 +135,14 @@ class AdapCfgBag:
         * `ValueError`: there is a contradictory peer (the same index
         but not completely equal determinant attributes).
         """
-        for adap in self._adaps.values():
-            if config.Index in adap._configs:
-                if config.equalIdentityTo(adap._configs[config.Index]):
-                    return ACIdx(adap.Index, config.Index)
-                else:
-                    raise ValueError('a contradictory peer found')
-        raise IndexError('config does not exist')
+        try:
+            aIdx = self._mpCfgAdap[config.Index]
+        except KeyError:
+            raise IndexError('config does not exist')
+        if config.equalIdentityTo(self._adaps[aIdx]._configs[config.Index]):
+            return ACIdx(aIdx, config.Index)
+        else:
+            raise ValueError('a contradictory peer found')
     
     def delIdx(self, idx: ACIdx) -> None:
         """Deletes the specified index from the bag. Raises `IndexError`
@@ -147,7 +150,14 @@ class AdapCfgBag:
         """
         try:
             if idx.isAdap():
-                del self._adaps[idx.adapIdx]
+                adap = self._adaps.pop(idx.adapIdx)
+                # Dropping the adapter and its configs from indexes...
+                adapIdxs = self._mpCaptionAdap[adap._Caption]
+                adapIdxs.remove(adap.Index)
+                if not adapIdxs:
+                    del self._mpCaptionAdap[adap._Caption]
+                for cIdx in adap._configs:
+                    del self._mpCfgAdap[cIdx]
                 return
             else:
                 adap = self._adaps[idx.adapIdx]
@@ -157,6 +167,7 @@ class AdapCfgBag:
             del adap._configs[idx.cfgIdx] # type: ignore
         except KeyError:
             raise IndexError(f'{idx} does not exist in the bag')
+        del self._mpCfgAdap[idx.cfgIdx] # type: ignore
     
     def addAdap(self, adap: NetAdap) -> None:
         """Adds the provided `NetAdap` object to this bag. Raises
@@ -167,31 +178,33 @@ class AdapCfgBag:
             raise ValueError(
                 f'a NetAdap with `Index` of {adap.Index} already exists')
         self._adaps[adap.Index] = adap
+        self._mpCaptionAdap.setdefault(adap._Caption, []).append(adap.Index)
+        for cIdx in adap._configs:
+            self._mpCfgAdap[cIdx] = adap.Index
     
     def addConfig(self, config: NetConfig) -> None:
         """Adds a config to the bag.
         #### Excepitons:
         * `ValueError`: no corresponding adapter found
         * `IndexError`: a config with the same index already exists in the 
-        corresponding adapter.
+        bag.
         """
-        for adap in self._adaps.values():
-            if adap._Caption == config._Caption:
-                if config.Index in adap._configs:
-                    raise IndexError(
-                        'the config index already exists in the '
-                        'corresponding adap')
-                else:
-                    adap._configs[config.Index] = config
-                    return
-        raise ValueError(f'unable to add {config} to the bag')
+        try:
+            aIdx = self._mpCaptionAdap[config._Caption][0]
+        except KeyError:
+            raise ValueError(f'unable to add {config} to the bag')
+        if config.Index in self._mpCfgAdap:
+            raise IndexError(
+                'the config index already exists in the bag')
+        self._adaps[aIdx]._configs[config.Index] = config
+        self._mpCfgAdap[config.Index] = aIdx
     
     def iterAdaps(self) -> Iterator[tuple[ACIdx, NetAdap]]:
         """Returns an iterator to iterate through all network adapters
         alongside their `ACIdx`.
         """
         return (
-            (ACIdx(adap.Index, None,), adap)
+            (_makeIdx((adap.Index, None,)), adap)
             for adap in self._adaps.values())
     
     def iterConfigs(
@@ -210,8 +223,9 @@ class AdapCfgBag:
         except KeyError:
             raise IndexError(
                 f'the adapter index does not exist in this bag: {adap_idx}')
+        aIdx = adap_idx.adapIdx
         return (
-            (ACIdx(adap_idx.adapIdx, i), cfg,)
+            (_makeIdx((aIdx, i,)), cfg,)
             for i, cfg in adap._configs.items())
 
 
@@ -314,43 +328,105 @@ class NetConfigCode(enum.IntEnum):
 
 
 class MAC:
-    """This class encapsulate MAC addresses."""
-    _MAC_REGEX = '^[0-9A-F]{2}(?:[:][0-9A-F]{2}){5}$'
+    """This class encapsulate MAC addresses as 48-bit integers. Instances
+    are immutable and cached, so constructing the same address again is a
+    dictionary lookup.
+    """
+    __slots__ = ('_mac',)
 
-    _macPat = re.compile(_MAC_REGEX)
+    _cache: ClassVar[dict[str | int, MAC]] = {}
+    """The mapping of constructor arguments to their instances."""
+    _CACHE_SIZE: ClassVar[int] = 4096
+    """The maximum number of cached instances before the cache is reset."""
 
-    def __init__(self, mac_addr: str):
-        """
-        Initializes a MAC object.
+    _mac: int
 
-        :param mac_addr: a string representing the MAC address in the format XX:XX:XX:XX:XX:XX
+    def __new__(cls, mac_addr: str | int) -> MAC:
         """
-        self._macAddr = self._validate(mac_addr)
-        """The MAC address string."""
-
-    def _validate(self, mac_addr: str) -> str:
-        """Validates the MAC address string. If it is valid, it normalizes it
-        and returns it; otherwise raises `ValueError` exception.
+        Gets a MAC object. It raises `ValueError` if the address is invalid.
 
-        :param `mac_addr`: a string representing the MAC address
-        :return: the validated MAC address string
+        :param mac_addr: a string representing the MAC address in the
+        `XX:XX:XX:XX:XX:XX`, `XX-XX-XX-XX-XX-XX`, `XX.XX.XX.XX.XX.XX`,
+        `XXXX.XXXX.XXXX` or `XXXXXXXXXXXX` format, or its 48-bit integer
+        value
+        """
+        # Normalizing the argument so equal keys of other types, like
+        # `True` or `1.0` for `1`, never hit the cache...
+        type_ = type(mac_addr)
+        if type_ is not str and type_ is not int:
+            if isinstance(mac_addr, str):
+                mac_addr = str(mac_addr)
+            elif isinstance(mac_addr, int) and type_ is not bool:
+                mac_addr = int(mac_addr)
+            else:
+                raise ValueError(f'{mac_addr!r} is not a valid MAC address')
+        try:
+            return cls._cache[mac_addr]
+        except KeyError:
+            pass
+        self = super().__new__(cls)
+        self._mac = cls._parse(mac_addr)
+        if len(cls._cache) >= cls._CACHE_SIZE:
+            cls._cache.clear()
+        cls._cache[mac_addr] = self
+        return self
+
+    @staticmethod
+    def _parse(mac_addr: str | int) -> int:
+        """Parses the MAC address into its integer value. It raises
+        `ValueError` if the format is invalid.
+
+        :param `mac_addr`: a string or integer representing the MAC address
+        :return: the 48-bit integer value
         :raises `ValueError`: if the MAC address format is invalid
         """
-        mac_addr = mac_addr.strip().replace('-', ':').replace('.', ':').upper()
-        mtch = self._macPat.match(mac_addr)
-        if mtch is None:
+        if isinstance(mac_addr, int) and not isinstance(mac_addr, bool):
+            if 0 <= mac_addr <= 0xFF_FF_FF_FF_FF_FF:
+                return mac_addr
+            raise ValueError(f'{mac_addr} is out of the MAC address range')
+        from string import hexdigits
+        if not isinstance(mac_addr, str):
+            raise ValueError(f'{mac_addr!r} is not a valid MAC address')
+        hex_ = mac_addr.strip()
+        match len(hex_):
+            case 17:
+                # Checking `XX:XX:XX:XX:XX:XX`, `XX-XX-XX-XX-XX-XX` or
+                # `XX.XX.XX.XX.XX.XX`...
+                sep = hex_[2]
+                if sep not in ':-.' or hex_[2::3] != sep * 5:
+                    raise ValueError(f'{mac_addr} is not a valid MAC address')
+                hex_ = hex_.replace(sep, '')
+            case 14:
+                # Checking `XXXX.XXXX.XXXX`...
+                if hex_[4::5] != '..':
+                    raise ValueError(f'{mac_addr} is not a valid MAC address')
+                hex_ = hex_.replace('.', '')
+            case 12:
+                pass
+            case _:
+                raise ValueError(f'{mac_addr} is not a valid MAC address')
+        # Ruling out signs, spaces, underscores and the `0x` prefix which
+        # `int` accepts...
+        if len(hex_) != 12 or any(char not in hexdigits for char in hex_):
             raise ValueError(f'{mac_addr} is not a valid MAC address')
-        return mac_addr
+        return int(hex_, 16)
+
+    def __reduce__(self) -> tuple[type[MAC], tuple[int]]:
+        return (self.__class__, (self._mac,))
+
+    def __int__(self) -> int:
+        return self._mac
 
     def __str__(self):
         """Returns a string representation of the MAC address.
 
         :return: a string in the format XX:XX:XX:XX:XX:XX
         """
-        return self._macAddr
+        hex_ = f'{self._mac:012X}'
+        return ':'.join(hex_[i:i + 2] for i in range(0, 12, 2))
     
     def __repr__(self):
-        return f"<{self.__class__.__qualname__}('{self._macAddr}')>"
+        return f"<{self.__class__.__qualname__}('{self}')>"
 
     def __eq__(self, other: object) -> bool:
         """Compares two MAC objects for equality.
@@ -360,14 +436,14 @@ class MAC:
         """
         if not isinstance(other, MAC):
             return NotImplemented
-        return self._macAddr == other._macAddr
+        return self._mac == other._mac
 
     def __hash__(self) -> int:
         """Returns a hash value for the MAC object.
 
         :return: an integer hash value
         """
-        return hash(self._macAddr)
+        return hash(self._mac)
 
     @property
     def OUI(self):
@@ -377,7 +453,7 @@ class MAC:
         :return: a string representing the OUI (first 3 bytes of the MAC
         address)
         """
-        return self._macAddr[:8]
+        return str(self)[:8]
 
     @property
     def NIC(self):
@@ -388,31 +464,151 @@ class MAC:
         :return: a string representing the NIC (last 3 bytes of the MAC
         address)
         """
-        return self._macAddr[9:]
+        return str(self)[9:]
     
     def isUnicast(self) -> bool:
         """Checks if the MAC address is a unicast address"""
-        first_octet = int(self._macAddr[0:2], 16)
-        return (first_octet & 0x01) == 0
+        return not (self._mac >> 40) & 0x01
 
     def isMulticast(self) -> bool:
         """Checks if the MAC address is a multicast address"""
-        first_octet = int(self._macAddr[0:2], 16)
-        return (first_octet & 0x01) == 1
+        return bool((self._mac >> 40) & 0x01)
 
     def isBroadcast(self):
         """Checks if the MAC address is a broadcast address"""
-        return self._macAddr == "FF:FF:FF:FF:FF:FF"
+        return self._mac == 0xFF_FF_FF_FF_FF_FF
+
+
+def _toIpTuple(
+        ips: tuple[str, ...] | None,
+        ) -> tuple[IPv4 | IPv6, ...] | None:
+    """Converts a tuple of strings representing IP addresses to
+    `IPv4Address` or `IPv6Address`. It raises `TypeError` if not possible.
+    """
+    if ips is None:
+        return None
+    return tuple(_strToIp(ip) for ip in ips) # type: ignore
+
+
+def _strToIp(ip: str | None) -> IPv4 | IPv6 | None:
+    """Converts an optional string to an IP address. Only IPv6 addresses
+    contain colons, so the family is picked without trial and error. It
+    raises `TypeError` if not possible.
+    """
+    from ipaddress import AddressValueError
+    if ip is None:
+        return None
+    try:
+        return IPv6(ip) if ':' in ip else IPv4(ip)
+    except AddressValueError:
+        raise TypeError(f'expected IPv4 or IPv6 but got {ip!r}')
+
+
+def _toMac(mac: str | None) -> MAC | None:
+    """Converts an optional MAC address string to `MAC` object."""
+    return mac if mac is None else MAC(mac)
+
+
+class _Field(NamedTuple):
+    """The declaration of a raw attribute of `AbsNetItem` subclasses, the
+    value of the WMI property with the same name.
+    """
+    name: str
+    """The name of the WMI property. The attribute is `_<name>`."""
+    type_: Any
+    """The type of the value: a class, `tuple[<class>, ...]` or `object`
+    for unchecked values.
+    """
+    nullable: bool = False
+    """Whether `None` is allowed."""
+    converter: Callable[[Any], Any] | None = None
+    """The converter of the raw value to the value of the public property,
+    used by `AbsNetItem._getParsed`.
+    """
+
+
+def _compileValidator(fields: Iterable[_Field]) -> Callable[[Any, Any], None]:
+    """Generates the source of a function which validates attributes of an
+    object against the fields and sets them on `self`, then compiles it.
+    The generated function raises `TypeError` like `AbsNetItem._initFields`.
+    """
+    from typing import get_args, get_origin
+    namespace = dict[str, Any]()
+    lines = ['def _initFields(self, obj):', '    try:']
+    for idx, field in enumerate(fields):
+        lines.append(f'        v = obj.{field.name}')
+        if field.type_ is object:
+            lines.append(f'        self._{field.name} = v')
+            continue
+        if get_origin(field.type_) is tuple:
+            itemType = get_args(field.type_)[0]
+            namespace[f'_t{idx}'] = itemType
+            typeName = f'tuple[{itemType.__qualname__}, ...]'
+            cond = (f'(v.__class__ is tuple and all(isinstance(i, _t{idx}) '
+                'for i in v))')
+        else:
+            namespace[f'_t{idx}'] = field.type_
+            typeName = field.type_.__qualname__
+            cond = f'isinstance(v, _t{idx})'
+        if field.nullable:
+            cond = f'(v is None or {cond})'
+            typeName = f'{typeName} | None'
+        lines.append(f'        if not {cond}:')
+        lines.append(f'            raise TypeError(f"expected `{field.name}` '
+            f'as `{typeName}` but got `{{v.__class__.__qualname__}}`")')
+        lines.append(f'        self._{field.name} = v')
+    lines.append('    except AttributeError as err:')
+    lines.append('        raise TypeError(err.args)')
+    exec('\n'.join(lines), namespace)
+    return namespace['_initFields']
 
 
 _T = TypeVar('_T', bound='AbsNetItem')
 
 
 class AbsNetItem(ABC):
+    __slots__ = ()
+
+    _FIELDS: ClassVar[tuple[_Field, ...]] = ()
+    """The schema of raw attributes. Subclasses declare it and the rest of
+    the class-level tables are compiled from it on subclassing.
+    """
+    _DETERMINANTS: ClassVar[tuple[str, ...]] = ()
+    """The names of determinant fields. Subclasses declare it."""
+    _ATTRS: ClassVar[tuple[str, ...]]
+    """The attribute names of fields with the leading underscore."""
+    _DET_ATTRS: ClassVar[tuple[str, ...]]
+    """The attribute names of determinants with the leading underscore."""
+    _WMI_PROPS: ClassVar[tuple[str, ...]]
+    """The names of fields, the only WMI properties queried."""
+    _CONVERTERS: ClassVar[dict[str, Callable[[Any], Any]]]
+
+    _parsed: dict[str, Any]
+    _gen: int
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._WMI_PROPS = tuple(field.name for field in cls._FIELDS)
+        cls._ATTRS = tuple(f'_{field.name}' for field in cls._FIELDS)
+        cls._DET_ATTRS = tuple(f'_{name}' for name in cls._DETERMINANTS)
+        cls._initFields = _compileValidator(cls._FIELDS)
+        cls._CONVERTERS = {
+            field.name: field.converter
+            for field in cls._FIELDS
+            if field.converter is not None}
+        # Checking that slotted subclasses have room for all fields...
+        if '__slots__' in cls.__dict__:
+            missing = set(cls._ATTRS).difference(cls.__slots__)
+            if missing:
+                raise TypeError(f'{cls.__qualname__} lacks slots for '
+                    f'{", ".join(sorted(missing))}')
+
     @classmethod
     @abstractmethod
     def readAll(cls: type[_T], **kwargs) -> tuple[_T, ...]:
-        """Reads all instances from WMI which satisfy the conditions."""
+        """Reads all instances from the network backend which satisfy the
+        conditions.
+        """
         pass
 
     def __repr__(self) -> str:
@@ -431,16 +627,23 @@ class AbsNetItem(ABC):
             return NotImplemented
         return self.equalIdentityTo(value)
     
+    @abstractmethod
+    def _initFields(self, obj: Any) -> None:
+        """Sets all fields from the provided object. It raises `TypeError`
+        if `obj` lacks some attributes or exposes type mismatch. Every
+        subclass gets a version compiled from its `_FIELDS` in
+        `__init_subclass__`.
+        """
+        pass
+    
     def equalIdentityTo(self, value: AbsNetItem) -> bool:
         """Checks whether the identity (deteminant attributes) of this
         object is equal to the provided object or not. It is an alias for
         equality operator (`==`).
         """
-        selfDet = set(self.getDeterminant(leading_under=True))
-        valueDet = set(value.getDeterminant(leading_under=True))
-        if selfDet != valueDet:
+        if self._DET_ATTRS != value._DET_ATTRS:
             return False
-        for attr in selfDet:
+        for attr in self._DET_ATTRS:
             if getattr(self, attr) != getattr(value, attr):
                 return False
         return True
@@ -449,40 +652,52 @@ class AbsNetItem(ABC):
         """Checks whther this object has the same value as the provided
         object (checks all the attributes including determinants).
         """
-        selfAttrs = set(self.getAttrs(leading_under=True))
-        valueAttrs = set(value.getAttrs(leading_under=True))
-        if selfAttrs != valueAttrs:
+        if self._ATTRS != value._ATTRS:
             return False
-        for attr in selfAttrs:
+        for attr in self._ATTRS:
             if getattr(self, attr) != getattr(value, attr):
                 return False
         return True
     
-    @abstractmethod
     def getDeterminant(self, leading_under: bool = False) -> tuple[str, ...]:
         """Gets attributes which determine the nature of the object and
         should not change while a system runs.
         """
-        pass
+        if leading_under:
+            return self._DET_ATTRS
+        else:
+            return self._DETERMINANTS
     
-    def getAttrs(self, leading_under: bool = False) -> tuple[str, ...]:
-        """The attributes of interest of `Win32_NetworkAdapterConfiguration`
-        class.
+    def _getParsed(self, name: str) -> Any:
+        """Gets the parsed value of the `_<name>` raw attribute, converting
+        it with the converter of its field only on the first access after
+        it changed.
         """
-        attrs = [
-            attr
-            for attr in dir(self)
-            if attr.startswith('_') and attr[1].isupper() and not \
-                attr.startswith('__') and not callable(getattr(self, attr))]
+        try:
+            return self._parsed[name]
+        except KeyError:
+            value = self._CONVERTERS[name](getattr(self, f'_{name}'))
+            self._parsed[name] = value
+            return value
+    
+    def getAttrs(self, leading_under: bool = False) -> tuple[str, ...]:
+        """Gets the names of all fields declared in the schema."""
         if leading_under:
-            return tuple(attrs)
+            return self._ATTRS
         else:
-            return self._removeUnder(attrs)
+            return self._WMI_PROPS
+    
+    def getGen(self) -> int:
+        """Gets the generation of this object, which is bumped every time
+        `update` changes it.
+        """
+        return self._gen
     
-    def update(self, wmi_obj: Any | None = None) -> bool:
+    def update(self, wmi_obj: Any | None = None) -> frozenset[str]:
         """Updates this `AbsNetItem` object with the provided WMI object.
         If nothing is provided, this `AbsNetItem` object updates itself
-        from the WMI.
+        from the WMI. It returns the names of changed WMI properties, empty
+        if nothing changed.
         
         In case of reading WMI (`None`), if results are unexpected, it
         raises `RuntimeError`.
@@ -497,8 +712,7 @@ class AbsNetItem(ABC):
                 raise RuntimeError(f'expected one WMI object but got {nObjs}')
             wmi_obj = objs[0]
         selfChanges = dict[str, Any]()
-        changed = False
-        for attr in self.getAttrs(leading_under=True):
+        for attr in self._ATTRS:
             selfAttr = getattr(self, attr)
             try:
                 objAttr = getattr(wmi_obj, attr)
@@ -506,36 +720,61 @@ class AbsNetItem(ABC):
                 break
             if selfAttr != objAttr:
                 setattr(self, attr, objAttr)
-                selfChanges[attr] = objAttr
-                changed = True
+                self._parsed.pop(attr[1:], None)
+                selfChanges[attr] = selfAttr
         else:
-            return changed
+            if not selfChanges:
+                return frozenset()
+            self._gen += 1
+            return frozenset(attr[1:] for attr in selfChanges)
         # The provided `obj` does not have required attributes
         # Rolling back changes...
         for attr in selfChanges.keys():
             setattr(self, attr, selfChanges[attr])
-        return False
-    
-    def _removeUnder(self, attrs: Iterable[str]) -> tuple[str, ...]:
-        """Removes leading underscore from the specified iterable of
-        attribute names.
-        """
-        return tuple([attr[1:] for attr in attrs])
+        return frozenset()
 
 
 class NetAdap(AbsNetItem):
     """Instances of this class represent instances of `Win32_NetworkAdapter`
     class on WMI.
     """
+    _FIELDS = (
+        _Field('Description', str),
+        # The Unique identifier of the network adapter from other devices
+        # on the system...
+        _Field('DeviceID', str),
+        # A short description of the instance, a one-line string...
+        _Field('Caption', str),
+        # Index number of the network adapter, stored in the system
+        # registry...
+        _Field('Index', int),
+        _Field('InterfaceIndex', int),
+        # The name of this network interface in the shell...
+        _Field('NetConnectionID', str),
+        _Field('NetConnectionStatus', object),
+        _Field('GUID', str),
+        _Field('MACAddress', str, nullable=True, converter=_toMac),)
+    _DETERMINANTS = ('Index', 'DeviceID', 'Description', 'Caption',)
+    __slots__ = ('_Description', '_DeviceID', '_Caption', '_Index',
+        '_InterfaceIndex', '_NetConnectionID', '_NetConnectionStatus',
+        '_GUID', '_MACAddress', '_configs', '_parsed', '_gen',)
+
+    _Description: str
+    _DeviceID: str
+    _Caption: str
+    _Index: int
+    _InterfaceIndex: int
+    _NetConnectionID: str
+    _NetConnectionStatus: int
+    _GUID: str
+    _MACAddress: str | None
+
     @classmethod
     def readAll(cls, **kwargs) -> tuple[NetAdap, ...]:
-        import wmi
-        import pythoncom
-        pythoncom.CoInitialize()
-        wmi_ = wmi.WMI()
+        from .backend import getBackend
         kwargs['PhysicalAdapter'] = True
-        wmiAdaps = wmi_.Win32_NetworkAdapter(**kwargs)
-        # Converting COM objects into `NetAdap` objects...
+        wmiAdaps = getBackend().readAdaps(cls._WMI_PROPS, **kwargs)
+        # Converting backend objects into `NetAdap` objects...
         adaps = list[NetAdap]()
         badWmiAdaps = False
         for adap in wmiAdaps:
@@ -548,12 +787,13 @@ class NetAdap(AbsNetItem):
         if badWmiAdaps:
             logging.error(
                 'some COM objects cannot be converted into "NetAdap"')
-        pythoncom.CoUninitialize()
         return tuple(adaps)
 
     @ classmethod
     def anumWinNetAdaps(cls) -> AdapCfgBag:
-        """Enumerates all network interfaces on this Windows platform."""
+        """Enumerates all network interfaces on this platform through the
+        network backend.
+        """
         return _enumNetAdaps()
 
     def __init__(self, obj: Any) -> None:
@@ -561,76 +801,12 @@ class NetAdap(AbsNetItem):
         provide necessary attributes. It raises `TypeError` if `obj` lacks
         some attributes or exposes type mismatch.
         """
-        try:
-            # Setting `Description` attribute...
-            try:
-                _assertAsStr(obj.Description)
-            except AssertionError:
-                raise TypeError(f'expected `Description` as `str` but got '
-                    f'`{obj.Description.__class__.__qualname__}`')
-            self._Description: str = obj.Description
-            # Setting `DeviceID` attribute...
-            try:
-                _assertAsStr(obj.DeviceID)
-            except AssertionError:
-                raise TypeError(f'expected `DeviceID` as `str` but got '
-                    f'`{obj.DeviceID.__class__.__qualname__}`')
-            self._DeviceID: str = obj.DeviceID
-            """The Unique identifier of the network adapter from other
-            devices on the system.
-            """
-            # Setting `Caption` attribute...
-            try:
-                _assertAsStr(obj.Caption)
-            except AssertionError:
-                raise TypeError(f'expected `Caption` as `str` but got '
-                    f'`{obj.Caption.__class__.__qualname__}`')
-            self._Caption: str = obj.Caption
-            """A short description of the instance, a one-line string."""
-            # Setting `Index` attribute...
-            try:
-                _assertAsInt(obj.Index)
-            except AssertionError:
-                raise TypeError(f'expected `Index` as `int` but got '
-                    f'`{obj.Index.__class__.__qualname__}`')
-            self._Index: int = obj.Index
-            """Index number of the network adapter, stored in the system
-            registry.
-            """
-            # Setting `InterfaceIndex` attribute...
-            try:
-                _assertAsInt(obj.InterfaceIndex)
-            except AssertionError:
-                raise TypeError(f'expected `InterfaceIndex` as `int` but got '
-                    f'`{obj.InterfaceIndex.__class__.__qualname__}`')
-            self._InterfaceIndex: int = obj.InterfaceIndex
-            # Setting `NetConnectionID` attribute...
-            try:
-                _assertAsStr(obj.NetConnectionID)
-            except AssertionError:
-                raise TypeError(f'expected `NetConnectionID` as `str` but got '
-                    f'`{obj.NetConnectionID.__class__.__qualname__}`')
-            self._NetConnectionID: str = obj.NetConnectionID
-            """The name of this network interface in the shell."""
-            self._NetConnectionStatus: int = obj.NetConnectionStatus
-            # Setting `GUID` attribute...
-            try:
-                _assertAsStr(obj.GUID)
-            except AssertionError:
-                raise TypeError(f'expected `GUID` as `str` but got '
-                    f'`{obj.GUID.__class__.__qualname__}`')
-            self._GUID: str = obj.GUID
-            # Setting `MACAddress` attribute...
-            try:
-                _assertAsStrNone(obj.MACAddress)
-            except AssertionError:
-                raise TypeError(f'expected `MACAddress` as `str` or `None`'
-                    f' but got `{obj.MACAddress.__class__.__qualname__}`')
-            self._MACAddress: str | None = obj.MACAddress
-        except AttributeError as err:
-            raise TypeError(err.args)
-        else:
-            self._configs = dict[int, NetConfig]()
+        self._initFields(obj)
+        self._configs = dict[int, NetConfig]()
+        self._parsed = dict[str, Any]()
+        """The cache of parsed values of raw attributes."""
+        self._gen = 0
+        """The generation of this object, bumped on every change."""
     
     @property
     def Configs(self) -> tuple[NetConfig, ...]:
@@ -666,19 +842,12 @@ class NetAdap(AbsNetItem):
     
     @property
     def MACAddress(self) -> MAC | None:
-        return _toMac(self._MACAddress)
+        return self._getParsed('MACAddress')
     
     @property
     def GUID(self) -> UUID:
         return UUID(self._GUID)
     
-    def getDeterminant(self, leading_under: bool = False) -> tuple[str, ...]:
-        det = ['_Index', '_DeviceID', '_Description', '_Caption',]
-        if leading_under:
-            return tuple(det)
-        else:
-            return self._removeUnder(det)
-    
     def connectivity(self) -> bool:
         """Specifies whether this network adapter has the potential
         internet connectivity.
@@ -702,14 +871,56 @@ class NetConfig(AbsNetItem):
     """Instances of this class represent instances of
     `Win32_NetworkAdapterConfiguration` class on WMI.
     """
+    _FIELDS = (
+        # A short description of the instance, a one-line string...
+        _Field('Caption', str),
+        _Field('SettingID', str),
+        # A network adapter (an instance of `NetAdap`) can have multiple
+        # configuration and each of them has a unique `Index`...
+        _Field('Index', int),
+        _Field('InterfaceIndex', int),
+        # Specifies whether this network interface can use IP protocol for
+        # its network communicatiopns...
+        _Field('IPEnabled', bool),
+        # The optional IP addresses assigned to this network interface...
+        _Field('IPAddress', tuple[str, ...], nullable=True,
+            converter=_toIpTuple),
+        # Whether this network interface is configured to obtain its
+        # network configuration settings automatically through DHCP...
+        _Field('DHCPEnabled', bool),
+        # The IP address of the DHCP server that will provide the
+        # necessary network configurations...
+        _Field('DHCPServer', str, nullable=True, converter=_strToIp),
+        _Field('DNSServerSearchOrder', tuple[str, ...], nullable=True,
+            converter=_toIpTuple),
+        # The optional IP addresses of default gateways that the computer
+        # system uses...
+        _Field('DefaultIPGateway', tuple[str, ...], nullable=True,
+            converter=_toIpTuple),
+        _Field('MACAddress', str, nullable=True, converter=_toMac),)
+    _DETERMINANTS = ('Index', 'InterfaceIndex', 'Caption', 'SettingID',)
+    __slots__ = ('_Caption', '_SettingID', '_Index', '_InterfaceIndex',
+        '_IPEnabled', '_IPAddress', '_DHCPEnabled', '_DHCPServer',
+        '_DNSServerSearchOrder', '_DefaultIPGateway', '_MACAddress',
+        '_parsed', '_gen',)
+
+    _Caption: str
+    _SettingID: str
+    _Index: int
+    _InterfaceIndex: int
+    _IPEnabled: bool
+    _IPAddress: tuple[str, ...] | None
+    _DHCPEnabled: bool
+    _DHCPServer: str | None
+    _DNSServerSearchOrder: tuple[str, ...] | None
+    _DefaultIPGateway: tuple[str, ...] | None
+    _MACAddress: str | None
+
     @classmethod
     def readAll(cls, **kwargs) -> tuple[NetConfig, ...]:
-        import wmi
-        import pythoncom
-        pythoncom.CoInitialize()
-        wmi_ = wmi.WMI()
-        wmiAdaps = wmi_.Win32_NetworkAdapterConfiguration(**kwargs)
-        # Converting COM objects into `NetAdap` objects...
+        from .backend import getBackend
+        wmiAdaps = getBackend().readConfigs(cls._WMI_PROPS, **kwargs)
+        # Converting backend objects into `NetConfig` objects...
         configs = list[NetConfig]()
         badWmiConfigs = False
         for adap in wmiAdaps:
@@ -722,7 +933,6 @@ class NetConfig(AbsNetItem):
         if badWmiConfigs:
             logging.error(
                 'some COM objects cannot be converted into "NetAdap"')
-        pythoncom.CoUninitialize()
         return tuple(configs)
 
     def __init__(self, obj: Any) -> None:
@@ -730,112 +940,11 @@ class NetConfig(AbsNetItem):
         that provide necessary attributes. It raises `TypeError` if `obj` 
         lacks some attributes or exposes type mismatch.
         """
-        try:
-            # Setting `Caption` attribute...
-            try:
-                _assertAsStr(obj.Caption)
-            except AssertionError:
-                raise TypeError(f'expected `Caption` as `str` but got '
-                    f'`{obj.Caption.__class__.__qualname__}`')
-            self._Caption: str = obj.Caption
-            """A short description of the instance, a one-line string."""
-            # Setting `SettingID` attribute...
-            try:
-                _assertAsStr(obj.SettingID)
-            except AssertionError:
-                raise TypeError(f'expected `SettingID` as `str` but got '
-                    f'`{obj.SettingID.__class__.__qualname__}`')
-            self._SettingID: str = obj.SettingID
-            # Setting `Index` attribute...
-            try:
-                _assertAsInt(obj.Index)
-            except AssertionError:
-                raise TypeError(f'expected `Index` as `int` but got '
-                    f'`{obj.Index.__class__.__qualname__}`')
-            self._Index: int = obj.Index
-            """A network adapter (an instance of `NetAdap`) can
-            have multiple configuration and each of them has a unique `Index`.
-            """
-            # Setting `InterfaceIndex` attribute...
-            try:
-                _assertAsInt(obj.InterfaceIndex)
-            except AssertionError:
-                raise TypeError(f'expected `InterfaceIndex` as `int` but got '
-                    f'`{obj.InterfaceIndex.__class__.__qualname__}`')
-            self._InterfaceIndex: int = obj.InterfaceIndex
-            # Setting `IPEnabled` attribute...
-            try:
-                _assertAsBool(obj.IPEnabled)
-            except AssertionError:
-                raise TypeError(f'expected `IPEnabled` as `bool` but got '
-                    f'`{obj.IPEnabled.__class__.__qualname__}`')
-            self._IPEnabled: bool = obj.IPEnabled
-            """Specifies whether this network interface can use IP protocol
-            for its network communicatiopns.
-            """
-            # Setting `IPAddress` attribute...
-            try:
-                _assertAsTupleStrNone(obj.IPAddress)
-            except AssertionError:
-                raise TypeError(f'expected `IPAddress` as `tuple[str, ...] | '
-                    f'None` but got `{obj.IPAddress.__class__.__qualname__}`')
-            self._IPAddress: tuple[str, ...] | None = obj.IPAddress
-            """The optional IP addresses assigned to this network interface.
-            It's a crucial property for identifying and communicating with a
-            device on a network.
-            """
-            # Setting `DHCPEnabled` attribute...
-            try:
-                _assertAsBool(obj.DHCPEnabled)
-            except AssertionError:
-                raise TypeError(f'expected `DHCPEnabled` as `bool` but got '
-                    f'`{obj.DHCPEnabled.__class__.__qualname__}`')
-            self._DHCPEnabled: bool = obj.DHCPEnabled
-            """Whether this network interface is configured to obtain obtain
-            its network configuration settings, such as IP address, subnet
-            mask, default gateway, and DNS server addresses; automatically
-            through DHCP.
-            """
-            # Setting `DHCPServer` attribute...
-            try:
-                _assertAsStrNone(obj.DHCPServer)
-            except AssertionError:
-                raise TypeError(f'expected `DHCPServer` as `str` or `None`'
-                    f' but got `{obj.DHCPServer.__class__.__qualname__}`')
-            self._DHCPServer: str | None = obj.DHCPServer
-            """Specifies the IP address of the DHCP server that will provide
-            the necessary network configurations.
-            """
-            # Setting `DNSServerSearchOrder` attribute...
-            try:
-                _assertAsTupleStrNone(obj.DNSServerSearchOrder)
-            except AssertionError:
-                raise TypeError(f'expected `DNSServerSearchOrder` as '
-                    '`tuple[str, ...] | None` but got '
-                    f'`{obj.DNSServerSearchOrder.__class__.__qualname__}`')
-            self._DNSServerSearchOrder: tuple[str, ...] | None = \
-                obj.DNSServerSearchOrder
-            # Setting `DefaultIPGateway` attribute...
-            try:
-                _assertAsTupleStrNone(obj.DefaultIPGateway)
-            except AssertionError:
-                raise TypeError(f'expected `DefaultIPGateway` as '
-                    '`tuple[str, ...] | None` but got '
-                    f'`{obj.DefaultIPGateway.__class__.__qualname__}`')
-            self._DefaultIPGateway: tuple[str, ...] | None = \
-                obj.DefaultIPGateway
-            """An optional tuple of IP addresses of default gateways that the
-            computer system uses.
-            """
-            # Setting `MACAddress` attribute...
-            try:
-                _assertAsStrNone(obj.MACAddress)
-            except AssertionError:
-                raise TypeError(f'expected `MACAddress` as `str` or `None`'
-                    f' but got `{obj.MACAddress.__class__.__qualname__}`')
-            self._MACAddress: str | None = obj.MACAddress
-        except AttributeError as err:
-            raise TypeError(err.args)
+        self._initFields(obj)
+        self._parsed = dict[str, Any]()
+        """The cache of parsed values of raw attributes."""
+        self._gen = 0
+        """The generation of this object, bumped on every change."""
     
     @property
     def Caption(self) -> str:
@@ -859,7 +968,7 @@ class NetConfig(AbsNetItem):
     
     @property
     def IPAddress(self) -> tuple[IPv4 | IPv6, ...] | None:
-        return _toIpTuple(self._IPAddress)
+        return self._getParsed('IPAddress')
     
     @property
     def DHCPEnabled(self) -> bool:
@@ -867,26 +976,19 @@ class NetConfig(AbsNetItem):
     
     @property
     def DHCPServer(self) -> IPv4 | IPv6 | None:
-        return _strToIp(self._DHCPServer)
+        return self._getParsed('DHCPServer')
     
     @property
     def DNSServerSearchOrder(self) -> tuple[IPv4 | IPv6, ...] | None:
-        return _toIpTuple(self._DNSServerSearchOrder)
+        return self._getParsed('DNSServerSearchOrder')
     
     @property
     def DefaultIPGateway(self) -> tuple[IPv4 | IPv6, ...] | None:
-        return _toIpTuple(self._DefaultIPGateway)
+        return self._getParsed('DefaultIPGateway')
     
     @property
     def MACAddress(self) -> MAC | None:
-        return _toMac(self._MACAddress)
-    
-    def getDeterminant(self, leading_under: bool = False) -> tuple[str, ...]:
-        det = ['_Index', '_InterfaceIndex', '_Caption', '_SettingID',]
-        if leading_under:
-            return tuple(det)
-        else:
-            return self._removeUnder(det)
+        return self._getParsed('MACAddress')
     
     def connectivity(self) -> bool:
         """Specifies whether this network interface has the potential
@@ -917,16 +1019,11 @@ class NetConfig(AbsNetItem):
             self,
             ips: Iterable[IPv4 | IPv6],
             ) -> NetConfigCode:
-        import wmi
-        import pythoncom
-        pythoncom.CoInitialize()
-        wmi_ = wmi.WMI()
-        configs = wmi_.Win32_NetworkAdapterConfiguration(Index=self._Index)
+        from .backend import getBackend
         ips_ = [ip.exploded for ip in ips]
         logging.debug(ips)
-        code: tuple[int] = configs[0].SetDNSServerSearchOrder(ips_)
-        pythoncom.CoUninitialize()
-        return NetConfigCode(code[0])
+        code = getBackend().setDnsSearchOrder(self._Index, ips_)
+        return NetConfigCode(code)
 
 
 def _enumNetAdaps() -> AdapCfgBag:
@@ -946,81 +1043,96 @@ def _enumNetAdaps() -> AdapCfgBag:
     return acbag
 
 
-def _assertAsStr(obj: Any) -> None:
-    """Asserts that the argument is `str`."""
-    assert isinstance(obj, str), \
-        f'expected str but got {obj.__class__.__qualname__}'
-
-
-def _assertAsInt(obj: Any) -> None:
-    """Asserts that the argument is `int``."""
-    assert isinstance(obj, int), \
-        f'expected int but got {obj.__class__.__qualname__}'
+class ItemChange(NamedTuple):
+    """A network item present in both snapshots whose fields changed."""
+    idx: ACIdx
+    old: NetAdap | NetConfig
+    """The item in the old bag."""
+    new: NetAdap | NetConfig
+    """The item in the new bag."""
+    fields: frozenset[str]
+    """The names of changed WMI properties."""
 
 
-def _assertAsBool(obj: Any) -> None:
-    """Asserts that the argument is `int``."""
-    assert isinstance(obj, bool), \
-        f'expected bool but got {obj.__class__.__qualname__}'
-
+class BagDiff(NamedTuple):
+    """The minimal change set turning one `AdapCfgBag` into another. The
+    configs of removed adapters are not listed in `removedConfigs` and
+    the configs of added adapters come with them in `addedAdaps`.
+    """
+    removedConfigs: tuple[ACIdx, ...]
+    removedAdaps: tuple[ACIdx, ...]
+    addedAdaps: tuple[NetAdap, ...]
+    addedConfigs: tuple[NetConfig, ...]
+    modified: tuple[ItemChange, ...]
 
-def _assertAsStrNone(obj: Any) -> None:
-    """Asserts that the argument is `str | None``."""
-    assert (isinstance(obj, str) or obj is None), \
-        f'expected str or None but got {obj.__class__.__qualname__}'
+    def isEmpty(self) -> bool:
+        return not any(self)
 
 
-def _assertAsTupleStrNone(obj: Any) -> None:
-    """Asserts that the argument is `tuple[str, ...] | None``."""
-    assert obj is None or (isinstance(obj, tuple) and all(
-        isinstance(item, str) for item in obj)), \
-        f'{obj} is neither a tuple of strings nor None'
+def changedFields(old: AbsNetItem, new: AbsNetItem) -> frozenset[str]:
+    """Gets the names of the fields whose values differ between two items
+    of the same type.
+    """
+    return frozenset(
+        prop
+        for attr, prop in zip(old.getAttrs(True), old.getAttrs())
+        if getattr(old, attr) != getattr(new, attr))
 
 
-def _toIpTuple(
-        ips: tuple[str, ...] | None,
-        ) -> tuple[IPv4 | IPv6, ...] | None:
-    """Converts a tuple of strings representing IP addresses to
-    `IPv4Address` or `IPv6Address`. It raises `TypeError` if not possible.
+def diffBags(old: AdapCfgBag, new: AdapCfgBag) -> BagDiff:
+    """Compares two snapshots and returns the changes to apply to `old`
+    to make it equal to `new`. Items are matched by `Index` and their
+    determinants; an item whose determinants changed is reported as
+    removed and added.
     """
-    from ipaddress import AddressValueError
-    if ips is None:
-        return None
-    res = list[IPv4 | IPv6]()
-    for ip in ips:
+    removedConfigs = list[ACIdx]()
+    removedAdaps = list[ACIdx]()
+    addedAdaps = list[NetAdap]()
+    addedConfigs = list[NetConfig]()
+    modified = list[ItemChange]()
+    # Finding removed and modified adapters...
+    keptAdaps = set[int]()
+    for adapIdx, oldAdap in old.iterAdaps():
         try:
-            res.append(IPv4(ip))
+            newAdap = new._adaps[adapIdx.adapIdx]
+        except KeyError:
+            removedAdaps.append(adapIdx)
             continue
-        except AddressValueError:
-            pass
-        try:
-            res.append(IPv6(ip))
+        if not oldAdap.equalIdentityTo(newAdap):
+            removedAdaps.append(adapIdx)
             continue
-        except AddressValueError:
-            pass
-        raise TypeError(
-            f'expected IPv4 or IPv6 but got {ip.__class__.__qualname__}')
-    return tuple(res)
-
-
-def _strToIp(ip: str | None) -> IPv4 | IPv6 | None:
-    from ipaddress import AddressValueError
-    if ip is None:
-        return None
-    try:
-        return IPv4(ip)
-    except AddressValueError:
-        pass
-    try:
-        return IPv6(ip)
-    except AddressValueError:
-        raise TypeError(
-            f'expected IPv4 or IPv6 but got {ip.__class__.__qualname__}')
-
-
-def _toMac(mac: str | None) -> MAC | None:
-    """Converts an optional MAC address string to `MAC` object."""
-    return mac if mac is None else MAC(mac)
+        keptAdaps.add(adapIdx.adapIdx)
+        fields = changedFields(oldAdap, newAdap)
+        if fields:
+            modified.append(ItemChange(adapIdx, oldAdap, newAdap, fields))
+        # Finding removed and modified configs of the adapter...
+        for cfgIdx, oldConfig in old.iterConfigs(adapIdx):
+            newConfig = newAdap._configs.get(cfgIdx.cfgIdx) # type: ignore
+            if newConfig is None or \
+                    not oldConfig.equalIdentityTo(newConfig):
+                removedConfigs.append(cfgIdx)
+                continue
+            fields = changedFields(oldConfig, newConfig)
+            if fields:
+                modified.append(
+                    ItemChange(cfgIdx, oldConfig, newConfig, fields))
+    # Finding added adapters and configs...
+    for adapIdx, newAdap in new.iterAdaps():
+        if adapIdx.adapIdx not in keptAdaps:
+            addedAdaps.append(newAdap)
+            continue
+        oldConfigs = old._adaps[adapIdx.adapIdx]._configs
+        for cIdx, newConfig in newAdap._configs.items():
+            oldConfig = oldConfigs.get(cIdx)
+            if oldConfig is None or \
+                    not oldConfig.equalIdentityTo(newConfig):
+                addedConfigs.append(newConfig)
+    return BagDiff(
+        tuple(removedConfigs),
+        tuple(removedAdaps),
+        tuple(addedAdaps),
+        tuple(addedConfigs),
+        tuple(modified))
 
 
 def _saveWmiObj(wmi_objs: Iterable[Any], file_name: PathLike[str]) -> None:
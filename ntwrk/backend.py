@@ -0,0 +1,96 @@
+#
+#
+#
+"""This module offers the interface that `NetAdap` and `NetConfig` use to
+read network adapters and their configurations from the operating system.
+It contains:
+
+#### Types
+1. `INetBackend`
+
+#### Functions
+1. `getBackend`
+2. `setBackend`
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator, Sequence
+
+
+class INetBackend(ABC):
+    """The interface of the platform-specific providers of network items.
+    The objects they yield are shaped like `Win32_NetworkAdapter` and
+    `Win32_NetworkAdapterConfiguration` instances of WMI, so `NetAdap` and
+    `NetConfig` can be initialized with them regardless of the platform.
+    """
+    @abstractmethod
+    def readAdaps(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        """Yields adapter objects whose attributes equal to the keyword
+        arguments. Yielded objects are only guaranteed to be valid until
+        the iteration finishes. If `fields` is provided, objects might have
+        only those attributes.
+        """
+        pass
+
+    @abstractmethod
+    def readConfigs(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        """Yields adapter config objects whose attributes equal to the
+        keyword arguments. Yielded objects are only guaranteed to be valid
+        until the iteration finishes. If `fields` is provided, objects might
+        have only those attributes.
+        """
+        pass
+
+    @abstractmethod
+    def setDnsSearchOrder(self, index: int, ips: Iterable[str]) -> int:
+        """Sets the DNS servers of the config with the specified `Index`.
+        An empty `ips` restores the DNS servers provided by DHCP. It returns
+        a value of `NetConfigCode`.
+        """
+        pass
+
+    def release(self) -> None:
+        """Releases the resources the backend holds for the calling thread.
+        Threads which are about to exit should call it.
+        """
+        pass
+
+
+_backend: INetBackend | None = None
+
+
+def getBackend() -> INetBackend:
+    """Gets the backend of this platform: the one set by `setBackend` or
+    WMI on Windows and netlink/sysfs on Linux. It raises `NotImplementedError`
+    for other platforms.
+    """
+    global _backend
+    import sys
+    if _backend is None:
+        if sys.platform == 'win32':
+            from .wmi_backend import WmiBackend
+            _backend = WmiBackend()
+        elif sys.platform.startswith('linux'):
+            from .linux_backend import LinuxBackend
+            _backend = LinuxBackend()
+        else:
+            raise NotImplementedError(
+                f'no network backend for {sys.platform}')
+    return _backend
+
+
+def setBackend(backend: INetBackend | None) -> None:
+    """Sets the backend used by `NetAdap` and `NetConfig`. Passing `None`
+    restores the default backend of the platform.
+    """
+    global _backend
+    _backend = backend
@@ -0,0 +1,85 @@
+#
+#
+#
+"""This module persists `AdapCfgBag` snapshots, so the application can
+show the last known network items before the backend answers. The cache
+is a compact JSON document holding only the raw WMI properties of items,
+one row per item. It contains:
+
+#### Functions
+1. `loadBag`
+2. `saveBag`
+"""
+
+from __future__ import annotations
+from os import PathLike
+from types import SimpleNamespace
+from typing import Any
+
+from . import AdapCfgBag, NetAdap, NetConfig
+
+
+_VERSION = 1
+"""The version of the cache format. Caches of other versions are
+rejected.
+"""
+
+
+def _toRow(item: NetAdap | NetConfig) -> list[Any]:
+    return [getattr(item, attr) for attr in item.getAttrs(True)]
+
+
+def _fromRow(props: list[str], row: list[Any]) -> SimpleNamespace:
+    return SimpleNamespace(**{
+        prop: tuple(value) if isinstance(value, list) else value
+        for prop, value in zip(props, row, strict=True)})
+
+
+def saveBag(bag: AdapCfgBag, file: PathLike[str] | str) -> None:
+    """Saves the snapshot to the file, replacing it atomically. It raises
+    `OSError` on I/O failures.
+    """
+    import json
+    import os
+    adaps = list[list[Any]]()
+    configs = list[list[Any]]()
+    for adapIdx, adap in bag.iterAdaps():
+        adaps.append(_toRow(adap))
+        configs.extend(_toRow(config) for _, config in bag.iterConfigs(
+            adapIdx))
+    doc = {
+        'version': _VERSION,
+        'adapProps': NetAdap._WMI_PROPS,
+        'configProps': NetConfig._WMI_PROPS,
+        'adaps': adaps,
+        'configs': configs,}
+    tmpFile = f'{os.fspath(file)}.tmp'
+    with open(tmpFile, mode='wt', encoding='utf-8') as fileObj:
+        json.dump(doc, fileObj, separators=(',', ':'))
+    os.replace(tmpFile, file)
+
+
+def loadBag(file: PathLike[str] | str) -> AdapCfgBag:
+    """Loads a snapshot saved by `saveBag`. It raises `OSError` if the
+    file cannot be read and `ValueError` if its content is not a cache
+    of this version of the application.
+    """
+    import json
+    with open(file, mode='rt', encoding='utf-8') as fileObj:
+        try:
+            doc = json.load(fileObj)
+        except json.JSONDecodeError as err:
+            raise ValueError(f'invalid bag cache: {err}') from None
+    try:
+        if doc['version'] != _VERSION or \
+                tuple(doc['adapProps']) != NetAdap._WMI_PROPS or \
+                tuple(doc['configProps']) != NetConfig._WMI_PROPS:
+            raise ValueError('incompatible bag cache')
+        bag = AdapCfgBag()
+        for row in doc['adaps']:
+            bag.addAdap(NetAdap(_fromRow(doc['adapProps'], row)))
+        for row in doc['configs']:
+            bag.addConfig(NetConfig(_fromRow(doc['configProps'], row)))
+    except (KeyError, TypeError, IndexError) as err:
+        raise ValueError(f'invalid bag cache: {err!r}') from None
+    return bag
@@ -0,0 +1,172 @@
+#
+#
+#
+"""This module offers setting the same DNS search order on many configs at
+once, as a transaction: configs are applied in parallel and, if any of
+them fails, the ones already changed are restored. It contains:
+
+#### Types
+1. `DnsBatchRes`
+
+#### Functions
+1. `applyDnsBatch`
+"""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
+import logging
+from typing import Callable, Iterable, NamedTuple
+
+from . import NetConfig, NetConfigCode
+
+
+type _Outcome = NetConfigCode | Exception
+
+
+class DnsBatchRes(NamedTuple):
+    """The outcome of `applyDnsBatch`. Configs are keyed by `Index`."""
+    applied: tuple[int, ...]
+    """The configs whose order was changed and kept."""
+    skipped: tuple[int, ...]
+    """The configs whose order already matched."""
+    failed: dict[int, _Outcome]
+    """The configs which failed, with the code or the exception."""
+    rolledBack: tuple[int, ...]
+    """The configs restored to their previous order after a failure."""
+    rollbackFailed: dict[int, _Outcome]
+    """The configs which could not be restored."""
+
+    def succeeded(self) -> bool:
+        return not self.failed
+
+
+def _onEveryWorker(
+        pool: ThreadPoolExecutor,
+        n_workers: int,
+        func: Callable[[], object],
+        ) -> None:
+    """Runs `func` once on each of `n_workers` distinct threads of the
+    pool. Every task waits at a barrier until all of them run, so none can
+    take two of them; on a fresh pool this also starts all the workers.
+    """
+    from threading import Barrier, BrokenBarrierError
+    barrier = Barrier(n_workers)
+    def task() -> None:
+        try:
+            barrier.wait(timeout=5.0)
+        except BrokenBarrierError:
+            logging.warning('DNS batch workers failed to meet')
+        func()
+    for fut in [pool.submit(task) for _ in range(n_workers)]:
+        fut.result()
+
+
+def _readPrev(config: NetConfig) -> tuple[IPv4 | IPv6, ...] | None:
+    """Reads the current order of the config from the backend rather than
+    trusting the possibly stale `config`.
+    """
+    configs = NetConfig.readAll(Index=config.Index)
+    if len(configs) != 1:
+        raise LookupError(f'{config} no longer exists')
+    return configs[0].DNSServerSearchOrder
+
+
+def _setOrder(
+        config: NetConfig,
+        ips: Iterable[IPv4 | IPv6],
+        ) -> _Outcome:
+    try:
+        return config.setDnsSearchOrder(ips)
+    except Exception as err:
+        logging.error('failed to set DNS servers of %s', config,
+            exc_info=True)
+        return err
+
+
+def applyDnsBatch(
+        configs: Iterable[NetConfig],
+        ips: Iterable[IPv4 | IPv6],
+        max_workers: int | None = None,
+        ) -> DnsBatchRes:
+    """Sets `ips` as the DNS search order of all `configs` in parallel.
+    Configs whose current order already equals `ips` are skipped. If any
+    config fails, all configs changed by this call are restored to their
+    previous order, again in parallel. An empty `ips` restores the DNS
+    servers provided by DHCP and is never skipped.
+    """
+    from .backend import getBackend
+    ips_ = tuple(ips)
+    configs_ = {config.Index: config for config in configs}
+    if not configs_:
+        return DnsBatchRes((), (), {}, (), {})
+    nWorkers = min(max_workers or len(configs_), len(configs_))
+    with ThreadPoolExecutor(
+            max_workers=nWorkers,
+            thread_name_prefix='DnsBatch') as pool:
+        # Starting all workers up front so that each of them can be
+        # released once at the end, reusing its backend session for all
+        # tasks of the batch...
+        _onEveryWorker(pool, nWorkers, lambda: None)
+        try:
+            return _applyInPool(pool, configs_, ips_)
+        finally:
+            _onEveryWorker(pool, nWorkers, getBackend().release)
+
+
+def _applyInPool(
+        pool: ThreadPoolExecutor,
+        configs: dict[int, NetConfig],
+        ips: tuple[IPv4 | IPv6, ...],
+        ) -> DnsBatchRes:
+    """Does the work of `applyDnsBatch` on the pool. `configs` are keyed
+    by `Index`.
+    """
+    applied = list[int]()
+    skipped = list[int]()
+    failed = dict[int, _Outcome]()
+    rolledBack = list[int]()
+    rollbackFailed = dict[int, _Outcome]()
+    # Capturing previous orders...
+    prevFuts = {
+        idx: pool.submit(_readPrev, config)
+        for idx, config in configs.items()}
+    mpIdxPrev = dict[int, tuple[IPv4 | IPv6, ...] | None]()
+    for idx, fut in prevFuts.items():
+        try:
+            mpIdxPrev[idx] = fut.result()
+        except Exception as err:
+            failed[idx] = err
+    if failed:
+        return DnsBatchRes((), (), failed, (), {})
+    # Applying to configs whose order differs...
+    applyFuts = dict[int, Future[_Outcome]]()
+    for idx, config in configs.items():
+        if ips and mpIdxPrev[idx] == ips:
+            skipped.append(idx)
+        else:
+            applyFuts[idx] = pool.submit(_setOrder, config, ips)
+    for idx, fut in applyFuts.items():
+        outcome = fut.result()
+        if outcome == NetConfigCode.SUCCESSFUL:
+            applied.append(idx)
+        else:
+            failed[idx] = outcome
+    if not failed:
+        return DnsBatchRes(tuple(applied), tuple(skipped), {}, (), {})
+    # Rolling back configs changed by this call...
+    rollbackFuts = {
+        idx: pool.submit(_setOrder, configs[idx], mpIdxPrev[idx] or ())
+        for idx in applied}
+    for idx, fut in rollbackFuts.items():
+        outcome = fut.result()
+        if outcome == NetConfigCode.SUCCESSFUL:
+            rolledBack.append(idx)
+        else:
+            rollbackFailed[idx] = outcome
+    return DnsBatchRes(
+        (),
+        tuple(skipped),
+        failed,
+        tuple(rolledBack),
+        rollbackFailed)
@@ -0,0 +1,253 @@
+#
+#
+#
+"""This module offers minimal DNS wire-format (RFC 1035) APIs which are
+needed for talking directly to DNS servers over UDP or TCP and contains:
+
+#### Types
+1. `QType`
+2. `RCode`
+3. `DnsHeader`
+4. `Question`
+5. `ResRecord`
+
+#### Functions
+1. `encodeName`
+2. `decodeName`
+3. `encodeRData`
+4. `buildQuery`
+5. `buildResponse`
+6. `parseHeader`
+7. `parseQuestion`
+"""
+
+from __future__ import annotations
+import enum
+from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
+import struct
+from typing import Iterable, NamedTuple
+
+
+_HEADER = struct.Struct('!HHHHHH')
+"""The layout of the 12-byte header of DNS messages."""
+
+_QTAIL = struct.Struct('!HH')
+"""The layout of `QTYPE` and `QCLASS` fields of a question."""
+
+_RRTAIL = struct.Struct('!HHIH')
+"""The layout of `TYPE`, `CLASS`, `TTL` and `RDLENGTH` fields of a
+resource record.
+"""
+
+MAX_UDP_SIZE = 512
+"""The maximum size of DNS messages over UDP without EDNS."""
+
+CLASS_IN = 1
+"""The Internet class of resource records."""
+
+FLAG_QR = 0x8000
+"""Query (0) or response (1) bit of the header flags."""
+
+FLAG_TC = 0x0200
+"""The truncation bit of the header flags."""
+
+FLAG_RD = 0x0100
+"""The recursion desired bit of the header flags."""
+
+FLAG_RA = 0x0080
+"""The recursion available bit of the header flags."""
+
+
+class QType(enum.IntEnum):
+    A = 1
+    NS = 2
+    CNAME = 5
+    SOA = 6
+    PTR = 12
+    MX = 15
+    TXT = 16
+    AAAA = 28
+
+
+class RCode(enum.IntEnum):
+    NOERROR = 0
+    """No error condition"""
+    FORMERR = 1
+    """Format error"""
+    SERVFAIL = 2
+    """Server failure"""
+    NXDOMAIN = 3
+    """Name error, the domain name does not exist"""
+    NOTIMP = 4
+    """Not implemented"""
+    REFUSED = 5
+    """Refused"""
+
+
+class DnsHeader(NamedTuple):
+    id_: int
+    flags: int
+    qdCount: int
+    anCount: int
+    nsCount: int
+    arCount: int
+
+    @property
+    def rcode(self) -> int:
+        """Gets the response code (the lowest four bits of flags)."""
+        return self.flags & 0x000F
+
+    def isResponse(self) -> bool:
+        return bool(self.flags & FLAG_QR)
+
+    def isTruncated(self) -> bool:
+        return bool(self.flags & FLAG_TC)
+
+
+class Question(NamedTuple):
+    name: str
+    """The lower-case domain name without the trailing dot."""
+    qtype: int
+    qclass: int
+
+
+class ResRecord(NamedTuple):
+    name: str
+    rtype: int
+    ttl: int
+    rdata: bytes
+    """The wire-format data of this record."""
+
+
+def encodeName(name: str) -> bytes:
+    """Encodes a domain name into a sequence of length-prefixed labels. It
+    raises `ValueError` if a label is empty or longer than 63 bytes.
+    """
+    name = name.rstrip('.')
+    if not name:
+        return b'\x00'
+    parts = list[bytes]()
+    for label in name.split('.'):
+        bLabel = label.encode('idna')
+        if not (0 < len(bLabel) < 64):
+            raise ValueError(f'invalid label in domain name: {name!r}')
+        parts.append(bytes((len(bLabel),)) + bLabel)
+    parts.append(b'\x00')
+    return b''.join(parts)
+
+
+def decodeName(data: bytes, offset: int) -> tuple[str, int]:
+    """Decodes a possibly compressed domain name starting at `offset` and
+    returns the lower-case name alongside the offset just after it. It
+    raises `ValueError` for malformed names.
+    """
+    labels = list[str]()
+    end: int | None = None
+    nJumps = 0
+    try:
+        while True:
+            length = data[offset]
+            if length & 0xC0 == 0xC0:
+                # A compression pointer...
+                if end is None:
+                    end = offset + 2
+                nJumps += 1
+                if nJumps > 16:
+                    raise ValueError('too many compression pointers')
+                offset = ((length & 0x3F) << 8) | data[offset + 1]
+                continue
+            offset += 1
+            if length == 0:
+                break
+            labels.append(data[offset:offset + length].decode('ascii'))
+            offset += length
+    except (IndexError, UnicodeDecodeError):
+        raise ValueError('malformed domain name')
+    return '.'.join(labels).lower(), (offset if end is None else end)
+
+
+def encodeRData(rtype: int, value: str) -> bytes:
+    """Encodes the textual presentation of a record data into its wire
+    format. It raises `ValueError` if the value is invalid for the type or
+    the type is not supported.
+    """
+    match rtype:
+        case QType.A:
+            return IPv4(value).packed
+        case QType.AAAA:
+            return IPv6(value).packed
+        case QType.CNAME | QType.NS | QType.PTR:
+            return encodeName(value)
+        case QType.MX:
+            pref, exchange = value.split()
+            return struct.pack('!H', int(pref)) + encodeName(exchange)
+        case QType.TXT:
+            bValue = value.strip('"').encode()
+            return b''.join(
+                bytes((len(bValue[idx:idx + 255]),)) + bValue[idx:idx + 255]
+                for idx in range(0, max(len(bValue), 1), 255))
+        case _:
+            raise ValueError(f'unsupported record type: {rtype}')
+
+
+def buildQuery(
+        id_: int,
+        name: str,
+        qtype: int = QType.A,
+        rd: bool = True,
+        ) -> bytes:
+    """Builds a standard query message with a single question."""
+    flags = FLAG_RD if rd else 0
+    return (_HEADER.pack(id_ & 0xFFFF, flags, 1, 0, 0, 0) + encodeName(name)
+        + _QTAIL.pack(qtype, CLASS_IN))
+
+
+def buildResponse(
+        header: DnsHeader,
+        question: Question,
+        answers: Iterable[ResRecord] = (),
+        rcode: int = RCode.NOERROR,
+        truncated: bool = False,
+        ) -> bytes:
+    """Builds the response to the provided query header and question. If
+    `truncated` is set, the answers are left out and the `TC` bit is set
+    so the client retries over TCP.
+    """
+    flags = FLAG_QR | FLAG_RA | (header.flags & 0x7900) | (rcode & 0x0F)
+    if truncated:
+        flags |= FLAG_TC
+        answers = ()
+    bQuestion = encodeName(question.name) + _QTAIL.pack(
+        question.qtype,
+        question.qclass)
+    bAnswers = list[bytes]()
+    for rr in answers:
+        bAnswers.append(encodeName(rr.name))
+        bAnswers.append(
+            _RRTAIL.pack(rr.rtype, CLASS_IN, rr.ttl, len(rr.rdata)))
+        bAnswers.append(rr.rdata)
+    nAnswers = len(bAnswers) // 3
+    return (_HEADER.pack(header.id_, flags, 1, nAnswers, 0, 0) + bQuestion
+        + b''.join(bAnswers))
+
+
+def parseHeader(data: bytes) -> DnsHeader:
+    """Parses the header of a DNS message. It raises `ValueError` if the
+    data is shorter than a header.
+    """
+    try:
+        return DnsHeader(*_HEADER.unpack_from(data))
+    except struct.error:
+        raise ValueError(f'expected at least 12 bytes but got {len(data)}')
+
+
+def parseQuestion(data: bytes, offset: int = 12) -> tuple[Question, int]:
+    """Parses the question starting at `offset` and returns it alongside
+    the offset just after it. It raises `ValueError` for malformed data.
+    """
+    name, offset = decodeName(data, offset)
+    try:
+        qtype, qclass = _QTAIL.unpack_from(data, offset)
+    except struct.error:
+        raise ValueError('truncated question')
+    return Question(name, qtype, qclass), offset + _QTAIL.size
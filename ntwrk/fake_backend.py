@@ -0,0 +1,272 @@
+#
+#
+#
+"""This module offers `FakeWmiBackend`, an in-memory network backend which
+synthesizes `Win32_NetworkAdapter` and `Win32_NetworkAdapterConfiguration`
+shaped objects at any scale, and scripted event streams over them. It is
+meant for benchmarks and for running the application without Windows.
+It contains:
+
+#### Types
+1. `FakeEvent`
+2. `FakeWmiBackend`
+"""
+
+from __future__ import annotations
+from random import Random
+from types import SimpleNamespace
+from typing import Any, Iterable, Iterator, Literal, NamedTuple, Sequence
+
+from .backend import INetBackend
+from .wmi_backend import ADAP_CLASS, CONFIG_CLASS
+
+
+type NotifType = Literal['Creation', 'Modification', 'Deletion']
+
+_PUBLIC_DNSES = (
+    ('8.8.8.8', '8.8.4.4',),
+    ('1.1.1.1', '1.0.0.1',),
+    ('9.9.9.9', '149.112.112.112',),
+    ('208.67.222.222', '208.67.220.220',),
+    ('2001:4860:4860::8888', '2001:4860:4860::8844',),)
+
+_PHYSICAL_DESCRS = (
+    'Intel(R) Ethernet Connection I219-V',
+    'Realtek PCIe GbE Family Controller',
+    'Intel(R) Wi-Fi 6 AX201 160MHz',
+    'Qualcomm Atheros QCA9377 Wireless Network Adapter',)
+
+_VIRTUAL_DESCRS = (
+    'Hyper-V Virtual Ethernet Adapter',
+    'WAN Miniport (IP)',
+    'WAN Miniport (IPv6)',
+    'Microsoft Kernel Debug Network Adapter',
+    'VirtualBox Host-Only Ethernet Adapter',
+    'Microsoft Wi-Fi Direct Virtual Adapter',)
+
+_VPN_DESCRS = (
+    'TAP-Windows Adapter V9',
+    'WireGuard Tunnel',
+    'Cisco AnyConnect Secure Mobility Client Virtual Miniport Adapter',
+    'Fortinet SSL VPN Virtual Ethernet Adapter',)
+
+
+class FakeEvent(NamedTuple):
+    """An event shaped like the ones `wmi.WMI().watch_for` returns."""
+    event_type: NotifType
+    wmi_class: str
+    ole_object: Any
+
+
+class FakeWmiBackend(INetBackend):
+    """Objects of this class keep adapters and configs in memory, one
+    config per adapter with the same `Index`, like WMI does.
+    """
+    def __init__(
+            self,
+            *,
+            n_physical: int = 4,
+            n_virtual: int = 0,
+            n_vpn: int = 0,
+            seed: int | None = 0,
+            ) -> None:
+        """Initializes a new backend with the specified number of physical,
+        virtual (not `PhysicalAdapter`) and VPN adapters (`PhysicalAdapter`
+        but without gateways most of the time).
+        """
+        self._rand = Random(seed)
+        self._adaps = dict[int, SimpleNamespace]()
+        self._configs = dict[int, SimpleNamespace]()
+        self._nextIdx = 1
+        for _ in range(n_physical):
+            self._create('physical')
+        for _ in range(n_virtual):
+            self._create('virtual')
+        for _ in range(n_vpn):
+            self._create('vpn')
+
+    def __len__(self) -> int:
+        return len(self._adaps)
+
+    def _create(
+            self,
+            kind: Literal['physical', 'virtual', 'vpn'],
+            ) -> tuple[SimpleNamespace, SimpleNamespace]:
+        """Creates an adapter and its config and returns them."""
+        from uuid import UUID
+        rand = self._rand
+        idx = self._nextIdx
+        self._nextIdx += 1
+        match kind:
+            case 'physical':
+                descr = rand.choice(_PHYSICAL_DESCRS)
+            case 'virtual':
+                descr = rand.choice(_VIRTUAL_DESCRS)
+            case 'vpn':
+                descr = rand.choice(_VPN_DESCRS)
+        descr = f'{descr} #{idx}'
+        caption = f'[{idx:08}] {descr}'
+        guid = '{' + str(UUID(int=rand.getrandbits(128), version=4)).upper() \
+            + '}'
+        mac = None if kind == 'virtual' and rand.random() < 0.5 else \
+            ':'.join(f'{rand.getrandbits(8) & 0xFE:02X}' if i == 0 else
+            f'{rand.getrandbits(8):02X}' for i in range(6))
+        connected = kind != 'virtual' and rand.random() < 0.8
+        adap = SimpleNamespace(
+            Description=descr,
+            DeviceID=str(idx),
+            Caption=caption,
+            Index=idx,
+            InterfaceIndex=idx + 1000,
+            NetConnectionID=f'{kind.capitalize()} {idx}',
+            NetConnectionStatus=2 if connected else 7,
+            GUID=guid,
+            MACAddress=mac,
+            PhysicalAdapter=kind != 'virtual')
+        ipEnabled = connected or kind == 'virtual' and rand.random() < 0.3
+        dhcp = kind == 'physical' and rand.random() < 0.7
+        config = SimpleNamespace(
+            Caption=caption,
+            SettingID=guid,
+            Index=idx,
+            InterfaceIndex=idx + 1000,
+            IPEnabled=ipEnabled,
+            IPAddress=self._randIps() if ipEnabled else None,
+            DHCPEnabled=dhcp,
+            DHCPServer=f'192.168.{idx % 256}.1' if dhcp and ipEnabled else
+                None,
+            DNSServerSearchOrder=rand.choice(_PUBLIC_DNSES) if ipEnabled
+                else None,
+            DefaultIPGateway=(f'192.168.{idx % 256}.1',) if connected and
+                kind == 'physical' else None,
+            MACAddress=mac)
+        self._adaps[idx] = adap
+        self._configs[idx] = config
+        return adap, config
+
+    def _randIps(self) -> tuple[str, ...]:
+        rand = self._rand
+        ips = [f'192.168.{rand.randrange(256)}.{rand.randrange(2, 255)}',]
+        if rand.random() < 0.6:
+            ips.append('fe80::' + ':'.join(
+                f'{rand.getrandbits(16):x}' for _ in range(4)))
+        return tuple(ips)
+
+    def _filter(
+            self,
+            objs: Iterable[SimpleNamespace],
+            fields: Sequence[str],
+            kwargs: dict[str, Any],
+            ) -> Iterator[SimpleNamespace]:
+        """Yields copies of objects which match `kwargs`, projected on
+        `fields` if provided.
+        """
+        for obj in objs:
+            if all(getattr(obj, key, None) == value
+                    for key, value in kwargs.items()):
+                if fields:
+                    yield SimpleNamespace(**{
+                        field: getattr(obj, field)
+                        for field in fields})
+                else:
+                    yield SimpleNamespace(**vars(obj))
+
+    def readAdaps(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        if isinstance(kwargs.get('Index'), int):
+            adap = self._adaps.get(kwargs['Index'])
+            return self._filter(
+                () if adap is None else (adap,),
+                fields,
+                kwargs)
+        return self._filter(list(self._adaps.values()), fields, kwargs)
+
+    def readConfigs(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        if isinstance(kwargs.get('Index'), int):
+            config = self._configs.get(kwargs['Index'])
+            return self._filter(
+                () if config is None else (config,),
+                fields,
+                kwargs)
+        return self._filter(list(self._configs.values()), fields, kwargs)
+
+    def setDnsSearchOrder(self, index: int, ips: Iterable[str]) -> int:
+        from . import NetConfigCode
+        try:
+            config = self._configs[index]
+        except KeyError:
+            return NetConfigCode.ERR_OCCURRED_INSTANCE
+        if not config.IPEnabled:
+            return NetConfigCode.IP_NOT_ENABLED
+        config.DNSServerSearchOrder = tuple(ips) or None
+        return NetConfigCode.SUCCESSFUL
+
+    def scriptEvents(
+            self,
+            n_events: int,
+            *,
+            weights: tuple[float, float, float] = (1.0, 8.0, 1.0),
+            ) -> Iterator[FakeEvent]:
+        """Yields `n_events` events (at least) while applying them to this
+        backend, so the stream stays consistent with `readAll`. `weights`
+        are the relative frequencies of creation, modification and
+        deletion. Creating or deleting an adapter yields events for both
+        the adapter and its config.
+        """
+        rand = self._rand
+        nYielded = 0
+        while nYielded < n_events:
+            notif = rand.choices(
+                ('Creation', 'Modification', 'Deletion',),
+                weights)[0]
+            if notif != 'Creation' and not self._adaps:
+                notif = 'Creation'
+            match notif:
+                case 'Creation':
+                    adap, config = self._create(rand.choice(
+                        ('physical', 'virtual', 'vpn',)))
+                    yield FakeEvent('Creation', ADAP_CLASS,
+                        SimpleNamespace(**vars(adap)))
+                    yield FakeEvent('Creation', CONFIG_CLASS,
+                        SimpleNamespace(**vars(config)))
+                    nYielded += 2
+                case 'Deletion':
+                    idx = rand.choice(list(self._adaps.keys()))
+                    config = self._configs.pop(idx)
+                    adap = self._adaps.pop(idx)
+                    yield FakeEvent('Deletion', CONFIG_CLASS, config)
+                    yield FakeEvent('Deletion', ADAP_CLASS, adap)
+                    nYielded += 2
+                case 'Modification':
+                    yield self._modify(rand.choice(list(self._adaps.keys())))
+                    nYielded += 1
+
+    def _modify(self, idx: int) -> FakeEvent:
+        """Modifies a random property of the adapter or config with the
+        specified index.
+        """
+        rand = self._rand
+        config = self._configs[idx]
+        match rand.randrange(4):
+            case 0:
+                adap = self._adaps[idx]
+                adap.NetConnectionStatus = 7 \
+                    if adap.NetConnectionStatus == 2 else 2
+                return FakeEvent('Modification', ADAP_CLASS,
+                    SimpleNamespace(**vars(adap)))
+            case 1:
+                config.DNSServerSearchOrder = rand.choice(_PUBLIC_DNSES)
+            case 2:
+                config.IPAddress = self._randIps()
+            case 3:
+                config.DefaultIPGateway = None if config.DefaultIPGateway \
+                    else (f'192.168.{idx % 256}.1',)
+        return FakeEvent('Modification', CONFIG_CLASS,
+            SimpleNamespace(**vars(config)))
@@ -0,0 +1,302 @@
+#
+#
+#
+"""This module offers `LinuxBackend`, the network backend of Linux which
+reads adapters from `/sys/class/net`, addresses and gateways from
+rtnetlink, and DNS servers from systemd-resolved or `resolv.conf`.
+Reading never spawns a process.
+"""
+
+from ipaddress import ip_address
+import logging
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterable, Iterator, Sequence
+from uuid import NAMESPACE_OID, uuid5
+
+from .backend import INetBackend
+
+
+_SYS_NET = Path('/sys/class/net')
+_RESOLVED_DIR = Path('/run/systemd/resolve')
+_RESOLVED_NETIF = _RESOLVED_DIR / 'netif'
+_RESOLVED_CONF = _RESOLVED_DIR / 'resolv.conf'
+_NETWORKD_LEASES = Path('/run/systemd/netif/leases')
+_RESOLV_CONF = Path('/etc/resolv.conf')
+_STUB_RESOLVER = '127.0.0.53'
+
+_IFF_UP = 0x01
+_IFF_RUNNING = 0x40
+
+_MP_OPER_STATUS = {
+    'up': 2,
+    'dormant': 8,
+    'lowerlayerdown': 7,
+    'notpresent': 4,
+    'testing': 0,
+    'down': 0,
+}
+"""The mapping between `operstate` of sysfs and `ConnStatus` values."""
+
+
+def _readSys(ifname: str, attr: str) -> str | None:
+    try:
+        return (_SYS_NET / ifname / attr).read_text().strip()
+    except OSError:
+        return None
+
+
+def _readKeyValues(file: Path) -> dict[str, str]:
+    """Reads an environment-like file of systemd, `KEY=VALUE` per line."""
+    mpKeyValue = dict[str, str]()
+    try:
+        text = file.read_text()
+    except OSError:
+        return mpKeyValue
+    for line in text.splitlines():
+        key, sep, value = line.partition('=')
+        if sep and not key.startswith('#'):
+            mpKeyValue[key.strip()] = value.strip()
+    return mpKeyValue
+
+
+def _parseServer(server: str) -> str | None:
+    """Extracts the IP from server strings of systemd-resolved such as
+    `1.1.1.1#cloudflare-dns.com`, `[2606:4700::1111]:53` or `fe80::1%2`.
+    """
+    server = server.partition('#')[0]
+    if server.startswith('['):
+        server = server[1:].partition(']')[0]
+    elif server.count(':') == 1:
+        server = server.partition(':')[0]
+    server = server.partition('%')[0]
+    try:
+        return ip_address(server).compressed
+    except ValueError:
+        return None
+
+
+def _readNameservers(file: Path) -> list[str]:
+    servers = list[str]()
+    try:
+        text = file.read_text()
+    except OSError:
+        return servers
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[0] == 'nameserver':
+            ip = _parseServer(parts[1])
+            if ip and ip != _STUB_RESOLVER:
+                servers.append(ip)
+    return servers
+
+
+def _matches(obj: Any, kwargs: dict[str, Any]) -> bool:
+    return all(
+        getattr(obj, key, None) == value
+        for key, value in kwargs.items())
+
+
+class LinuxBackend(INetBackend):
+    """Every interface is represented by one adapter and one config, both
+    indexed by the `ifindex` of the interface.
+    """
+    def _iterIfnames(self, kwargs: dict[str, Any]) -> Iterator[str]:
+        """Iterates over interface names. Filters on indexes are applied
+        here to avoid reading other interfaces.
+        """
+        import socket
+        idx = kwargs.get('Index', kwargs.get('InterfaceIndex'))
+        if isinstance(idx, int):
+            try:
+                yield socket.if_indextoname(idx)
+            except OSError:
+                pass
+            return
+        try:
+            yield from sorted(os.listdir(_SYS_NET))
+        except OSError as err:
+            logging.error('cannot list %s: %s', _SYS_NET, err)
+
+    def _readAdap(self, ifname: str) -> SimpleNamespace | None:
+        ifindex = _readSys(ifname, 'ifindex')
+        if ifindex is None:
+            return None
+        idx = int(ifindex)
+        flags = int(_readSys(ifname, 'flags') or '0', 16)
+        # Reading the MAC address...
+        mac = (_readSys(ifname, 'address') or '').upper()
+        if not mac or mac.strip('0:') == '' or len(mac) != 17:
+            mac = None
+        # Reading the status...
+        operState = _readSys(ifname, 'operstate') or 'unknown'
+        if operState == 'unknown':
+            status = 2 if flags & _IFF_RUNNING else 0
+        elif operState == 'down' and flags & _IFF_UP:
+            status = 7
+        else:
+            status = _MP_OPER_STATUS.get(operState, 0)
+        # Reading the driver...
+        devPath = _SYS_NET / ifname / 'device'
+        try:
+            driver = os.path.basename(os.readlink(devPath / 'driver'))
+        except OSError:
+            driver = ifname
+        return SimpleNamespace(
+            Description=driver,
+            DeviceID=str(idx),
+            Caption=f'[{idx:08}] {driver}',
+            Index=idx,
+            InterfaceIndex=idx,
+            NetConnectionID=ifname,
+            NetConnectionStatus=status,
+            GUID='{' + str(uuid5(NAMESPACE_OID, f'{ifname}/{mac}')).upper()
+                + '}',
+            MACAddress=mac,
+            PhysicalAdapter=devPath.exists(),
+            IPUp=bool(flags & _IFF_UP))
+
+    def readAdaps(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        for ifname in self._iterIfnames(kwargs):
+            adap = self._readAdap(ifname)
+            if adap is not None and _matches(adap, kwargs):
+                yield adap
+
+    def readConfigs(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        from .netlink import dumpAddrs, dumpDefaultGateways
+        adaps = [
+            adap
+            for ifname in self._iterIfnames(kwargs)
+            if (adap := self._readAdap(ifname)) is not None]
+        if not adaps:
+            return
+        mpIdxAddrs = dumpAddrs()
+        mpIdxGateways = dumpDefaultGateways()
+        # Reading global DNS servers, used by interfaces that resolved
+        # does not know or when resolved is not running...
+        if _RESOLVED_CONF.exists():
+            globalDns = _readNameservers(_RESOLVED_CONF)
+        else:
+            globalDns = _readNameservers(_RESOLV_CONF)
+        for adap in adaps:
+            idx = adap.Index
+            addrs = mpIdxAddrs.get(idx, [])
+            gateways = mpIdxGateways.get(idx, [])
+            # Reading DNS servers of this link...
+            linkState = _readKeyValues(_RESOLVED_NETIF / str(idx))
+            dnses = [
+                ip
+                for server in linkState.get('SERVERS', '').split()
+                if (ip := _parseServer(server))]
+            if not dnses and gateways:
+                dnses = globalDns
+            # Reading DHCP state...
+            lease = _readKeyValues(_NETWORKD_LEASES / str(idx))
+            dhcpEnabled = bool(lease) or any(
+                dynamic
+                for addr, dynamic in addrs
+                if ':' not in addr)
+            config = SimpleNamespace(
+                Caption=adap.Caption,
+                SettingID=adap.GUID,
+                Index=idx,
+                InterfaceIndex=idx,
+                IPEnabled=adap.IPUp and bool(addrs),
+                IPAddress=tuple(addr for addr, _ in addrs) or None,
+                DHCPEnabled=dhcpEnabled,
+                DHCPServer=lease.get('SERVER_ADDRESS') or None,
+                DNSServerSearchOrder=tuple(dnses) or None,
+                DefaultIPGateway=tuple(gateways) or None,
+                MACAddress=adap.MACAddress)
+            if _matches(config, kwargs):
+                yield config
+
+    def setDnsSearchOrder(self, index: int, ips: Iterable[str]) -> int:
+        """Sets DNS servers through `resolvectl` if systemd-resolved is
+        running, otherwise by rewriting `/etc/resolv.conf` which affects all
+        interfaces.
+        """
+        import socket
+        from . import NetConfigCode
+        try:
+            ips_ = [ip_address(ip).compressed for ip in ips]
+        except ValueError:
+            return NetConfigCode.BAD_IP
+        try:
+            ifname = socket.if_indextoname(index)
+        except OSError:
+            return NetConfigCode.BAD_PARAM
+        if _RESOLVED_NETIF.is_dir():
+            return self._setByResolvectl(ifname, ips_)
+        else:
+            return self._setByResolvConf(ips_)
+
+    def _setByResolvectl(self, ifname: str, ips: list[str]) -> int:
+        import subprocess
+        from . import NetConfigCode
+        if ips:
+            args = ['resolvectl', 'dns', ifname, *ips]
+        else:
+            args = ['resolvectl', 'revert', ifname]
+        try:
+            proc = subprocess.run(args, capture_output=True, text=True)
+        except OSError as err:
+            logging.error('cannot run resolvectl: %s', err)
+            return NetConfigCode.NOT_SUPPORTED
+        if proc.returncode == 0:
+            return NetConfigCode.SUCCESSFUL
+        logging.error('resolvectl failed: %s', proc.stderr.strip())
+        if 'denied' in proc.stderr.lower():
+            return NetConfigCode.ACCESS_DENIED
+        return NetConfigCode.ERR_UNKNOWN
+
+    _origResolvConf: str | None = None
+    """The content of `resolv.conf` before the first rewrite, restored if
+    an empty list of IPs is set.
+    """
+
+    def _setByResolvConf(self, ips: list[str]) -> int:
+        from tempfile import NamedTemporaryFile
+        from . import NetConfigCode
+        file = Path(os.path.realpath(_RESOLV_CONF))
+        try:
+            text = file.read_text()
+            if self._origResolvConf is None:
+                self._origResolvConf = text
+            if ips:
+                lines = [
+                    line
+                    for line in text.splitlines()
+                    if not line.lstrip().startswith('nameserver')]
+                lines.extend(f'nameserver {ip}' for ip in ips)
+                text = '\n'.join(lines) + '\n'
+            else:
+                text = self._origResolvConf
+            # Replacing the file atomically...
+            with NamedTemporaryFile(
+                    'wt',
+                    dir=file.parent,
+                    prefix='.resolv.',
+                    delete=False) as fileObj:
+                fileObj.write(text)
+            try:
+                os.chmod(fileObj.name, 0o644)
+                os.replace(fileObj.name, file)
+            except OSError:
+                os.unlink(fileObj.name)
+                raise
+        except PermissionError:
+            return NetConfigCode.ACCESS_DENIED
+        except OSError as err:
+            logging.error('cannot rewrite %s: %s', file, err)
+            return NetConfigCode.ERR_UNKNOWN
+        return NetConfigCode.SUCCESSFUL
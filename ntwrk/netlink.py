@@ -0,0 +1,244 @@
+#
+#
+#
+"""This module offers a minimal rtnetlink client for Linux, enough to dump
+addresses and routes of network interfaces without spawning any process,
+and to subscribe to their changes. It contains:
+
+#### Types
+1. `NlMsg`
+
+#### Functions
+1. `openRtnl`
+2. `dump`
+3. `iterMsgs`
+4. `iterAttrs`
+5. `msgIfindex`
+6. `parseAddr`
+7. `dumpAddrs`
+8. `dumpDefaultGateways`
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+import socket
+import struct
+from typing import Iterator, NamedTuple
+
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x01
+NLM_F_MULTI = 0x02
+NLM_F_DUMP = 0x300
+
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+RTM_GETROUTE = 26
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_CACHEINFO = 6
+IFA_F_PERMANENT = 0x80
+
+RTA_DST = 1
+RTA_OIF = 4
+RTA_GATEWAY = 5
+RTA_TABLE = 15
+RT_TABLE_MAIN = 254
+RTN_UNICAST = 1
+
+INFINITY_LIFE_TIME = 0xFFFF_FFFF
+
+RTMGRP_LINK = 0x01
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+_NLMSGHDR = struct.Struct('=IHHII')
+"""`struct nlmsghdr`: length, type, flags, sequence & port ID."""
+_RTATTR = struct.Struct('=HH')
+"""`struct rtattr`: length & type."""
+IFADDRMSG = struct.Struct('=BBBBI')
+"""`struct ifaddrmsg`: family, prefix length, flags, scope & index."""
+RTMSG = struct.Struct('=BBBBBBBBI')
+"""`struct rtmsg`: family, dst length, src length, TOS, table, protocol,
+scope, type & flags.
+"""
+IFINFOMSG = struct.Struct('=BxHiII')
+"""`struct ifinfomsg`: family, type, index, flags & change."""
+_IFA_CACHEINFO = struct.Struct('=IIII')
+"""`struct ifa_cacheinfo`: preferred, valid, created & updated."""
+
+
+class NlMsg(NamedTuple):
+    type_: int
+    """The type of the message, one of `RTM_*` constants."""
+    payload: memoryview
+    """The payload of the message without the header."""
+
+
+def _align(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def openRtnl(groups: int = 0) -> socket.socket:
+    """Opens a `NETLINK_ROUTE` socket subscribed to the specified
+    multicast groups.
+    """
+    sock = socket.socket(
+        socket.AF_NETLINK,
+        socket.SOCK_RAW,
+        socket.NETLINK_ROUTE)
+    try:
+        sock.bind((0, groups,))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def iterMsgs(data: bytes | memoryview) -> Iterator[NlMsg]:
+    """Iterates over netlink messages in a datagram. It raises `OSError`
+    for error messages.
+    """
+    view = memoryview(data)
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(view):
+        length, type_, _, _, _ = _NLMSGHDR.unpack_from(view, offset)
+        if length < _NLMSGHDR.size:
+            break
+        payload = view[offset + _NLMSGHDR.size:offset + length]
+        if type_ == NLMSG_ERROR:
+            errno = -struct.unpack_from('=i', payload)[0]
+            if errno:
+                raise OSError(errno, f'netlink error {errno}')
+        else:
+            yield NlMsg(type_, payload)
+        offset += _align(length)
+
+
+def iterAttrs(data: memoryview, offset: int) -> Iterator[tuple[int, memoryview]]:
+    """Iterates over `(type, value)` of route attributes starting at the
+    offset of the payload.
+    """
+    while offset + _RTATTR.size <= len(data):
+        length, type_ = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        yield type_, data[offset + _RTATTR.size:offset + length]
+        offset += _align(length)
+
+
+def dump(msg_type: int, body: bytes) -> Iterator[NlMsg]:
+    """Sends a dump request and yields replied messages until the dump is
+    done.
+    """
+    with openRtnl() as sock:
+        seq = 1
+        sock.sendall(_NLMSGHDR.pack(
+            _NLMSGHDR.size + len(body),
+            msg_type,
+            NLM_F_REQUEST | NLM_F_DUMP,
+            seq,
+            0) + body)
+        while True:
+            data = sock.recv(0x10000)
+            for msg in iterMsgs(data):
+                if msg.type_ == NLMSG_DONE:
+                    return
+                yield msg
+
+
+def msgIfindex(msg: NlMsg) -> int | None:
+    """Gets the interface index of a link or address message, or `None`
+    for other messages.
+    """
+    if msg.type_ in (RTM_NEWLINK, RTM_DELLINK,):
+        return IFINFOMSG.unpack_from(msg.payload)[2]
+    if msg.type_ in (RTM_NEWADDR, RTM_DELADDR,):
+        return IFADDRMSG.unpack_from(msg.payload)[4]
+    return None
+
+
+def _bytesToIp(family: int, value: memoryview) -> str:
+    return socket.inet_ntop(family, bytes(value))
+
+
+def parseAddr(msg: NlMsg) -> tuple[int, str, bool] | None:
+    """Parses an `RTM_NEWADDR` or `RTM_DELADDR` message into `(ifindex,
+    address, dynamic)` where `dynamic` specifies whether the address has a
+    finite lifetime, like DHCP leases. It returns `None` for unsupported
+    families.
+    """
+    family, _, flags, _, ifindex = IFADDRMSG.unpack_from(msg.payload)
+    if family not in (socket.AF_INET, socket.AF_INET6,):
+        return None
+    addr: str | None = None
+    dynamic = not (flags & IFA_F_PERMANENT)
+    for type_, value in iterAttrs(msg.payload, IFADDRMSG.size):
+        if type_ == IFA_LOCAL:
+            addr = _bytesToIp(family, value)
+        elif type_ == IFA_ADDRESS and addr is None:
+            addr = _bytesToIp(family, value)
+        elif type_ == IFA_CACHEINFO:
+            _, valid, _, _ = _IFA_CACHEINFO.unpack_from(value)
+            dynamic = valid != INFINITY_LIFE_TIME
+    if addr is None:
+        return None
+    return ifindex, addr, dynamic
+
+
+def dumpAddrs() -> dict[int, list[tuple[str, bool]]]:
+    """Dumps all IPv4 and IPv6 addresses of the system in the form of
+    `ifindex -> [(address, dynamic), ...]`, IPv4 addresses first.
+    """
+    v4 = defaultdict[int, list[tuple[str, bool]]](list)
+    v6 = defaultdict[int, list[tuple[str, bool]]](list)
+    body = IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+    for msg in dump(RTM_GETADDR, body):
+        if msg.type_ != RTM_NEWADDR:
+            continue
+        res = parseAddr(msg)
+        if res is None:
+            continue
+        ifindex, addr, dynamic = res
+        if ':' in addr:
+            v6[ifindex].append((addr, dynamic,))
+        else:
+            v4[ifindex].append((addr, dynamic,))
+    return {
+        idx: v4.get(idx, []) + v6.get(idx, [])
+        for idx in v4.keys() | v6.keys()}
+
+
+def dumpDefaultGateways() -> dict[int, list[str]]:
+    """Dumps the gateways of the default routes of the main table in the
+    form of `ifindex -> [gateway, ...]`.
+    """
+    gateways = defaultdict[int, list[str]](list)
+    body = RTMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0, 0, 0, 0, 0)
+    for msg in dump(RTM_GETROUTE, body):
+        if msg.type_ != RTM_NEWROUTE:
+            continue
+        family, dstLen, _, _, table, _, _, rtType, _ = RTMSG.unpack_from(
+            msg.payload)
+        if dstLen != 0 or rtType != RTN_UNICAST:
+            continue
+        gateway: str | None = None
+        oif: int | None = None
+        for type_, value in iterAttrs(msg.payload, RTMSG.size):
+            if type_ == RTA_TABLE:
+                table = struct.unpack_from('=I', value)[0]
+            elif type_ == RTA_GATEWAY:
+                gateway = _bytesToIp(family, value)
+            elif type_ == RTA_OIF:
+                oif = struct.unpack_from('=i', value)[0]
+        if table == RT_TABLE_MAIN and gateway and oif is not None:
+            gateways[oif].append(gateway)
+    return dict(gateways)
@@ -0,0 +1,153 @@
+#
+#
+#
+"""This module offers vendor lookups of MAC addresses from the IEEE OUI
+registry. The registry is converted once by `buildOuiDb` into a compact
+binary table which `OuiDb` memory-maps and binary-searches, so opening it
+parses nothing and costs almost no memory. The table is laid out as:
+
+* header: the `b'OUI1'` magic and the number of records, `>4sI`
+* records: sorted `>II` pairs of the 24-bit prefix and the offset of the
+vendor name in the string pool
+* string pool: NUL-terminated UTF-8 vendor names, each stored once
+
+It contains:
+
+#### Types
+1. `OuiDb`
+
+#### Functions
+1. `buildOuiDb`
+"""
+
+from __future__ import annotations
+from os import PathLike
+import struct
+from typing import Iterator
+
+from . import MAC
+
+
+_MAGIC = b'OUI1'
+_HEADER = struct.Struct('>4sI')
+_RECORD = struct.Struct('>II')
+
+
+def _iterRegistry(file: PathLike[str] | str) -> Iterator[tuple[int, str]]:
+    """Yields prefix-vendor pairs of the IEEE registry in either its text
+    (`oui.txt`) or CSV (`oui.csv`) format.
+    """
+    import csv
+    with open(file, mode='rt', encoding='utf-8', errors='replace',
+            newline='') as fileObj:
+        firstLine = fileObj.readline()
+        fileObj.seek(0)
+        if firstLine.startswith('Registry,'):
+            reader = csv.reader(fileObj)
+            next(reader)
+            for row in reader:
+                try:
+                    yield int(row[1], 16), row[2].strip()
+                except (IndexError, ValueError):
+                    continue
+        else:
+            # Reading lines like `00-00-0C   (hex)\t\tCisco Systems, Inc`...
+            for line in fileObj:
+                hexPart, sep, vendor = line.partition('(hex)')
+                if not sep:
+                    continue
+                try:
+                    yield int(hexPart.strip().replace('-', ''), 16), \
+                        vendor.strip()
+                except ValueError:
+                    continue
+
+
+def buildOuiDb(
+        src: PathLike[str] | str,
+        dst: PathLike[str] | str,
+        ) -> int:
+    """Converts the IEEE OUI registry file `src` into the binary table
+    `dst` and returns the number of records. Later duplicates of a prefix
+    are ignored.
+    """
+    mpOuiVendor = dict[int, str]()
+    for oui, vendor in _iterRegistry(src):
+        if 0 <= oui <= 0xFF_FF_FF:
+            mpOuiVendor.setdefault(oui, vendor)
+    # Pooling vendor names...
+    pool = bytearray()
+    mpVendorOffset = dict[str, int]()
+    records = bytearray()
+    for oui in sorted(mpOuiVendor):
+        vendor = mpOuiVendor[oui]
+        try:
+            offset = mpVendorOffset[vendor]
+        except KeyError:
+            offset = len(pool)
+            mpVendorOffset[vendor] = offset
+            pool += vendor.encode('utf-8') + b'\0'
+        records += _RECORD.pack(oui, offset)
+    with open(dst, mode='wb') as fileObj:
+        fileObj.write(_HEADER.pack(_MAGIC, len(mpOuiVendor)))
+        fileObj.write(records)
+        fileObj.write(pool)
+    return len(mpOuiVendor)
+
+
+class OuiDb:
+    """A read-only, memory-mapped view of a table made by `buildOuiDb`.
+    It is safe to share among threads.
+    """
+    def __init__(self, file: PathLike[str] | str) -> None:
+        """Opens the table. It raises `OSError` if the file cannot be
+        mapped and `ValueError` if it is not a table of this format.
+        """
+        import mmap
+        with open(file, mode='rb') as fileObj:
+            self._mm = mmap.mmap(fileObj.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self._nRecords = _HEADER.unpack_from(self._mm)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f'{file} is not an OUI table') from None
+        self._POOL_START = _HEADER.size + self._nRecords * _RECORD.size
+        if magic != _MAGIC or self._POOL_START > len(self._mm):
+            self._mm.close()
+            raise ValueError(f'{file} is not an OUI table')
+
+    def __len__(self) -> int:
+        return self._nRecords
+
+    def __enter__(self) -> OuiDb:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def lookup(self, mac: MAC | str | int) -> str | None:
+        """Gets the vendor of the MAC address, its `OUI` string or 24-bit
+        prefix, or `None` if it is not registered.
+        """
+        if isinstance(mac, MAC):
+            mac = int(mac) >> 24
+        elif isinstance(mac, str):
+            mac = int(mac.replace(':', '').replace('-', '')[:6], 16)
+        mm = self._mm
+        unpackFrom = _RECORD.unpack_from
+        lo, hi = 0, self._nRecords
+        # Binary-searching records in the mapped file...
+        while lo < hi:
+            mid = (lo + hi) // 2
+            oui, offset = unpackFrom(mm, _HEADER.size + mid * _RECORD.size)
+            if oui < mac:
+                lo = mid + 1
+            elif oui > mac:
+                hi = mid
+            else:
+                start = self._POOL_START + offset
+                return mm[start:mm.find(b'\0', start)].decode('utf-8')
+        return None
@@ -0,0 +1,185 @@
+#
+#
+#
+"""This module offers `WmiBackend`, the network backend of Windows which
+reads network items from WMI through long-lived per-thread sessions.
+"""
+
+from threading import Lock, local
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from .backend import INetBackend
+
+
+ADAP_CLASS = 'Win32_NetworkAdapter'
+CONFIG_CLASS = 'Win32_NetworkAdapterConfiguration'
+
+
+def wqlLiteral(value: Any) -> str:
+    """Converts a Python value into a WQL literal. It raises `TypeError`
+    for unsupported types.
+    """
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str):
+        value = value.replace('\\', '\\\\').replace("'", "\\'")
+        return f"'{value}'"
+    raise TypeError(
+        f'unsupported type in WQL: {value.__class__.__qualname__}')
+
+
+def buildWql(
+        wmi_class: str,
+        fields: Sequence[str] = (),
+        **where,
+        ) -> str:
+    """Builds a WQL `SELECT` query of the specified fields (or all if
+    empty) where properties equal to the keyword arguments. `None` values
+    are turned into `IS NULL`.
+    """
+    for name in (*fields, *where.keys()):
+        if not name.isidentifier():
+            raise ValueError(f'invalid WMI property name: {name}')
+    wql = f'SELECT {", ".join(fields) if fields else "*"} FROM {wmi_class}'
+    if where:
+        conds = [
+            f'{name} IS NULL' if value is None else
+                f'{name} = {wqlLiteral(value)}'
+            for name, value in where.items()]
+        wql += ' WHERE ' + ' AND '.join(conds)
+    return wql
+
+
+class _WmiSession:
+    """A COM-initialized WMI connection owned by a single thread, alongside
+    the resolved `SetDNSServerSearchOrder` methods of configs.
+    """
+    def __init__(self) -> None:
+        import pythoncom
+        import wmi
+        from time import monotonic
+        pythoncom.CoInitialize()
+        try:
+            self.conn = wmi.WMI()
+        except Exception:
+            pythoncom.CoUninitialize()
+            raise
+        self.mpIdxSetDns = dict[int, Callable[[list[str]], tuple[int]]]()
+        """The mapping of config `Index` to its `SetDNSServerSearchOrder`."""
+        self.usedAt = monotonic()
+        """The last monotonic time the connection was used."""
+
+    def isHealthy(self) -> bool:
+        """Runs the cheapest query to check the connection is alive."""
+        import pythoncom
+        import wmi
+        try:
+            self.conn.query('SELECT Name FROM Win32_OperatingSystem')
+        except (wmi.x_wmi, pythoncom.com_error):
+            return False
+        return True
+
+    def close(self) -> None:
+        import pythoncom
+        self.mpIdxSetDns.clear()
+        del self.conn
+        pythoncom.CoUninitialize()
+
+
+class WmiBackend(INetBackend):
+    """A WMI connection is bound once per thread and reused by all calls on
+    that thread. Connections not used for `health_secs` are checked before
+    reuse and reconnected if broken.
+    """
+    def __init__(self, health_secs: float = 30.0) -> None:
+        self._HEALTH_SECS = health_secs
+        self._local = local()
+        self._lock = Lock()
+        self._nSessions = 0
+
+    def _getSession(self) -> _WmiSession:
+        from time import monotonic
+        session: _WmiSession | None = getattr(self._local, 'session', None)
+        if session is not None and \
+                monotonic() - session.usedAt > self._HEALTH_SECS and \
+                not session.isHealthy():
+            self.release()
+            session = None
+        if session is None:
+            session = _WmiSession()
+            self._local.session = session
+            with self._lock:
+                self._nSessions += 1
+        session.usedAt = monotonic()
+        return session
+
+    def release(self) -> None:
+        session: _WmiSession | None = getattr(self._local, 'session', None)
+        if session is None:
+            return
+        self._local.session = None
+        session.close()
+        with self._lock:
+            self._nSessions -= 1
+
+    @property
+    def nSessions(self) -> int:
+        """The number of threads currently holding a session."""
+        return self._nSessions
+
+    def readAdaps(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        session = self._getSession()
+        yield from session.conn.query(buildWql(ADAP_CLASS, fields, **kwargs))
+
+    def readConfigs(
+            self,
+            fields: Sequence[str] = (),
+            **kwargs,
+            ) -> Iterator[Any]:
+        session = self._getSession()
+        yield from session.conn.query(
+            buildWql(CONFIG_CLASS, fields, **kwargs))
+
+    def _resolveSetDns(
+            self,
+            session: _WmiSession,
+            index: int,
+            ) -> Callable[[list[str]], tuple[int]]:
+        try:
+            return session.mpIdxSetDns[index]
+        except KeyError:
+            pass
+        configs = session.conn.query(
+            buildWql(CONFIG_CLASS, ('Index',), Index=index))
+        method = configs[0].SetDNSServerSearchOrder
+        session.mpIdxSetDns[index] = method
+        return method
+
+    def _callSetDns(self, index: int, ips: list[str]) -> int:
+        from . import NetConfigCode
+        session = self._getSession()
+        try:
+            method = self._resolveSetDns(session, index)
+        except IndexError:
+            return NetConfigCode.ERR_OCCURRED_INSTANCE
+        return method(ips)[0]
+
+    def setDnsSearchOrder(self, index: int, ips: Iterable[str]) -> int:
+        """Calls the cached method of the config. On a COM failure, the
+        session is rebound once and the call retried.
+        """
+        import pythoncom
+        import wmi
+        ips_ = list(ips)
+        try:
+            return self._callSetDns(index, ips_)
+        except (wmi.x_wmi, pythoncom.com_error):
+            # The connection or the cached instance is stale...
+            self.release()
+            return self._callSetDns(index, ips_)
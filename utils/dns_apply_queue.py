@@ -0,0 +1,131 @@
+#
+#
+#
+"""This module offers a background queue which applies DNS search orders
+to network configs off the Tk thread. It contains:
+#### Types
+1. `DnsApplyRes`
+2. `DnsApplyQueue`
+"""
+
+from __future__ import annotations
+from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
+import logging
+from queue import Queue
+from threading import Condition, Thread
+from typing import Iterable, NamedTuple
+
+from ntwrk import NetConfig, NetConfigCode
+
+
+class DnsApplyRes(NamedTuple):
+    """The outcome of applying a DNS search order to a config."""
+    config: NetConfig
+    ips: tuple[IPv4 | IPv6, ...]
+    code: NetConfigCode | None
+    """The code returned by the backend, `None` if it raised `error`."""
+    error: Exception | None = None
+
+
+class DnsApplyQueue:
+    """Applies DNS search orders to configs on a background thread. The
+    requests for the same config which have not started yet are coalesced,
+    so only the last order is applied. Results are put into the queue; the
+    Tk thread should poll it, for example with `after`, while `isBusy`
+    holds or results remain. The worker never touches Tk.
+    """
+    def __init__(self, res_q: Queue[DnsApplyRes]) -> None:
+        self._qRes = res_q
+        self._cond = Condition()
+        self._pending = dict[int, tuple[NetConfig, tuple[IPv4 | IPv6, ...]]]()
+        """The mapping of config `Index` to the latest requested order,
+        in the order of first requests.
+        """
+        self._inFlight: tuple[int, tuple[IPv4 | IPv6, ...]] | None = None
+        """The config `Index` and the order being applied right now."""
+        self._closing = False
+        self._thrd = Thread(
+            name='DNS search order applier thread',
+            target=self._run,
+            daemon=False,)
+        """The worker thread. It is not a daemon so the interpreter waits
+        for an order being applied at exit. This cannot hang as the worker
+        never waits for the Tk thread.
+        """
+
+    def start(self) -> None:
+        self._thrd.start()
+
+    def close(self) -> None:
+        """Irreversibly closes the queue. Pending requests are dropped but
+        the one being applied finishes on the worker thread. It never waits
+        for the worker, so it is safe to call on the Tk thread.
+        """
+        with self._cond:
+            self._closing = True
+            self._pending.clear()
+            self._cond.notify()
+
+    def submit(
+            self,
+            config: NetConfig,
+            ips: Iterable[IPv4 | IPv6],
+            ) -> None:
+        """Requests `ips` to be the DNS search order of `config`. An empty
+        `ips` restores the DNS servers provided by DHCP.
+        """
+        with self._cond:
+            if self._closing:
+                raise RuntimeError('the apply queue has been closed')
+            self._pending[config.Index] = (config, tuple(ips),)
+            self._cond.notify()
+
+    def isBusy(self) -> bool:
+        """Checks whether some orders are pending or being applied. Once it
+        returns `False`, the results of all orders are in the queue.
+        """
+        with self._cond:
+            return bool(self._pending) or self._inFlight is not None
+
+    def pendingOrder(self, index: int) -> tuple[IPv4 | IPv6, ...] | None:
+        """Gets the DNS search order which is pending or being applied for
+        the config with the specified `Index`, or `None` if there is none.
+        Orders of the UI should build on this rather than the config.
+        """
+        with self._cond:
+            try:
+                return self._pending[index][1]
+            except KeyError:
+                pass
+            if self._inFlight is not None and self._inFlight[0] == index:
+                return self._inFlight[1]
+        return None
+
+    def _run(self) -> None:
+        from ntwrk.backend import getBackend
+        try:
+            while True:
+                with self._cond:
+                    self._inFlight = None
+                    while not (self._pending or self._closing):
+                        self._cond.wait()
+                    if self._closing:
+                        break
+                    index = next(iter(self._pending))
+                    config, ips = self._pending.pop(index)
+                    self._inFlight = (index, ips,)
+                # Applying outside the lock so requests keep coming...
+                try:
+                    res = DnsApplyRes(
+                        config,
+                        ips,
+                        config.setDnsSearchOrder(ips))
+                except Exception as err:
+                    logging.error(
+                        'failed to set DNS servers of %s',
+                        config,
+                        exc_info=True)
+                    res = DnsApplyRes(config, ips, None, err)
+                self._qRes.put(res)
+        finally:
+            getBackend().release()
@@ -10,6 +10,7 @@ from urllib.parse import ParseResult
 
 from db import DnsServer, IDatabase
 from ntwrk import AdapCfgBag, NetAdap, NetConfig
+from ntwrk.dns_batch import DnsBatchRes
 
 
 if TYPE_CHECKING:
@@ -70,6 +71,18 @@ def readNetAdaps(q: Queue[str] | None) -> AdapCfgBag:
     return NetAdap.anumWinNetAdaps()
 
 
+def applyDnsToConfigs(
+        q: Queue[str] | None,
+        configs: Iterable[NetConfig],
+        ips: Iterable[IPv4 | IPv6],
+        ) -> DnsBatchRes:
+    """Sets the DNS search order of all configs as a transaction."""
+    from ntwrk.dns_batch import applyDnsBatch
+    if q:
+        q.put(_('APPLYING_DNS_BATCH'))
+    return applyDnsBatch(configs, ips)
+
+
 def listDnses(
         q: Queue[str] | None,
         db: IDatabase,
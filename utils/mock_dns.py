@@ -0,0 +1,496 @@
+#
+#
+#
+"""This module offers an in-process mock DNS server which listens on the
+loopback interface over both UDP and TCP. Every instance has its own
+injectable behaviour (latency distribution, loss, truncation, SERVFAIL
+ratio and TTLs) and answers from a simple zone file, so a set of instances
+on different ports can stand in for a whole catalogue of DNS servers in
+deterministic tests and benchmarks.
+
+The zone file has one record per line, `;` or `#` start comments:
+
+    example.com.        A      93.184.216.34
+    example.com.   60   AAAA   2606:2800:220:1:248:1893:25c8:1946
+    www.example.com.    CNAME  example.com.
+    example.com.        MX     10 mail.example.com.
+    example.com.        TXT    "v=spf1 -all"
+"""
+
+from __future__ import annotations
+import heapq
+import logging
+from os import PathLike
+from random import Random
+import socket
+from threading import Condition, Event, Lock, Thread
+from typing import Callable, Iterable
+
+from ntwrk.dns_wire import ResRecord
+
+
+Latency = Callable[[Random], float]
+"""A latency distribution: it receives the random generator of the server
+and returns a delay in seconds.
+"""
+
+
+def constLatency(secs: float) -> Latency:
+    return lambda _: secs
+
+
+def uniformLatency(low: float, high: float) -> Latency:
+    return lambda rnd: rnd.uniform(low, high)
+
+
+def expLatency(mean: float) -> Latency:
+    """An exponential distribution with the specified mean in seconds."""
+    return lambda rnd: rnd.expovariate(1 / mean)
+
+
+def lognormLatency(median: float, sigma: float) -> Latency:
+    """A log-normal distribution, the usual shape of real resolvers."""
+    from math import log
+    mu = log(median)
+    return lambda rnd: rnd.lognormvariate(mu, sigma)
+
+
+def _stripComment(line: str) -> str:
+    """Removes a `;` comment from the line, leaving `;` inside quoted
+    strings alone.
+    """
+    quoted = False
+    for idx, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ';' and not quoted:
+            return line[:idx]
+    return line
+
+
+class Zone:
+    """A read-only set of resource records indexed by name and type."""
+    DEFAULT_TTL = 300
+
+    @classmethod
+    def fromFile(cls, file: PathLike[str] | str) -> Zone:
+        """Reads a zone from the specified file. It raises `ValueError`
+        with the line number upon a malformed line.
+        """
+        from os import fspath
+        with open(fspath(file), mode='rt', encoding='utf-8') as fileObj:
+            return cls.fromLines(fileObj)
+
+    @classmethod
+    def fromLines(cls, lines: Iterable[str]) -> Zone:
+        from ntwrk.dns_wire import QType, encodeRData
+        zone = cls()
+        for lineNo, line in enumerate(lines, 1):
+            line = _stripComment(line)
+            if line.lstrip().startswith('#'):
+                continue
+            parts = line.split(maxsplit=2)
+            if not parts:
+                continue
+            try:
+                name = parts[0]
+                if parts[1].isdigit():
+                    ttl = int(parts[1])
+                    rtype, value = parts[2].split(maxsplit=1)
+                else:
+                    ttl = None
+                    rtype, value = parts[1], parts[2]
+                rtype_ = QType[rtype.upper()]
+                rdata = encodeRData(rtype_, value.strip())
+            except (IndexError, KeyError, ValueError) as err:
+                raise ValueError(f'bad record at line {lineNo}: {err}')
+            zone.add(name, rtype_, rdata, ttl)
+        return zone
+
+    def __init__(self) -> None:
+        self._records = dict[str, dict[int, list[tuple[int | None, bytes]]]]()
+        """The records of this zone:
+
+        `name -> type -> [(ttl, rdata), ...]`
+        """
+
+    def add(
+            self,
+            name: str,
+            rtype: int,
+            rdata: bytes,
+            ttl: int | None = None,
+            ) -> None:
+        """Adds a record. `ttl` of `None` means the default of the server."""
+        name = name.rstrip('.').lower()
+        self._records.setdefault(name, {}).setdefault(rtype, []).append(
+            (ttl, rdata,))
+
+    def resolve(
+            self,
+            name: str,
+            qtype: int,
+            ttl: int | None = None,
+            ) -> list[ResRecord] | None:
+        """Returns answers for the question following `CNAME` chains or
+        `None` if the name does not exist. If `ttl` is provided, it
+        overrides TTLs of all records.
+        """
+        from ntwrk.dns_wire import QType, decodeName
+        answers = list[ResRecord]()
+        for _ in range(8):
+            try:
+                types = self._records[name]
+            except KeyError:
+                return answers or None
+            if qtype in types:
+                rtype = qtype
+            elif QType.CNAME in types:
+                rtype = QType.CNAME
+            else:
+                return answers
+            for ttl_, rdata in types[rtype]:
+                if ttl is not None:
+                    ttl_ = ttl
+                elif ttl_ is None:
+                    ttl_ = self.DEFAULT_TTL
+                answers.append(ResRecord(name, rtype, ttl_, rdata))
+            if rtype == qtype:
+                return answers
+            # Following the CNAME...
+            name, _ = decodeName(types[rtype][0][1], 0)
+        return answers
+
+
+class _DelayLine:
+    """Sends UDP datagrams at their due time from a single thread, so
+    injected latency never blocks the receiving loop.
+    """
+    def __init__(self, sock: socket.socket, closed: Event) -> None:
+        self._sock = sock
+        self._closed = closed
+        self._heap = list[tuple[float, int, bytes, tuple]]()
+        self._cond = Condition()
+        self._seq = 0
+        self._thrd = Thread(
+            name='Mock DNS delay line',
+            target=self._run,
+            daemon=True,)
+        self._thrd.start()
+
+    def put(self, due: float, data: bytes, addr: tuple) -> None:
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (due, self._seq, data, addr))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Wakes the thread up and waits for it to exit. The closed event
+        must be set beforehand.
+        """
+        with self._cond:
+            self._cond.notify()
+        self._thrd.join()
+
+    def _run(self) -> None:
+        from time import monotonic
+        while not self._closed.is_set():
+            with self._cond:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                wait = self._heap[0][0] - monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                _, _, data, addr = heapq.heappop(self._heap)
+            try:
+                self._sock.sendto(data, addr)
+            except OSError:
+                pass
+
+
+class MockDnsServer:
+    """A mock DNS server on the loopback interface. Call `start` to begin
+    serving and `close` to release sockets and threads.
+    """
+    def __init__(
+            self,
+            zone: Zone | PathLike[str] | str | None = None,
+            *,
+            port: int = 0,
+            ipv6: bool = False,
+            latency: Latency | None = None,
+            loss_rate: float = 0.0,
+            trunc_rate: float = 0.0,
+            servfail_rate: float = 0.0,
+            ttl: int | None = None,
+            seed: int | None = None,
+            ) -> None:
+        """Initializes a new mock server. Arguments are as follow:
+
+        * `zone`: a `Zone` object or the path to a zone file. With `None`
+        every name is answered with `NXDOMAIN`.
+        * `port`: the port for both UDP and TCP, zero picks a free one.
+        * `latency`: the distribution of response delays.
+        * `loss_rate`: the ratio of queries never answered.
+        * `trunc_rate`: the ratio of UDP responses with `TC` bit set.
+        * `servfail_rate`: the ratio of queries answered with `SERVFAIL`.
+        * `ttl`: if provided, overrides TTLs of all records.
+        * `seed`: the seed of the random generators for reproducible runs.
+        UDP and TCP have their own generators so each transport is
+        reproducible regardless of the traffic of the other.
+        """
+        if zone is None or isinstance(zone, Zone):
+            self._zone = zone or Zone()
+        else:
+            self._zone = Zone.fromFile(zone)
+        self._HOST = '::1' if ipv6 else '127.0.0.1'
+        self._FAMILY = socket.AF_INET6 if ipv6 else socket.AF_INET
+        self._reqPort = port
+        self.latency = latency
+        self.lossRate = loss_rate
+        self.truncRate = trunc_rate
+        self.servfailRate = servfail_rate
+        self.ttl = ttl
+        self._rndUdp = Random(seed)
+        self._rndTcp = Random(None if seed is None else f'{seed}/tcp')
+        self._lock = Lock()
+        """Guards the random generators and `nQueries` among serving
+        threads.
+        """
+        self._closed = Event()
+        self._udp: socket.socket | None = None
+        self._tcp: socket.socket | None = None
+        self._delayLine: _DelayLine | None = None
+        self._thrds = list[Thread]()
+        self.nQueries = 0
+        """The number of queries received so far."""
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Gets the `(host, port)` of this server. It raises `RuntimeError`
+        if the server has not started.
+        """
+        if self._udp is None:
+            raise RuntimeError('the mock DNS server has not started')
+        return self._udp.getsockname()[:2]
+
+    @property
+    def port(self) -> int:
+        return self.address[1]
+
+    def start(self) -> MockDnsServer:
+        """Binds the sockets and starts serving. It returns the server
+        itself for chaining.
+        """
+        try:
+            self._udp = socket.socket(self._FAMILY, socket.SOCK_DGRAM)
+            self._udp.bind((self._HOST, self._reqPort))
+            port = self._udp.getsockname()[1]
+            self._tcp = socket.socket(self._FAMILY, socket.SOCK_STREAM)
+            self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._tcp.bind((self._HOST, port))
+            self._tcp.listen(16)
+        except OSError:
+            # Releasing whichever socket was already opened...
+            for sock in (self._udp, self._tcp):
+                if sock:
+                    sock.close()
+            self._udp = self._tcp = None
+            raise
+        self._udp.settimeout(0.2)
+        self._tcp.settimeout(0.2)
+        self._delayLine = _DelayLine(self._udp, self._closed)
+        self._thrds.append(Thread(
+            name=f'Mock DNS UDP {port}',
+            target=self._serveUdp,
+            daemon=True,))
+        self._thrds.append(Thread(
+            name=f'Mock DNS TCP {port}',
+            target=self._serveTcp,
+            daemon=True,))
+        for thrd in self._thrds:
+            thrd.start()
+        return self
+
+    def close(self) -> None:
+        """Stops serving and releases sockets and threads."""
+        self._closed.set()
+        for thrd in self._thrds:
+            thrd.join()
+        self._thrds.clear()
+        # Stopping delayed sends before closing their socket...
+        if self._delayLine:
+            self._delayLine.close()
+            self._delayLine = None
+        if self._udp:
+            self._udp.close()
+        if self._tcp:
+            self._tcp.close()
+
+    def __enter__(self) -> MockDnsServer:
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _answer(self, query: bytes, udp: bool) -> tuple[bytes | None, float]:
+        """Computes the response to the query alongside its delay. The
+        response is `None` if the query must be dropped.
+        """
+        from ntwrk.dns_wire import (MAX_UDP_SIZE, RCode, buildResponse,
+            parseHeader, parseQuestion)
+        rnd = self._rndUdp if udp else self._rndTcp
+        # Drawing all random outcomes at once, in a fixed order...
+        with self._lock:
+            self.nQueries += 1
+            lost = bool(self.lossRate) and rnd.random() < self.lossRate
+            delay = max(0.0, self.latency(rnd)) if self.latency else 0.0
+            servfail = bool(self.servfailRate) and \
+                rnd.random() < self.servfailRate
+            truncated = udp and bool(self.truncRate) and \
+                rnd.random() < self.truncRate
+        if lost:
+            return None, 0.0
+        try:
+            header = parseHeader(query)
+            question, _ = parseQuestion(query)
+        except ValueError:
+            return None, 0.0
+        if header.isResponse():
+            return None, 0.0
+        if servfail:
+            return buildResponse(header, question, rcode=RCode.SERVFAIL), \
+                delay
+        answers = self._zone.resolve(question.name, question.qtype, self.ttl)
+        if answers is None:
+            return buildResponse(header, question, rcode=RCode.NXDOMAIN), \
+                delay
+        response = buildResponse(header, question, answers, truncated=truncated)
+        if udp and len(response) > MAX_UDP_SIZE:
+            response = buildResponse(header, question, truncated=True)
+        return response, delay
+
+    def _serveUdp(self) -> None:
+        from time import monotonic
+        while not self._closed.is_set():
+            try:
+                query, addr = self._udp.recvfrom(4096) # type: ignore
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed.is_set():
+                    break
+                continue
+            response, delay = self._answer(query, True)
+            if response is None:
+                continue
+            if delay:
+                self._delayLine.put(monotonic() + delay, response, addr) # type: ignore
+            else:
+                try:
+                    self._udp.sendto(response, addr) # type: ignore
+                except OSError:
+                    pass
+
+    def _serveTcp(self) -> None:
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._tcp.accept() # type: ignore
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed.is_set():
+                    break
+                continue
+            Thread(
+                name='Mock DNS TCP connection',
+                target=self._serveConn,
+                args=(conn,),
+                daemon=True,).start()
+
+    def _serveConn(self, conn: socket.socket) -> None:
+        conn.settimeout(0.2)
+        buff = b''
+        try:
+            while not self._closed.is_set():
+                try:
+                    chunk = conn.recv(4096)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    break
+                buff += chunk
+                # Every message is prefixed by a two-byte length...
+                while len(buff) >= 2:
+                    length = (buff[0] << 8) | buff[1]
+                    if len(buff) < length + 2:
+                        break
+                    query, buff = buff[2:length + 2], buff[length + 2:]
+                    response, delay = self._answer(query, False)
+                    if response is None:
+                        continue
+                    if delay:
+                        self._closed.wait(delay)
+                    conn.sendall(len(response).to_bytes(2, 'big') + response)
+        except OSError as err:
+            logging.debug('mock DNS TCP connection failed: %s', err)
+        finally:
+            conn.close()
+
+
+class MockDnsFarm:
+    """A set of mock DNS servers on different ports of the loopback, one
+    per name, typically the names of a `dns_servers` catalogue.
+    """
+    def __init__(
+            self,
+            names: Iterable[str],
+            zone: Zone | PathLike[str] | str | None = None,
+            overrides: dict[str, dict] | None = None,
+            **kwargs,
+            ) -> None:
+        """Initializes a farm. `kwargs` are passed to every `MockDnsServer`
+        and `overrides` maps a name to the keyword arguments specific to
+        its server.
+        """
+        if zone is not None and not isinstance(zone, Zone):
+            zone = Zone.fromFile(zone)
+        overrides = overrides or {}
+        self._servers = dict[str, MockDnsServer]()
+        for name in names:
+            kwargs_ = dict(kwargs)
+            kwargs_.update(overrides.get(name, {}))
+            self._servers[name] = MockDnsServer(zone, **kwargs_)
+
+    def __getitem__(self, name: str) -> MockDnsServer:
+        return self._servers[name]
+
+    def __iter__(self):
+        return iter(self._servers.items())
+
+    def start(self) -> MockDnsFarm:
+        """Starts all servers. If one of them fails, the ones already
+        started are closed before the error propagates.
+        """
+        started = list[MockDnsServer]()
+        try:
+            for server in self._servers.values():
+                server.start()
+                started.append(server)
+        except OSError:
+            for server in started:
+                server.close()
+            raise
+        return self
+
+    def close(self) -> None:
+        for server in self._servers.values():
+            server.close()
+
+    def __enter__(self) -> MockDnsFarm:
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.close()
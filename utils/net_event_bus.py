@@ -0,0 +1,77 @@
+#
+#
+#
+
+from collections import deque
+import logging
+from threading import Lock
+from time import perf_counter
+import tkinter as tk
+from typing import Callable, Iterable, Literal, NamedTuple
+
+from ntwrk import NetAdap, NetConfig
+
+
+type NetOp = Literal['creation', 'modification', 'deletion']
+
+
+class NetEvent(NamedTuple):
+    """A change of a network item, as observed by a monitor."""
+    op: NetOp
+    item: NetAdap | NetConfig
+
+
+class NetEventBus:
+    """Delivers network events from any thread to the Tk thread. Posters
+    append batches to a single queue and at most one `<<NetEvents>>` is
+    pending at a time. The Tk side drains the queue in one callback, which
+    yields back to the event loop whenever it runs out of its per-frame
+    budget.
+    """
+    def __init__(
+            self,
+            app_win: tk.Tk,
+            handler: Callable[[NetEvent], None],
+            budget_ms: float = 16.0,
+            ) -> None:
+        """Initializes the bus. It must be called on the Tk thread as it
+        binds `<<NetEvents>>` on `app_win`.
+        """
+        self._appTk = app_win
+        self._cbHandler = handler
+        self._BUDGET = budget_ms / 1000
+        """The maximum time in seconds handled per frame."""
+        self._lock = Lock()
+        self._events = deque[NetEvent]()
+        self._notifyPending = False
+        """Whether `<<NetEvents>>` or a continuation is already pending."""
+        self._appTk.bind('<<NetEvents>>', self._onNetEvents, add='+')
+
+    def post(self, events: Iterable[NetEvent]) -> None:
+        """Appends a batch of events. It is safe to call from any thread."""
+        with self._lock:
+            nEvents = len(self._events)
+            self._events.extend(events)
+            notify = not self._notifyPending and \
+                len(self._events) > nEvents
+            if notify:
+                self._notifyPending = True
+        if notify:
+            self._appTk.event_generate('<<NetEvents>>', when='tail')
+
+    def _onNetEvents(self, _: tk.Event | None = None) -> None:
+        deadline = perf_counter() + self._BUDGET
+        while True:
+            with self._lock:
+                if not self._events:
+                    self._notifyPending = False
+                    return
+                event = self._events.popleft()
+            try:
+                self._cbHandler(event)
+            except Exception:
+                logging.error('failed to handle %s', event, exc_info=True)
+            if perf_counter() >= deadline:
+                break
+        # Letting Tk redraw before handling the rest...
+        self._appTk.after(1, self._onNetEvents)
@@ -1,284 +1,611 @@
 #
-# 
+#
 #
 
+from abc import ABC, abstractmethod
 import logging
-from queue import Queue
+from operator import attrgetter
+import socket
+import struct
 from threading import Event, Thread
-import tkinter as tk
+from time import monotonic
+from typing import Any, Iterable, Iterator, TypeVar
+
+from ntwrk import AbsNetItem, NetAdap, NetConfig, changedFields
+from ntwrk.wmi_backend import ADAP_CLASS, CONFIG_CLASS
+from utils.net_event_bus import NetEvent, NetEventBus, NetOp
+
+
+_T = TypeVar('_T', bound=AbsNetItem)
+
+
+def buildEventWql(classes: Iterable[str], within_secs: float = 1) -> str:
+    """Builds a WQL query of `__InstanceOperationEvent` covering the
+    creation, modification and deletion of instances of all `classes`.
+    """
+    conds = ' OR '.join(
+        f"TargetInstance ISA '{class_}'"
+        for class_ in classes)
+    return (f'SELECT * FROM __InstanceOperationEvent WITHIN {within_secs} '
+        f'WHERE {conds}')
+
+
+class _Pending:
+    """The events of one network item received within the window."""
+    __slots__ = ('deadline', 'firstOp', 'firstItem', 'lastOp', 'lastItem',)
+
+    def __init__(self, deadline: float, op: NetOp, item: AbsNetItem) -> None:
+        self.deadline = deadline
+        self.firstOp = op
+        self.firstItem = item
+        self.lastOp = op
+        self.lastItem = item
+
+
+class _EventCoalescer:
+    """Collects events keyed by (class, `Index`) for a window after the
+    first one and then releases their net effect: the latest state for
+    modifications, a creation or deletion if the item appeared or vanished,
+    or nothing if it was created and deleted within the window.
+    """
+    def __init__(self, window_secs: float) -> None:
+        self._WINDOW = window_secs
+        self._pending = dict[tuple[str, int], _Pending]()
+        """The pending events in the order of arrival of their first
+        event, and so of their deadlines.
+        """
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(
+            self,
+            class_: str,
+            op: NetOp,
+            item: AbsNetItem,
+            now: float,
+            ) -> None:
+        key = (class_, item.Index,)
+        try:
+            pending = self._pending[key]
+        except KeyError:
+            self._pending[key] = _Pending(now + self._WINDOW, op, item)
+        else:
+            pending.lastOp = op
+            pending.lastItem = item
+
+    def nextDeadline(self) -> float | None:
+        for pending in self._pending.values():
+            return pending.deadline
+        return None
+
+    def popDue(self, now: float) -> Iterator[tuple[str, NetOp, AbsNetItem]]:
+        """Yields the net (class, operation, item) events of keys whose
+        window has elapsed by `now`.
+        """
+        while self._pending:
+            key, pending = next(iter(self._pending.items()))
+            if pending.deadline > now:
+                return
+            del self._pending[key]
+            existedBefore = pending.firstOp != 'creation'
+            existsAfter = pending.lastOp != 'deletion'
+            if existedBefore and existsAfter:
+                if pending.firstOp == 'deletion':
+                    # Deleted and then re-created...
+                    yield key[0], 'deletion', pending.firstItem
+                    yield key[0], 'creation', pending.lastItem
+                else:
+                    yield key[0], 'modification', pending.lastItem
+            elif existedBefore:
+                yield key[0], 'deletion', pending.lastItem
+            elif existsAfter:
+                yield key[0], 'creation', pending.lastItem
+
 
-import pythoncom
-import wmi
+def _diffItems(
+        known: dict[int, _T],
+        current: dict[int, _T],
+        idxs: Iterable[int],
+        ) -> tuple[list[_T], list[_T], list[_T]]:
+    """Compares the current state of the items at `idxs` with the known
+    one, updates `known`, and returns the deleted, created and modified
+    items. An item whose identity changed is both deleted and created.
+    """
+    deleted = list[_T]()
+    created = list[_T]()
+    modified = list[_T]()
+    for idx in idxs:
+        old = known.get(idx)
+        new = current.get(idx)
+        if old is None and new is None:
+            continue
+        elif new is None:
+            deleted.append(known.pop(idx)) # type: ignore
+        elif old is None:
+            created.append(new)
+            known[idx] = new
+        elif not old.equalIdentityTo(new):
+            deleted.append(old)
+            created.append(new)
+            known[idx] = new
+        elif changedFields(old, new):
+            modified.append(new)
+            known[idx] = new
+    return deleted, created, modified
 
-from ntwrk import NetAdap, NetConfig
+
+def _pollItems(
+        item_type: type[_T],
+        objs: Iterable[Any],
+        known: dict[int, _T],
+        hashes: dict[int, int],
+        ) -> tuple[list[_T], list[_T], list[_T]]:
+    """Fingerprints the backend objects and converts only the ones whose
+    fingerprint differs from `hashes` into `item_type`. It updates `known`
+    and `hashes` and returns the deleted, created and modified items.
+    Objects lacking a field keep their previous state.
+    """
+    getFields = attrgetter(*item_type._WMI_PROPS)
+    seen = set[int]()
+    current = dict[int, _T]()
+    for obj in objs:
+        idx = getattr(obj, 'Index', None)
+        if not isinstance(idx, int):
+            continue
+        seen.add(idx)
+        try:
+            fields = getFields(obj)
+        except AttributeError:
+            continue
+        try:
+            hash_ = hash(fields)
+        except TypeError:
+            # Hashing lists of raw WMI arrays...
+            hash_ = hash(tuple(
+                tuple(field) if isinstance(field, list) else field
+                for field in fields))
+        if hashes.get(idx) == hash_:
+            continue
+        try:
+            current[idx] = item_type(obj)
+        except TypeError as err:
+            logging.debug(
+                'the backend object is inconsistent with %s\n%s',
+                item_type.__qualname__,
+                err)
+            continue
+        hashes[idx] = hash_
+    gone = known.keys() - seen
+    for idx in gone:
+        hashes.pop(idx, None)
+    return _diffItems(known, current, current.keys() | gone)
+
+
+class INetItemMonitor(ABC):
+    """The interface of the platform-specific watchers of network items.
+    They run on their own thread and post the creation, modification and
+    deletion of adapters and configs to an event bus.
+    """
+    @abstractmethod
+    def start(self) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Irreversibly closes the monitor and all its resources."""
+        pass
 
 
-class NetItemMonitor:
+def createNetItemMonitor(
+        bus: NetEventBus,
+        polling: bool = False,
+        ) -> INetItemMonitor:
+    """Creates the monitor of this platform: WMI on Windows and rtnetlink
+    on Linux. The polling monitor is used if `polling` is set or the
+    platform offers no event subscription.
+    """
+    import sys
+    if polling:
+        return PollingNetItemMonitor(bus)
+    elif sys.platform == 'win32':
+        return WmiNetItemMonitor(bus)
+    elif sys.platform.startswith('linux'):
+        return NetlinkNetItemMonitor(bus)
+    else:
+        return PollingNetItemMonitor(bus)
+
+
+class WmiNetItemMonitor(INetItemMonitor):
+    """Watches the creation, modification and deletion of network adapters
+    and their configs through a single WMI event subscription on a single
+    thread, and posts them to the event bus in batches. Bursts of events
+    of the same item within `coalesce_ms` are posted as their net effect.
+    """
+    _TIMEOUT_MS = 500
+    """The maximum time the watcher waits for an event before checking
+    the close signal.
+    """
+
     def __init__(
             self,
-            app_win: tk.Tk,
-            adap_change: Queue[NetAdap],
-            adap_creation: Queue[NetAdap],
-            adap_deletion: Queue[NetAdap],
-            config_change: Queue[NetConfig],
-            config_creation: Queue[NetConfig],
-            config_deletion: Queue[NetConfig],
+            bus: NetEventBus,
+            coalesce_ms: int = 200,
             ) -> None:
-        self._appTk = app_win
-        self._qAdapChange = adap_change
-        self._qAdapCreation = adap_creation
-        self._qAdapDeletion = adap_deletion
-        self._qConfigChange = config_change
-        self._qConfigCreation = config_creation
-        self._qConfigDeletion = config_deletion
-        self._thrds = list[Thread]()
+        self._bus = bus
+        self._coalescer = _EventCoalescer(coalesce_ms / 1000)
+        self._mpClassType: dict[str, type[NetAdap] | type[NetConfig]] = {
+            ADAP_CLASS: NetAdap,
+            CONFIG_CLASS: NetConfig,}
+        """The mapping of WMI classes to their network item types."""
+        self._thrd = Thread(
+            name='Network items watcher thread',
+            target=self._watch,
+            daemon=True,)
         self._closeSig = Event()
-    
+
     def start(self) -> None:
-        #
-        self._thrds.append(Thread(
-            name='NetAdap change watcher thread',
-            target=_watchAdapChange,
-            args=(self._appTk, self._qAdapChange, self._closeSig),
-            daemon=True,))
-        #
-        self._thrds.append(Thread(
-            name='NetAdap creation watcher thread',
-            target=_watchAdapCreation,
-            args=(self._appTk, self._qAdapCreation, self._closeSig),
-            daemon=True,))
-        #
-        self._thrds.append(Thread(
-            name='NetAdap deletion watcher thread',
-            target=_watchAdapDeletion,
-            args=(self._appTk, self._qAdapDeletion, self._closeSig),
-            daemon=True,))
-        #
-        self._thrds.append(Thread(
-            name='NetConfig modification watcher thread',
-            target=_watchConfigChange,
-            args=(self._appTk, self._qConfigChange, self._closeSig),
-            daemon=True,))
-        #
-        self._thrds.append(Thread(
-            name='NetConfig creation watcher thread',
-            target=_watchConfigCreation,
-            args=(self._appTk, self._qConfigCreation, self._closeSig),
-            daemon=True,))
-        #
-        self._thrds.append(Thread(
-            name='NetConfig deletion watcher thread',
-            target=_watchConfigDeletion,
-            args=(self._appTk, self._qConfigDeletion, self._closeSig),
-            daemon=True,))
-        # Running threads...
-        for thrd in self._thrds:
-            thrd.start()
+        self._thrd.start()
 
     def close(self) -> None:
-        """Irreversibly closes the monitor and all its resources."""
+        """Irreversibly closes the monitor and all its resources. The
+        watcher thread exits within `_TIMEOUT_MS`.
+        """
         self._closeSig.set()
 
+    def _watch(self) -> None:
+        import pythoncom
+        import wmi
+        pythoncom.CoInitialize()
+        try:
+            wmi_ = wmi.WMI()
+            watcher = wmi_.watch_for(
+                raw_wql=buildEventWql((ADAP_CLASS, CONFIG_CLASS,)),
+                wmi_class=ADAP_CLASS,)
+            while not self._closeSig.is_set():
+                # Waking up no later than the next coalescing deadline...
+                timeoutMs = self._TIMEOUT_MS
+                deadline = self._coalescer.nextDeadline()
+                if deadline is not None:
+                    timeoutMs = max(0, min(
+                        timeoutMs,
+                        int((deadline - monotonic()) * 1000)))
+                try:
+                    event = watcher(timeout_ms=timeoutMs)
+                except wmi.x_wmi_timed_out:
+                    pass
+                except wmi.x_wmi as err:
+                    logging.debug(err)
+                else:
+                    self._collect(event)
+                self._bus.post(
+                    NetEvent(op, item) # type: ignore
+                    for _, op, item in self._coalescer.popDue(monotonic()))
+        finally:
+            pythoncom.CoUninitialize()
 
-def _watchAdapChange(
-        app_tk: tk.Tk,
-        q: Queue[NetAdap],
-        cancel: Event,
-        ) -> None:
-    pythoncom.CoInitialize()
-    wmi_ = wmi.WMI()
-    watcher = wmi_.watch_for(
-        notification_type='Modification',
-        wmi_class='Win32_NetworkAdapter',
-        delay_secs=1,)
-    while True:
-        # Checking cancel is requested...
-        if cancel.is_set():
-            break
-        # Looking for adapter changes...
+    def _collect(self, event: Any) -> None:
+        """Converts the target instance of the event into its network item
+        and adds it to the coalescer.
+        """
+        import pythoncom
         try:
-            event = watcher()
-            try:
-                q.put(NetAdap(event.ole_object))
-                app_tk.event_generate(
-                    '<<NetAdapChanged>>',
-                    when='tail',)
-            except TypeError as err:
-                logging.debug(
-                    'the WMI object is inconsistent with NetAdap\n%s',
-                    err)
-        except wmi.x_wmi_timed_out:
-            logging.debug('Timeout waiting for event')
-        except wmi.x_wmi as err:
-            logging.debug(err)
-    pythoncom.CoUninitialize()
-
-
-def _watchAdapCreation(
-        app_tk: tk.Tk,
-        q: Queue[NetAdap],
-        cancel: Event,
-        ) -> None:
-    pythoncom.CoInitialize()
-    wmi_ = wmi.WMI()
-    watcher = wmi_.watch_for(
-        notification_type='Creation',
-        wmi_class='Win32_NetworkAdapter',
-        delay_secs=1,)
-    while True:
-        # Checking cancel is requested...
-        if cancel.is_set():
-            break
-        # Looking for adapter changes...
+            class_ = event.ole_object.SystemProperties_('__CLASS').Value
+            itemType = self._mpClassType[class_]
+            op: NetOp = event.event_type
+        except (AttributeError, KeyError, pythoncom.com_error):
+            logging.debug('unexpected WMI event: %s', event)
+            return
         try:
-            event = watcher()
-            try:
-                q.put(NetAdap(event.ole_object))
-                app_tk.event_generate(
-                    '<<NetAdapCreated>>',
-                    when='tail',)
-            except TypeError as err:
-                logging.debug(
-                    'the WMI object is inconsistent with NetAdap\n%s',
-                    err)
-        except wmi.x_wmi_timed_out:
-            logging.debug('Timeout waiting for event')
-        except wmi.x_wmi as err:
-            logging.debug(err)
-    pythoncom.CoUninitialize()
-
-
-def _watchAdapDeletion(
-        app_tk: tk.Tk,
-        q: Queue[NetAdap],
-        cancel: Event,
-        ) -> None:
-    pythoncom.CoInitialize()
-    wmi_ = wmi.WMI()
-    watcher = wmi_.watch_for(
-        notification_type='Deletion',
-        wmi_class='Win32_NetworkAdapter',
-        delay_secs=1,)
-    while True:
-        # Checking cancel is requested...
-        if cancel.is_set():
-            break
-        # Looking for adapter changes...
+            item = itemType(event.ole_object)
+        except TypeError as err:
+            logging.debug(
+                'the WMI object is inconsistent with %s\n%s',
+                itemType.__qualname__,
+                err)
+            return
+        self._coalescer.add(class_, op, item, monotonic())
+
+
+class NetlinkNetItemMonitor(INetItemMonitor):
+    """Watches network interfaces of Linux through an rtnetlink socket
+    subscribed to link and address changes. The thread sleeps until the
+    kernel notifies a change or the monitor is closed, so nothing is
+    polled. Notified interfaces are re-read after `coalesce_ms` and
+    compared with their last known state to post the net events. If
+    notifications are lost or re-reading fails, all interfaces are re-read
+    on the next attempt.
+
+    It can be exercised in an isolated network namespace, provided sysfs
+    is remounted there, as the backend reads interfaces from
+    `/sys/class/net` which otherwise still shows the parent namespace:
+
+        unshare -rnm sh -c 'mount -t sysfs sysfs /sys && exec python ...'
+    """
+    _RCVBUF = 1 << 20
+    """The receive buffer of the netlink socket. If it overflows, all
+    interfaces are re-read.
+    """
+    _RETRY_SECS = 1.0
+    """The delay before reading interfaces again after a failure."""
+
+    def __init__(
+            self,
+            bus: NetEventBus,
+            coalesce_ms: int = 0,
+            ) -> None:
+        self._bus = bus
+        self._WINDOW = coalesce_ms / 1000
+        self._mpIdxAdap = dict[int, NetAdap]()
+        """The last known adapters, keyed by `Index`."""
+        self._mpIdxConfig = dict[int, NetConfig]()
+        """The last known configs, keyed by `Index`."""
+        self._seeded = False
+        """Whether the known state has been read at least once."""
+        self._resync = False
+        """Whether notifications were lost and all interfaces must be
+        re-read.
+        """
+        self._thrd = Thread(
+            name='Network items watcher thread',
+            target=self._watch,
+            daemon=True,)
+        self._closeSig = Event()
+        self._wakeSock, self._wakePeer = socket.socketpair()
+        """The pair of sockets which wakes the watcher up on closing."""
+
+    def start(self) -> None:
+        self._thrd.start()
+
+    def close(self) -> None:
+        """Irreversibly closes the monitor and all its resources. The
+        watcher thread exits immediately.
+        """
+        self._closeSig.set()
         try:
-            event = watcher()
-            try:
-                q.put(NetAdap(event.ole_object))
-                app_tk.event_generate(
-                    '<<NetAdapDeleted>>',
-                    when='tail',)
-            except TypeError as err:
-                logging.debug(
-                    'the WMI object is inconsistent with NetAdap\n%s',
-                    err)
-        except wmi.x_wmi_timed_out:
-            logging.debug('Timeout waiting for event')
-        except wmi.x_wmi as err:
-            logging.debug(err)
-    pythoncom.CoUninitialize()
-
-
-def _watchConfigChange(
-        app_tk: tk.Tk,
-        q: Queue[NetConfig],
-        cancel: Event,
-        ) -> None:
-    pythoncom.CoInitialize()
-    wmi_ = wmi.WMI()
-    watcher = wmi_.watch_for(
-        notification_type='Modification',
-        wmi_class='Win32_NetworkAdapterConfiguration',
-        delay_secs=1,)
-    while True:
-        # Checking cancel is requested...
-        if cancel.is_set():
-            break
-        # Looking for adapter changes...
+            self._wakePeer.send(b'\0')
+        except OSError:
+            pass
+
+    def _watch(self) -> None:
+        import select
+        from ntwrk.backend import getBackend
+        from ntwrk.netlink import openRtnl, RTMGRP_IPV4_IFADDR, \
+            RTMGRP_IPV6_IFADDR, RTMGRP_LINK
         try:
-            event = watcher()
-            try:
-                q.put(NetConfig(event.ole_object))
-                app_tk.event_generate(
-                    '<<NetConfigChanged>>',
-                    when='tail',)
-            except TypeError as err:
-                logging.debug(
-                    'the WMI object is inconsistent with NetConfig\n%s',
-                    err)
-        except wmi.x_wmi_timed_out:
-            logging.debug('Timeout waiting for event')
-        except wmi.x_wmi as err:
-            logging.debug(err)
-    pythoncom.CoUninitialize()
-
-
-def _watchConfigCreation(
-        app_tk: tk.Tk,
-        q: Queue[NetConfig],
-        cancel: Event,
-        ) -> None:
-    pythoncom.CoInitialize()
-    wmi_ = wmi.WMI()
-    watcher = wmi_.watch_for(
-        notification_type='Creation',
-        wmi_class='Win32_NetworkAdapterConfiguration',
-        delay_secs=1,)
-    while True:
-        # Checking cancel is requested...
-        if cancel.is_set():
-            break
-        # Looking for adapter changes...
+            sock = openRtnl(
+                RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR)
+        except OSError:
+            logging.error('cannot subscribe to rtnetlink', exc_info=True)
+            return
         try:
-            event = watcher()
             try:
-                q.put(NetConfig(event.ole_object))
-                app_tk.event_generate(
-                    '<<NetConfigCreated>>',
-                    when='tail',)
-            except TypeError as err:
-                logging.debug(
-                    'the WMI object is inconsistent with NetConfig\n%s',
-                    err)
-        except wmi.x_wmi_timed_out:
-            logging.debug('Timeout waiting for event')
-        except wmi.x_wmi as err:
-            logging.debug(err)
-    pythoncom.CoUninitialize()
-
-
-def _watchConfigDeletion(
-        app_tk: tk.Tk,
-        q: Queue[NetConfig],
-        cancel: Event,
-        ) -> None:
-    pythoncom.CoInitialize()
-    wmi_ = wmi.WMI()
-    watcher = wmi_.watch_for(
-        notification_type='Deletion',
-        wmi_class='Win32_NetworkAdapterConfiguration',
-        delay_secs=1,)
-    while True:
-        # Checking cancel is requested...
-        if cancel.is_set():
-            break
-        # Looking for adapter changes...
-        try:
-            event = watcher()
+                sock.setsockopt(
+                    socket.SOL_SOCKET,
+                    socket.SO_RCVBUF,
+                    self._RCVBUF)
+            except OSError:
+                pass
+            sock.setblocking(False)
+            dirty = set[int]()
+            # Taking the snapshot right away, yet after subscribing so no
+            # change is missed in between...
+            deadline: float | None = monotonic()
+            while not self._closeSig.is_set():
+                timeout = None if deadline is None else \
+                    max(0, deadline - monotonic())
+                readable, _, _ = select.select(
+                    [sock, self._wakeSock],
+                    [],
+                    [],
+                    timeout)
+                if sock in readable:
+                    self._drain(sock, dirty)
+                    if deadline is None and (dirty or self._resync):
+                        deadline = monotonic() + self._WINDOW
+                if deadline is not None and monotonic() >= deadline:
+                    deadline = None
+                    try:
+                        if self._seeded:
+                            events = self._flush(dirty)
+                        else:
+                            self._snapshot()
+                            events = []
+                    except Exception:
+                        # Dropping the dirty indexes is fine as the next
+                        # attempt re-reads all interfaces...
+                        logging.error('failed to read network interfaces',
+                            exc_info=True)
+                        self._resync = True
+                        deadline = monotonic() + self._RETRY_SECS
+                    else:
+                        self._bus.post(events)
+                    dirty.clear()
+        except Exception:
+            logging.error('the network items watcher stopped',
+                exc_info=True)
+        finally:
+            sock.close()
+            self._wakeSock.close()
+            self._wakePeer.close()
+            getBackend().release()
+
+    def _snapshot(self) -> None:
+        """Reads all interfaces as the known state without posting."""
+        self._mpIdxAdap = {adap.Index: adap for adap in NetAdap.readAll()}
+        self._mpIdxConfig = {
+            config.Index: config
+            for config in NetConfig.readAll()}
+        self._seeded = True
+        self._resync = False
+
+    def _drain(self, sock: socket.socket, dirty: set[int]) -> None:
+        """Reads all pending notifications and adds the interface indexes
+        they concern to `dirty`. It raises `OSError` if the socket fails
+        for any reason other than lost notifications.
+        """
+        import errno
+        from ntwrk.netlink import iterMsgs, msgIfindex
+        while True:
             try:
-                q.put(NetConfig(event.ole_object))
-                app_tk.event_generate(
-                    '<<NetConfigDeleted>>',
-                    when='tail',)
-            except TypeError as err:
-                logging.debug(
-                    'the WMI object is inconsistent with NetConfig\n%s',
-                    err)
-        except wmi.x_wmi_timed_out:
-            logging.debug('Timeout waiting for event')
-        except wmi.x_wmi as err:
-            logging.debug(err)
-    pythoncom.CoUninitialize()
+                data = sock.recv(0x10000)
+            except BlockingIOError:
+                return
+            except OSError as err:
+                if err.errno != errno.ENOBUFS:
+                    raise
+                logging.warning('rtnetlink notifications were lost')
+                self._resync = True
+                continue
+            try:
+                for msg in iterMsgs(data):
+                    ifindex = msgIfindex(msg)
+                    if ifindex is not None:
+                        dirty.add(ifindex)
+            except (OSError, struct.error):
+                logging.error('bad rtnetlink notification', exc_info=True)
+                self._resync = True
+
+    def _flush(self, dirty: set[int]) -> list[NetEvent]:
+        """Re-reads the dirty interfaces, or all of them after lost
+        notifications, and returns their net events ordered so that
+        adapters exist before their configs are added and after they are
+        removed.
+        """
+        if self._resync:
+            self._resync = False
+            mpIdxAdap = {adap.Index: adap for adap in NetAdap.readAll()}
+            mpIdxConfig = {
+                config.Index: config
+                for config in NetConfig.readAll()}
+            dirty = self._mpIdxAdap.keys() | self._mpIdxConfig.keys() | \
+                mpIdxAdap.keys() | mpIdxConfig.keys()
+        else:
+            mpIdxAdap = {
+                adap.Index: adap
+                for idx in dirty
+                for adap in NetAdap.readAll(Index=idx)}
+            mpIdxConfig = {
+                config.Index: config
+                for idx in dirty
+                for config in NetConfig.readAll(Index=idx)}
+        delAdaps, newAdaps, modAdaps = _diffItems(
+            self._mpIdxAdap,
+            mpIdxAdap,
+            dirty)
+        delConfigs, newConfigs, modConfigs = _diffItems(
+            self._mpIdxConfig,
+            mpIdxConfig,
+            dirty)
+        return [
+            *(NetEvent('deletion', config) for config in delConfigs),
+            *(NetEvent('deletion', adap) for adap in delAdaps),
+            *(NetEvent('creation', adap) for adap in newAdaps),
+            *(NetEvent('modification', adap) for adap in modAdaps),
+            *(NetEvent('modification', config) for config in modConfigs),
+            *(NetEvent('creation', config) for config in newConfigs),]
+
+
+
+class PollingNetItemMonitor(INetItemMonitor):
+    """Watches network items by reading them from the backend
+    periodically, for where event subscriptions are unavailable or
+    unreliable. Each cycle hashes the fields of raw backend objects and
+    only converts the ones whose fingerprint changed into network items.
+    The interval drops to `min_interval` after a change and doubles on
+    every quiet cycle up to `max_interval`.
+    """
+    def __init__(
+            self,
+            bus: NetEventBus,
+            min_interval: float = 0.5,
+            max_interval: float = 8.0,
+            ) -> None:
+        self._bus = bus
+        self._MIN_INTERVAL = min_interval
+        self._MAX_INTERVAL = max_interval
+        self._mpIdxAdap = dict[int, NetAdap]()
+        """The last known adapters, keyed by `Index`."""
+        self._mpIdxConfig = dict[int, NetConfig]()
+        """The last known configs, keyed by `Index`."""
+        self._mpIdxAdapHash = dict[int, int]()
+        """The fingerprints of the last known adapters."""
+        self._mpIdxConfigHash = dict[int, int]()
+        """The fingerprints of the last known configs."""
+        self._thrd = Thread(
+            name='Network items poller thread',
+            target=self._watch,
+            daemon=True,)
+        self._closeSig = Event()
+
+    def start(self) -> None:
+        self._thrd.start()
+
+    def close(self) -> None:
+        """Irreversibly closes the monitor and all its resources. The
+        poller thread exits immediately.
+        """
+        self._closeSig.set()
+
+    def _watch(self) -> None:
+        from ntwrk.backend import getBackend
+        try:
+            seeded = False
+            interval = self._MIN_INTERVAL
+            while True:
+                try:
+                    events = self.poll()
+                except Exception:
+                    logging.error('failed to poll network items',
+                        exc_info=True)
+                    events = []
+                else:
+                    if not seeded:
+                        # Taking the first snapshot silently...
+                        seeded = True
+                        events = []
+                if events:
+                    self._bus.post(events)
+                    interval = self._MIN_INTERVAL
+                else:
+                    interval = min(interval * 2, self._MAX_INTERVAL)
+                if self._closeSig.wait(interval):
+                    break
+        finally:
+            getBackend().release()
+
+    def poll(self) -> list[NetEvent]:
+        """Reads the backend once and returns the net events since the
+        previous call, ordered so that adapters exist before their configs
+        are added and after they are removed. If reading fails, the known
+        state is left untouched so the next call reports the changes.
+        """
+        from ntwrk.backend import getBackend
+        backend = getBackend()
+        mpIdxAdap = dict(self._mpIdxAdap)
+        mpIdxAdapHash = dict(self._mpIdxAdapHash)
+        mpIdxConfig = dict(self._mpIdxConfig)
+        mpIdxConfigHash = dict(self._mpIdxConfigHash)
+        delAdaps, newAdaps, modAdaps = _pollItems(
+            NetAdap,
+            backend.readAdaps(NetAdap._WMI_PROPS, PhysicalAdapter=True),
+            mpIdxAdap,
+            mpIdxAdapHash)
+        delConfigs, newConfigs, modConfigs = _pollItems(
+            NetConfig,
+            backend.readConfigs(NetConfig._WMI_PROPS),
+            mpIdxConfig,
+            mpIdxConfigHash)
+        # Committing the new state as both reads succeeded...
+        self._mpIdxAdap = mpIdxAdap
+        self._mpIdxAdapHash = mpIdxAdapHash
+        self._mpIdxConfig = mpIdxConfig
+        self._mpIdxConfigHash = mpIdxConfigHash
+        return [
+            *(NetEvent('deletion', config) for config in delConfigs),
+            *(NetEvent('deletion', adap) for adap in delAdaps),
+            *(NetEvent('creation', adap) for adap in newAdaps),
+            *(NetEvent('modification', adap) for adap in modAdaps),
+            *(NetEvent('modification', config) for config in modConfigs),
+            *(NetEvent('creation', config) for config in newConfigs),]
+
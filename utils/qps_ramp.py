@@ -0,0 +1,340 @@
+#
+#
+#
+"""This module offers a load generator which ramps up the rate of DNS
+queries sent to a single DNS server IP and records the latency and loss
+curve at each step. It is meant for sizing resolvers before pointing
+network adapters at them with `NetConfig.setDnsSearchOrder`.
+
+Run `python -m utils.qps_ramp --help` for the command-line mode.
+"""
+
+from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
+from queue import Queue
+import socket
+from threading import Event, Thread
+from typing import Iterable, Sequence
+
+
+class RampStep:
+    """The measurements of one step of a QPS ramp."""
+    def __init__(
+            self,
+            target_qps: float,
+            duration: float,
+            n_sent: int,
+            n_errors: int,
+            latencies: list[float],
+            ) -> None:
+        self.targetQps = target_qps
+        """The rate that this step aimed at."""
+        self.duration = duration
+        """The actual duration of sending queries in seconds."""
+        self.nSent = n_sent
+        """The number of queries sent in this step."""
+        self.nErrors = n_errors
+        """The number of responses with a non-zero `RCODE`."""
+        self.latencies = sorted(latencies)
+        """The sorted latencies of all answered queries in seconds."""
+
+    @property
+    def nReceived(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def achievedQps(self) -> float:
+        return self.nSent / self.duration if self.duration else 0.0
+
+    @property
+    def lossRate(self) -> float:
+        """The ratio of unanswered queries in this step."""
+        if not self.nSent:
+            return 0.0
+        return 1.0 - (self.nReceived / self.nSent)
+
+    def percentile(self, pct: float) -> float | None:
+        """Returns the specified percentile (0 to 100) of latencies or
+        `None` if no query has been answered.
+        """
+        if not self.latencies:
+            return None
+        idx = round((pct / 100) * (len(self.latencies) - 1))
+        return self.latencies[idx]
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__qualname__} target={self.targetQps:.0f}'
+            f' achieved={self.achievedQps:.0f} loss={self.lossRate:.2%}>')
+
+
+class QpsRamp:
+    """Ramps the query rate against a DNS server IP, step by step. Queries
+    are precomputed into a pool of ready-to-send packets, one per 16-bit
+    message ID, so the sending loop does no encoding at all. An ID is only
+    reused once its previous query is answered. A query unanswered within
+    `timeout` expires and its ID is retired until the late answer arrives,
+    which is then discarded, or until the step ends. So at most
+    `pool_size` queries are outstanding and rates beyond that are capped
+    rather than measured against the wrong send times.
+    """
+    _EXPIRED = -1.0
+    """The send time of IDs whose query has timed out."""
+    def __init__(
+            self,
+            ip: IPv4 | IPv6,
+            *,
+            port: int = 53,
+            start_qps: float = 100.0,
+            stop_qps: float = 50_000.0,
+            n_steps: int = 10,
+            step_secs: float = 2.0,
+            timeout: float = 1.0,
+            names: Sequence[str] = ('example.com',),
+            qtype: int = 1,
+            pool_size: int = 0x10000,
+            ) -> None:
+        """Initializes a new ramp. Arguments are as follow:
+
+        * `ip`: the IP of the DNS server, typically one of
+        `DnsServer.toIpTuple()`.
+        * `start_qps` & `stop_qps`: the rates of the first and last steps.
+        Rates in between grow geometrically.
+        * `step_secs`: how long every step sends queries.
+        * `timeout`: how long to wait for late responses after each step.
+        * `names`: the domain names to query in round-robin order.
+        * `pool_size`: the number of precomputed packets, up to 65536.
+        It also bounds the number of outstanding queries.
+        """
+        if not names:
+            raise ValueError('at least one name is necessary')
+        if not (0 < pool_size <= 0x10000):
+            raise ValueError(f'pool size must be in 1..65536: {pool_size}')
+        if start_qps <= 0 or stop_qps <= 0:
+            raise ValueError(
+                f'rates must be positive: {start_qps}, {stop_qps}')
+        if n_steps < 1:
+            raise ValueError(f'expected at least one step but got {n_steps}')
+        self._ip = ip
+        self._port = port
+        self._timeout = timeout
+        self._stepSecs = step_secs
+        self._rates = self._genRates(start_qps, stop_qps, n_steps)
+        self._pool = self._genPool(names, qtype, pool_size)
+        """The precomputed query packets. The ID of `_pool[i]` is `i`."""
+        self._sentAt = [0.0] * pool_size
+        """The send time of the outstanding query of every ID, zero if the
+        ID is free, or `_EXPIRED`.
+        """
+        self._latencies = list[float]()
+        self._nErrors = 0
+        self._cancel = Event()
+
+    @property
+    def rates(self) -> tuple[float, ...]:
+        """Gets the target rates of all steps."""
+        return self._rates
+
+    def _genRates(
+            self,
+            start: float,
+            stop: float,
+            n: int,
+            ) -> tuple[float, ...]:
+        if n == 1:
+            return (float(stop),)
+        ratio = (stop / start) ** (1 / (n - 1))
+        return tuple(start * (ratio ** idx) for idx in range(n))
+
+    def _genPool(
+            self,
+            names: Sequence[str],
+            qtype: int,
+            size: int,
+            ) -> tuple[bytes, ...]:
+        from ntwrk.dns_wire import buildQuery
+        nNames = len(names)
+        return tuple(
+            buildQuery(id_, names[id_ % nNames], qtype)
+            for id_ in range(size))
+
+    def cancel(self) -> None:
+        """Cancels the ramp. The ongoing step will be cut short."""
+        self._cancel.set()
+
+    def run(self, q: Queue[str] | None = None) -> list[RampStep]:
+        """Runs all steps and returns their measurements. It stops early
+        on cancelation or once a step loses more than half of its queries.
+        The optional `q` receives progress messages.
+        """
+        family = socket.AF_INET6 if isinstance(self._ip, IPv6) else \
+            socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        except OSError:
+            pass
+        sock.connect((str(self._ip), self._port))
+        sock.settimeout(0.1)
+        stopRecv = Event()
+        recvThrd = Thread(
+            name='QPS ramp receiver thread',
+            target=self._receive,
+            args=(sock, stopRecv),
+            daemon=True,)
+        recvThrd.start()
+        steps = list[RampStep]()
+        try:
+            for rate in self._rates:
+                if self._cancel.is_set():
+                    break
+                if q:
+                    q.put(f'{rate:.0f} QPS -> {self._ip}')
+                step = self._runStep(sock, rate)
+                steps.append(step)
+                if step.lossRate > 0.5:
+                    break
+        finally:
+            stopRecv.set()
+            recvThrd.join()
+            sock.close()
+        return steps
+
+    def _runStep(self, sock: socket.socket, rate: float) -> RampStep:
+        from time import perf_counter, sleep
+        # Resetting per-step state...
+        self._sentAt[:] = [0.0] * len(self._sentAt)
+        self._latencies = list[float]()
+        self._nErrors = 0
+        pool = self._pool
+        sentAt = self._sentAt
+        poolSize = len(pool)
+        send = sock.send
+        timeout = self._timeout
+        # Sending queries paced by a schedule rather than per-query
+        # sleeps: every round sends whatever is due by now...
+        nSent = 0
+        nextId = 0
+        expired = self._EXPIRED
+        startTime = perf_counter()
+        endTime = startTime + self._stepSecs
+        now = startTime
+        while now < endTime and not self._cancel.is_set():
+            due = int((now - startTime) * rate) + 1
+            while nSent < due:
+                # Finding a free ID. IDs are taken in a cycle, so the next
+                # one is the oldest outstanding and if it has not timed
+                # out, none has...
+                sendTime = perf_counter()
+                for _ in range(poolSize):
+                    id_ = nextId
+                    nextId = (nextId + 1) % poolSize
+                    if sentAt[id_] == expired:
+                        continue
+                    if not sentAt[id_]:
+                        break
+                    if sendTime - sentAt[id_] < timeout:
+                        nextId = id_
+                        id_ = None
+                        break
+                    sentAt[id_] = expired
+                else:
+                    id_ = None
+                if id_ is None:
+                    # Waiting for responses or timeouts...
+                    break
+                sentAt[id_] = sendTime
+                try:
+                    send(pool[id_])
+                except OSError:
+                    # The kernel buffer is full or the port is unreachable
+                    # for the moment, counting it as a loss...
+                    pass
+                nSent += 1
+            sleep(0.0005)
+            now = perf_counter()
+        duration = now - startTime
+        # Waiting for late responses...
+        self._cancel.wait(self._timeout)
+        latencies = self._latencies
+        self._latencies = list[float]()
+        return RampStep(rate, duration, nSent, self._nErrors, latencies)
+
+    def _receive(self, sock: socket.socket, stop: Event) -> None:
+        from time import perf_counter
+        sentAt = self._sentAt
+        while not stop.is_set():
+            try:
+                data = sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                # ICMP port unreachable and the like...
+                continue
+            recvTime = perf_counter()
+            if len(data) < 12:
+                continue
+            id_ = (data[0] << 8) | data[1]
+            try:
+                sendTime = sentAt[id_]
+            except IndexError:
+                continue
+            if sendTime <= 0.0:
+                # A late answer of an expired query frees its ID...
+                if sendTime == self._EXPIRED:
+                    sentAt[id_] = 0.0
+                continue
+            sentAt[id_] = 0.0
+            self._latencies.append(recvTime - sendTime)
+            if data[3] & 0x0F:
+                self._nErrors += 1
+
+
+def formatSteps(steps: Iterable[RampStep]) -> str:
+    """Formats the measurements of a ramp as a plain-text table."""
+    lines = [
+        f'{"target":>9} {"achieved":>9} {"sent":>8} {"loss":>7} '
+        f'{"errors":>7} {"p50 ms":>8} {"p99 ms":>8}',]
+    for step in steps:
+        p50 = step.percentile(50)
+        p99 = step.percentile(99)
+        lines.append(
+            f'{step.targetQps:>9.0f} {step.achievedQps:>9.0f} '
+            f'{step.nSent:>8} {step.lossRate:>7.2%} {step.nErrors:>7} '
+            f'{"-" if p50 is None else f"{p50 * 1000:.2f}":>8} '
+            f'{"-" if p99 is None else f"{p99 * 1000:.2f}":>8}')
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    import argparse
+    from ipaddress import ip_address
+    parser = argparse.ArgumentParser(
+        prog='python -m utils.qps_ramp',
+        description='Ramps up the query rate against a DNS server.')
+    parser.add_argument('ip', type=ip_address)
+    parser.add_argument('--port', type=int, default=53)
+    parser.add_argument('--start', type=float, default=100.0)
+    parser.add_argument('--stop', type=float, default=50_000.0)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--secs', type=float, default=2.0)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--name', action='append', dest='names')
+    args = parser.parse_args()
+    ramp = QpsRamp(
+        args.ip,
+        port=args.port,
+        start_qps=args.start,
+        stop_qps=args.stop,
+        n_steps=args.steps,
+        step_secs=args.secs,
+        timeout=args.timeout,
+        names=args.names or ('example.com',),)
+    try:
+        steps = ramp.run()
+    except KeyboardInterrupt:
+        ramp.cancel()
+        return
+    print(formatSteps(steps))
+
+
+if __name__ == '__main__':
+    main()
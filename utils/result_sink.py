@@ -0,0 +1,188 @@
+#
+#
+#
+"""This module offers sinks which write DNS test results out as they
+arrive, so batch runs never have to be held in memory to be saved. It
+contains:
+
+#### Types
+1. `ResultRecord`
+2. `IResultSink`
+3. `CsvSink`
+4. `JsonLinesSink`
+5. `SqliteSink`
+
+#### Functions
+1. `openSink`
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from os import PathLike
+from typing import Any
+
+
+class ResultRecord:
+    """A single result of testing a URL through a DNS server IP."""
+    FIELDS = ('run_id', 'time', 'url', 'server', 'ip', 'dns_secs',
+        'url_secs', 'code', 'status',)
+    """The names of fields in the order they are written out."""
+
+    def __init__(
+            self,
+            run_id: str,
+            url: str,
+            server: str,
+            ip: str,
+            *,
+            dns_secs: float | None = None,
+            url_secs: float | None = None,
+            code: int | None = None,
+            status: str = '',
+            time: float | None = None,
+            ) -> None:
+        """Initializes a new record. Arguments are as follow:
+
+        * `run_id`: the unique ID of the test run this record belongs to.
+        * `server` & `ip`: the DNS server name and the IP being tested.
+        * `dns_secs`: the time spent on setting the DNS search order.
+        * `url_secs`: the time spent on accessing the URL.
+        * `code` & `status`: the HTTP status code and its description, or
+        an error message.
+        * `time`: the POSIX timestamp of the record, defaults to now.
+        """
+        from time import time as now
+        self.runId = run_id
+        self.time = now() if time is None else time
+        self.url = url
+        self.server = server
+        self.ip = ip
+        self.dnsSecs = dns_secs
+        self.urlSecs = url_secs
+        self.code = code
+        self.status = status
+
+    def toTuple(self) -> tuple[Any, ...]:
+        """Returns values in the order of `FIELDS`."""
+        return (self.runId, self.time, self.url, self.server, self.ip,
+            self.dnsSecs, self.urlSecs, self.code, self.status,)
+
+
+class IResultSink(ABC):
+    @abstractmethod
+    def write(self, record: ResultRecord) -> None:
+        """Writes the record out so it survives a crash right after."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Closes the sink and releases its resources."""
+        pass
+
+    def __enter__(self) -> IResultSink:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class CsvSink(IResultSink):
+    def __init__(self, file: PathLike[str] | str) -> None:
+        """Opens the CSV file for appending. The header row is written only
+        if the file is empty.
+        """
+        import csv
+        from os import fspath
+        self._fileObj = open(
+            fspath(file),
+            mode='at',
+            newline='',
+            encoding='utf-8')
+        self._writer = csv.writer(self._fileObj)
+        if self._fileObj.tell() == 0:
+            self._writer.writerow(ResultRecord.FIELDS)
+
+    def write(self, record: ResultRecord) -> None:
+        self._writer.writerow(record.toTuple())
+        self._fileObj.flush()
+
+    def close(self) -> None:
+        self._fileObj.close()
+
+
+class JsonLinesSink(IResultSink):
+    def __init__(self, file: PathLike[str] | str) -> None:
+        """Opens the JSON Lines file for appending."""
+        from os import fspath
+        self._fileObj = open(fspath(file), mode='at', encoding='utf-8')
+
+    def write(self, record: ResultRecord) -> None:
+        import json
+        self._fileObj.write(json.dumps(dict(zip(
+            ResultRecord.FIELDS,
+            record.toTuple()))))
+        self._fileObj.write('\n')
+        self._fileObj.flush()
+
+    def close(self) -> None:
+        self._fileObj.close()
+
+
+class SqliteSink(IResultSink):
+    def __init__(
+            self,
+            file: PathLike[str] | str,
+            table: str = 'test_results',
+            ) -> None:
+        """Opens the SQLite database and creates the table if it does not
+        exist. It raises `ValueError` if the table name is not a valid
+        identifier.
+        """
+        import sqlite3
+        if not table.isidentifier():
+            raise ValueError(f'invalid table name: {table}')
+        self._conn = sqlite3.connect(file)
+        self._table = table
+        sql = f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                run_id TEXT NOT NULL,
+                time REAL NOT NULL,
+                url TEXT NOT NULL,
+                server TEXT NOT NULL,
+                ip TEXT NOT NULL,
+                dns_secs REAL,
+                url_secs REAL,
+                code INTEGER,
+                status TEXT);
+        """
+        self._conn.execute(sql)
+        self._conn.commit()
+
+    def write(self, record: ResultRecord) -> None:
+        sql = f"""
+            INSERT INTO
+                {self._table}({', '.join(ResultRecord.FIELDS)})
+            VALUES
+                ({', '.join('?' * len(ResultRecord.FIELDS))});
+        """
+        self._conn.execute(sql, record.toTuple())
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def openSink(file: PathLike[str] | str) -> IResultSink:
+    """Opens a sink based on the extension of the file: `.csv`, `.jsonl`
+    or `.db3`/`.db`/`.sqlite`. It raises `ValueError` for other extensions.
+    """
+    from pathlib import Path
+    match Path(file).suffix.lower():
+        case '.csv':
+            return CsvSink(file)
+        case '.jsonl' | '.json':
+            return JsonLinesSink(file)
+        case '.db3' | '.db' | '.sqlite' | '.sqlite3':
+            return SqliteSink(file)
+        case suffix:
+            raise ValueError(f'unsupported extension for results: {suffix}')
@@ -0,0 +1,141 @@
+#
+#
+#
+"""This module offers `RttTracker` which derives per-server timeouts from
+the observed round-trip times and detects dead servers from consecutive
+failures.
+"""
+
+from collections import deque
+from threading import RLock
+from typing import Hashable
+
+
+class _ServerStats:
+    def __init__(self, history: int) -> None:
+        self.rtts = deque[float](maxlen=history)
+        """The most recent round-trip times in seconds."""
+        self.nFailures = 0
+        """The number of consecutive failures."""
+        self.deadSince: float | None = None
+        """The monotonic time the server was detected dead or `None`."""
+
+
+class RttTracker:
+    """Keeps the recent round-trip times of servers and suggests a timeout
+    for each one: the p99 of its history times a margin, clamped to
+    bounds. Servers without enough history get the default timeout.
+
+    Objects of this class are thread-safe.
+    """
+    def __init__(
+            self,
+            *,
+            default_timeout: float = 5.0,
+            min_timeout: float = 0.5,
+            max_timeout: float = 10.0,
+            margin: float = 1.5,
+            history: int = 64,
+            min_samples: int = 5,
+            max_failures: int = 3,
+            retry_after: float = 60.0,
+            ) -> None:
+        """Initializes a new tracker. Arguments are as follow:
+
+        * `margin`: the factor applied to the p99 of the history.
+        * `history`: the number of recent samples kept per server.
+        * `min_samples`: the number of samples before the history is
+        trusted rather than `default_timeout`.
+        * `max_failures`: the number of consecutive failures after which a
+        server is considered dead.
+        * `retry_after`: the seconds after which a dead server is given
+        another chance.
+        """
+        if not (0 < min_timeout <= default_timeout <= max_timeout):
+            raise ValueError('expected 0 < min_timeout <= default_timeout '
+                '<= max_timeout')
+        self._DEFAULT = default_timeout
+        self._MIN = min_timeout
+        self._MAX = max_timeout
+        self._MARGIN = margin
+        self._HISTORY = history
+        self._MIN_SAMPLES = min_samples
+        self._MAX_FAILURES = max_failures
+        self._RETRY_AFTER = retry_after
+        self._stats = dict[Hashable, _ServerStats]()
+        self._lock = RLock()
+
+    def _getStats(self, key: Hashable) -> _ServerStats:
+        try:
+            return self._stats[key]
+        except KeyError:
+            stats = _ServerStats(self._HISTORY)
+            self._stats[key] = stats
+            return stats
+
+    def getTimeout(self, key: Hashable) -> float:
+        """Gets the suggested timeout for the specified server."""
+        from math import ceil
+        with self._lock:
+            try:
+                rtts = sorted(self._stats[key].rtts)
+            except KeyError:
+                return self._DEFAULT
+        if len(rtts) < self._MIN_SAMPLES:
+            return self._DEFAULT
+        p99 = rtts[ceil(0.99 * len(rtts)) - 1]
+        return min(self._MAX, max(self._MIN, p99 * self._MARGIN))
+
+    def addSample(self, key: Hashable, rtt: float) -> None:
+        """Records a successful round trip of the specified server."""
+        with self._lock:
+            stats = self._getStats(key)
+            stats.rtts.append(rtt)
+            stats.nFailures = 0
+            stats.deadSince = None
+
+    def addFailure(self, key: Hashable) -> None:
+        """Records a failed round trip (timeout or unreachability) of the
+        specified server.
+        """
+        from time import monotonic
+        with self._lock:
+            stats = self._getStats(key)
+            stats.nFailures += 1
+            if stats.nFailures >= self._MAX_FAILURES:
+                stats.deadSince = monotonic()
+
+    def isDead(self, key: Hashable) -> bool:
+        """Specifies whether the server has failed consecutively enough
+        to be skipped. After `retry_after` seconds the server is given one
+        more chance: it is alive again until its next failure.
+        """
+        from time import monotonic
+        with self._lock:
+            try:
+                stats = self._stats[key]
+            except KeyError:
+                return False
+            if stats.deadSince is None:
+                return False
+            if monotonic() - stats.deadSince >= self._RETRY_AFTER:
+                stats.deadSince = None
+                stats.nFailures = self._MAX_FAILURES - 1
+                return False
+            return True
+
+    def getFailures(self, key: Hashable) -> int:
+        """Gets the number of consecutive failures of the server."""
+        with self._lock:
+            try:
+                return self._stats[key].nFailures
+            except KeyError:
+                return 0
+
+    def reset(self, key: Hashable | None = None) -> None:
+        """Forgets the history of the specified server or all servers."""
+        with self._lock:
+            if key is None:
+                self._stats.clear()
+            else:
+                self._stats.pop(key, None)
@@ -8,10 +8,10 @@ from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
 import logging
 from pathlib import Path
 from posixpath import isabs
-from queue import Queue
+from queue import Empty, Queue
 import tkinter as tk
 from tkinter import NO, ttk
-from typing import Any, Callable, TYPE_CHECKING
+from typing import Any, Callable, Iterable, TYPE_CHECKING
 
 import PIL.Image
 import PIL.ImageTk
@@ -21,10 +21,15 @@ from .net_adap_view import NetAdapsView
 from .ips_view import IpsView
 from .message_view import MessageView, MessageType
 from db import DnsServer, IDatabase
-from ntwrk import ACIdx, AdapCfgBag, NetAdap, NetConfig, NetConfigCode
+from ntwrk import (ACIdx, AdapCfgBag, BagDiff, NetAdap, NetConfig,
+    NetConfigCode)
+from ntwrk.dns_batch import DnsBatchRes
 from utils.async_ops import AsyncOpManager, AsyncOp
+from utils.dns_apply_queue import DnsApplyQueue, DnsApplyRes
 from utils.keyboard import KeyCodes, Modifiers
-from utils.net_item_monitor import NetItemMonitor
+from utils.net_event_bus import NetEvent, NetEventBus
+from utils.net_item_monitor import INetItemMonitor, createNetItemMonitor
+from utils.rtt_tracker import RttTracker
 from utils.settings import AppSettings
 from utils.types import GifImage, TkImg
 from widgets.license_win import LicWinMixin
@@ -39,6 +44,8 @@ class _Flags(enum.IntFlag):
     NO_FLAGS = 0x00
     PENDING_TEST = 0x01
     """A URL tester is pending to run."""
+    STALE_ADAPS = 0x02
+    """The bag has been loaded from the cache and not reconciled yet."""
 
 
 class _DnsWinOps(enum.IntEnum):
@@ -56,6 +63,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
             lic_file: Path,
             settings: AppSettings,
             db: IDatabase,
+            bag_cache: Path | None = None,
             ) -> None:
         super().__init__(
             screenName=None,
@@ -84,16 +92,23 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         """The application settings object."""
         self._db = db
         """The database object."""
+        self._BAG_CACHE = bag_cache
+        """The file caching network items between sessions, if any."""
         self._acbag: AdapCfgBag
         """An instance of `AdapCfgBag`, a bag of adapter-config objects."""
-        self._qAdapChange = Queue[NetAdap]()
-        self._qAdapCreation = Queue[NetAdap]()
-        self._qAdapDeletion = Queue[NetAdap]()
-        self._qConfigChange = Queue[NetConfig]()
-        self._qConfigCreation = Queue[NetConfig]()
-        self._qConfigDeletion = Queue[NetConfig]()
-        self._netItemWatcher: NetItemMonitor
+        self._netEventBus = NetEventBus(self, self._onNetEvent)
+        """The batched delivery of network events to this thread."""
+        self._netItemWatcher: INetItemMonitor
         """The thread looking for changes in network interfaces."""
+        self._qDnsApplied = Queue[DnsApplyRes]()
+        self._dnsApplier = DnsApplyQueue(self._qDnsApplied)
+        """The background applier of DNS search orders."""
+        self._TIMINT_DNS_APPLIED = 100
+        """The interval of polling DNS apply results in milliseconds."""
+        self._afterDnsApplied: str | None = None
+        """The `after` ID of the next poll of DNS apply results, `None` if
+        no poll is scheduled.
+        """
         self._flags = _Flags.NO_FLAGS
         self._ops = dict[_DnsWinOps, AsyncOp]()
         self._infoWins = dict[ACIdx, _InfoWin]()
@@ -101,6 +116,10 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         self._mpIpDns: dict[IPv4 | IPv6, DnsServer]
         self._SEP_DNS_NAMES: str | None = None
         """The delimiter character which does not exist in DNS names."""
+        self._rttTracker = RttTracker()
+        """The round-trip times of URL and DNS IPs pairs tested in this
+        session.
+        """
         # Images...
         self._GIF_WAIT: GifImage
         self._GIF_DWAIT: GifImage
@@ -147,12 +166,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         # Bindings & events...
         self.bind('<Key>', self._onKeyPressed)
         self.protocol('WM_DELETE_WINDOW', self._onWinClosing)
-        self.bind('<<NetAdapChanged>>', self._onNetAdapChanged)
-        self.bind('<<NetAdapCreated>>', self._onNetAdapCreated)
-        self.bind('<<NetAdapDeleted>>', self._onNetAdapDeleted)
-        self.bind('<<NetConfigChanged>>', self._onNetConfigChanged)
-        self.bind('<<NetConfigCreated>>', self._onNetConfigCreated)
-        self.bind('<<NetConfigDeleted>>', self._onNetConfigDeleted)
+        self._dnsApplier.start()
         # Initializes views...
         self.after(100, self._initViews)
     
@@ -398,6 +412,9 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         self._menu_cmds.add_cascade(
             label=_('TEST_URL'),
             command=self._testUrl)
+        self._menu_cmds.add_cascade(
+            label=_('SET_DNS_ALL_CONFIGS'),
+            command=self._setDnsSearchOrderAll)
     
     def _onWinClosing(self) -> None:
         # Releasing images...
@@ -427,7 +444,12 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         self._settings.secon_4_col_width = colsWidth[2]
         self._settings.prim_6_col_width = colsWidth[3]
         self._settings.secon_6_col_width = colsWidth[4]
+        self._saveBagCache()
         # Cleaning up...
+        self._dnsApplier.close()
+        if self._afterDnsApplied:
+            self.after_cancel(self._afterDnsApplied)
+            self._afterDnsApplied = None
         self._asyncMngr.close()
         try:
             self._netItemWatcher.close()
@@ -473,8 +495,26 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
                     if adap.NetConnectionID == 'Ethernet':
                         pass
     
-    def _onNetAdapChanged(self, _: tk.Event) -> None:
-        newAdap = self._qAdapChange.get()
+    def _onNetEvent(self, event: NetEvent) -> None:
+        """Dispatches a network event of the bus to its handler."""
+        if isinstance(event.item, NetAdap):
+            match event.op:
+                case 'modification':
+                    self._onNetAdapChanged(event.item)
+                case 'creation':
+                    self._onNetAdapCreated(event.item)
+                case 'deletion':
+                    self._onNetAdapDeleted(event.item)
+        else:
+            match event.op:
+                case 'modification':
+                    self._onNetConfigChanged(event.item)
+                case 'creation':
+                    self._onNetConfigCreated(event.item)
+                case 'deletion':
+                    self._onNetConfigDeleted(event.item)
+
+    def _onNetAdapChanged(self, newAdap: NetAdap) -> None:
         try:
             adapIdx = self._acbag.indexAdap(newAdap)
         except IndexError:
@@ -488,16 +528,16 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
                 newAdap,)
             return
         curAdap: NetAdap = self._acbag[adapIdx] # type: ignore
-        changed = curAdap.update(newAdap)
-        if not changed:
+        fields = curAdap.update(newAdap)
+        if not fields:
             return
         # Updating the NetAdapsView...
-        self._adapsvw.changeAdap(curAdap, adapIdx)
+        if fields & NetAdapsView.ADAP_FIELDS:
+            self._adapsvw.changeAdap(curAdap, adapIdx)
         #
         self.refreshInfoWin(newAdap)
     
-    def _onNetAdapCreated(self, _: tk.Event) -> None:
-        newAdap = self._qAdapCreation.get()
+    def _onNetAdapCreated(self, newAdap: NetAdap) -> None:
         try:
             self._acbag.indexAdap(newAdap)
             logging.error(
@@ -515,8 +555,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         adapIdx = self._acbag.indexAdap(newAdap)
         self._adapsvw.addAdap(newAdap, adapIdx)
 
-    def _onNetAdapDeleted(self, _: tk.Event) -> None:
-        delAdap = self._qAdapDeletion.get()
+    def _onNetAdapDeleted(self, delAdap: NetAdap) -> None:
         try:
             adapIdx = self._acbag.indexAdap(delAdap)
         except (IndexError, ValueError):
@@ -533,8 +572,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         #
         self._adapsvw.delIdx(adapIdx)
     
-    def _onNetConfigChanged(self, _: tk.Event) -> None:
-        newConfig = self._qConfigChange.get()
+    def _onNetConfigChanged(self, newConfig: NetConfig) -> None:
         try:
             configIdx = self._acbag.indexConfig(newConfig)
         except IndexError:
@@ -544,24 +582,35 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
             return
         curConfig: NetConfig = self._acbag[configIdx] # type: ignore
         # Updating `_acbag`...`
-        changed = curConfig.update(newConfig)
-        if not changed:
+        fields = curConfig.update(newConfig)
+        if not fields:
             return
         # Updaing its info win if any...
         self.refreshInfoWin(newConfig)
         # Updating the adaps view...
-        self._adapsvw.changeConfig(newConfig, configIdx)
-        adapIdx = configIdx.getAdap()
-        adap: NetAdap = self._acbag[adapIdx] # type: ignore
-        self._adapsvw.changeAdap(adap, adapIdx)
-        # Updating IpsView...
-        vwIdx = self._getNetItemIdx()
-        if vwIdx is not None and (vwIdx == configIdx or
-                vwIdx == configIdx.getAdap()):
-            self._ipsvw.populate(newConfig, self._mpNameDns.values())
+        self._redrawConfig(configIdx, fields)
     
-    def _onNetConfigCreated(self, _: tk.Event) -> None:
-        newConfig = self._qConfigCreation.get()
+    def _redrawConfig(self, config_idx: ACIdx, fields: frozenset[str]) -> None:
+        """Redraws the views displaying any of the changed `fields` of the
+        config.
+        """
+        config: NetConfig = self._acbag[config_idx] # type: ignore
+        if fields & NetAdapsView.CONFIG_ROW_FIELDS:
+            self._adapsvw.changeConfig(config, config_idx)
+        if fields & NetAdapsView.CONFIG_FIELDS:
+            adapIdx = config_idx.getAdap()
+            self._adapsvw.changeAdap(
+                self._acbag[adapIdx], # type: ignore
+                adapIdx)
+        if fields & IpsView.FIELDS:
+            vwIdx = self._adapsvw.getSelectedIdx()
+            if vwIdx is not None and (vwIdx == config_idx or
+                    vwIdx == config_idx.getAdap()):
+                self._ipsvw.populate(
+                    self._acbag[vwIdx],
+                    self._mpNameDns.values())
+    
+    def _onNetConfigCreated(self, newConfig: NetConfig) -> None:
         try:
             self._acbag.indexConfig(newConfig)
             logging.error(
@@ -591,8 +640,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
                 self._acbag[vwIdx],
                 self._mpNameDns.values())
 
-    def _onNetConfigDeleted(self, _: tk.Event) -> None:
-        delConfig = self._qConfigDeletion.get()
+    def _onNetConfigDeleted(self, delConfig: NetConfig) -> None:
         try:
             configIdx = self._acbag.indexConfig(delConfig)
         except IndexError:
@@ -623,21 +671,70 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
     
     def _initViews(self) -> None:
         """Initializes the interface view and the """
+        self._loadBagCache()
         self._readNetAdaps()
         self._readDnses()
 
+    def _loadBagCache(self) -> None:
+        """Shows the network items of the last session, marked as stale
+        until the live enumeration reconciles them.
+        """
+        from ntwrk.bag_cache import loadBag
+        if self._BAG_CACHE is None:
+            return
+        try:
+            self._acbag = loadBag(self._BAG_CACHE)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logging.warning('failed to load the cache of network items',
+                exc_info=True)
+            return
+        self._adapsvw.populate(self._acbag)
+        self._flags |= _Flags.STALE_ADAPS
+        self._msgvw.AddMessage(
+            _('ADAPS_FROM_CACHE'),
+            type_=MessageType.INFO)
+
+    def _saveBagCache(self) -> None:
+        from ntwrk.bag_cache import saveBag
+        if self._BAG_CACHE is None:
+            return
+        # Skipping if no snapshot has been read yet...
+        try:
+            acbag = self._acbag
+        except AttributeError:
+            return
+        try:
+            saveBag(acbag, self._BAG_CACHE)
+        except OSError:
+            logging.warning('failed to save the cache of network items',
+                exc_info=True)
+
     def _readNetAdaps(self) -> None:
-        """Reads network interfaces."""
+        """Reads network interfaces. The view is left usable while the
+        cached items are being reconciled.
+        """
         from utils.funcs import readNetAdaps
         self._asyncMngr.InitiateOp(
             start_cb=readNetAdaps,
             finish_cb=self._onNetAdapsRead,
-            widgets=(self._adapsvw,))
+            widgets=() if _Flags.STALE_ADAPS & self._flags else
+                (self._adapsvw,))
     
     def _onNetAdapsRead(self, fut: Future[AdapCfgBag]) -> None:
+        from ntwrk import diffBags
         try:
-            self._acbag = fut.result()
-            self._adapsvw.populate(self._acbag)
+            newBag = fut.result()
+            try:
+                self._acbag
+            except AttributeError:
+                self._acbag = newBag
+                self._adapsvw.populate(self._acbag)
+            else:
+                # Applying only the changes since the last snapshot...
+                self._applyBagDiff(diffBags(self._acbag, newBag))
+            self._flags &= (~_Flags.STALE_ADAPS)
         except CancelledError:
             self._msgvw.AddMessage(
                 _('X_CANCELED').format(_('READING_ADAPS')),
@@ -648,16 +745,64 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
                 self._netItemWatcher
                 return
             except AttributeError:
-                self._netItemWatcher = NetItemMonitor(
-                    self,
-                    self._qAdapChange,
-                    self._qAdapCreation,
-                    self._qAdapDeletion,
-                    self._qConfigChange,
-                    self._qConfigCreation,
-                    self._qConfigDeletion,)
+                self._netItemWatcher = createNetItemMonitor(self._netEventBus)
                 self._netItemWatcher.start()
     
+    def _applyBagDiff(self, diff: BagDiff) -> None:
+        """Applies the changes of a newer snapshot to `_acbag`, the views
+        and the info windows.
+        """
+        if diff.isEmpty():
+            return
+        vwIdx = self._adapsvw.getSelectedIdx()
+        touched = {
+            idx.adapIdx
+            for idx in (*diff.removedConfigs, *diff.removedAdaps)}
+        # Removing configs and adapters...
+        for idx in diff.removedAdaps:
+            for config in self._acbag[idx].Configs: # type: ignore
+                self.closeInfoWin(config)
+        for idx in (*diff.removedConfigs, *diff.removedAdaps):
+            self.closeInfoWin(self._acbag[idx])
+            self._acbag.delIdx(idx)
+            self._adapsvw.delIdx(idx)
+        # Adding adapters alongside their configs, then lone configs...
+        for adap in diff.addedAdaps:
+            self._acbag.addAdap(adap)
+            adapIdx = self._acbag.indexAdap(adap)
+            self._adapsvw.addAdap(adap, adapIdx)
+            for configIdx, config in self._acbag.iterConfigs(adapIdx):
+                self._adapsvw.addConfig(config, configIdx)
+        for config in diff.addedConfigs:
+            try:
+                self._acbag.addConfig(config)
+            except (IndexError, ValueError):
+                logging.error('failed to add %s to the bag', config)
+                continue
+            configIdx = self._acbag.indexConfig(config)
+            self._adapsvw.addConfig(config, configIdx)
+            touched.add(configIdx.adapIdx)
+        # Updating modified items in place...
+        for change in diff.modified:
+            change.old.update(change.new)
+            self.refreshInfoWin(change.old)
+            if change.idx.isAdap():
+                if change.fields & NetAdapsView.ADAP_FIELDS:
+                    self._adapsvw.changeAdap(
+                        change.old, # type: ignore
+                        change.idx)
+            else:
+                self._redrawConfig(change.idx, change.fields)
+        # Refreshing the IpsView if its item was affected...
+        if vwIdx is None or vwIdx.adapIdx not in touched:
+            return
+        try:
+            netItem = self._acbag[vwIdx]
+        except IndexError:
+            self._ipsvw.clear()
+        else:
+            self._ipsvw.populate(netItem, self._mpNameDns.values())
+    
     def _readDnses(self) -> None:
         from utils.funcs import listDnses
         self._asyncMngr.InitiateOp(
@@ -745,18 +890,20 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
             return
         netItem = self._acbag[idx]
         try:
-            changed = netItem.update()
-            if changed:
-                if idx.isAdap():
-                    self._qAdapChange.put(netItem) # type: ignore
-                    self.event_generate('<<NetAdapChanged>>')
-                else:
-                    self._qConfigChange.put(netItem) # type: ignore
-                    self.event_generate('<<NetConfigChanged>>')
-            else:
-                logging.debug(f'no important change in {netItem}')
+            fields = netItem.update()
         except RuntimeError as err:
             logging.debug(err)
+            return
+        if not fields:
+            logging.debug(f'no important change in {netItem}')
+            return
+        # Redrawing the item in place...
+        if idx.isAdap():
+            if fields & NetAdapsView.ADAP_FIELDS:
+                self._adapsvw.changeAdap(netItem, idx) # type: ignore
+        else:
+            self._redrawConfig(idx, fields)
+        self.refreshInfoWin(netItem)
 
     def _addDns(self) -> None:
         from .dns_dialog import DnsDialog
@@ -880,6 +1027,67 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
             return None
         return ips
     
+    def _getDnsSearchOrder(
+            self,
+            config: NetConfig,
+            ) -> tuple[IPv4 | IPv6, ...] | None:
+        """Gets the DNS search order of the config as it will be once the
+        pending requests are applied.
+        """
+        ips = self._dnsApplier.pendingOrder(config.Index)
+        if ips is None:
+            return config.DNSServerSearchOrder
+        return ips or None
+    
+    def _submitDnsOrder(
+            self,
+            config: NetConfig,
+            ips: Iterable[IPv4 | IPv6],
+            ) -> None:
+        """Submits the DNS search order to the applier and makes sure its
+        results are polled.
+        """
+        self._dnsApplier.submit(config, ips)
+        if self._afterDnsApplied is None:
+            self._afterDnsApplied = self.after(
+                self._TIMINT_DNS_APPLIED,
+                self._pollDnsApplied)
+
+    def _pollDnsApplied(self) -> None:
+        """Shows all available DNS apply results and polls again while the
+        applier is busy.
+        """
+        # Checking busyness before draining so no result is left behind...
+        busy = self._dnsApplier.isBusy()
+        while True:
+            try:
+                res = self._qDnsApplied.get_nowait()
+            except Empty:
+                break
+            self._showDnsApplyRes(res)
+        if busy:
+            self._afterDnsApplied = self.after(
+                self._TIMINT_DNS_APPLIED,
+                self._pollDnsApplied)
+        else:
+            self._afterDnsApplied = None
+
+    def _showDnsApplyRes(self, res: DnsApplyRes) -> None:
+        if res.code == NetConfigCode.SUCCESSFUL:
+            self._msgvw.AddMessage(
+                _('DNS_APPLIED').format(res.config.Index),
+                type_=MessageType.INFO)
+            return
+        if res.code is None:
+            reason = str(res.error)
+        elif res.code.__doc__ is None:
+            reason = res.code.name
+        else:
+            reason = res.code.__doc__
+        self._msgvw.AddMessage(
+            _('SETTING_IPS_FAILED').format(reason),
+            type_=MessageType.ERROR)
+    
     def _setDnsSearchOrder(self) -> None:
         # Getting the selected config...
         config = self._getSelectedConfig()
@@ -890,13 +1098,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         if ips is None:
             return
         # Setting DNS search order...
-        code = config.setDnsSearchOrder(ips)
-        if code != NetConfigCode.SUCCESSFUL:
-            if code.__doc__ is None:
-                msg = _('SETTING_IPS_FAILED').format(code.name)
-            else:
-                msg = _('SETTING_IPS_FAILED').format(code.__doc__)
-            self._msgvw.AddMessage(msg)
+        self._submitDnsOrder(config, ips)
     
     def _defaultDnsSearchOrder(self) -> None:
         # Getting the selected config...
@@ -904,13 +1106,7 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         if config is None:
             return
         # Setting DNS search order...
-        code = config.setDnsSearchOrder([])
-        if code != NetConfigCode.SUCCESSFUL:
-            if code.__doc__ is None:
-                msg = _('SETTING_IPS_FAILED').format(code.name)
-            else:
-                msg = _('SETTING_IPS_FAILED').format(code.__doc__)
-            self._msgvw.AddMessage(msg)
+        self._submitDnsOrder(config, ())
     
     def _addDnsSearchOrder(self) -> None:
         """Adds selected IPs in the DNS view to the DNS search order of the
@@ -925,20 +1121,14 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
         if newIps is None:
             return
         # Calculating IPs...
-        dnsIps = config.DNSServerSearchOrder
+        dnsIps = self._getDnsSearchOrder(config)
         if dnsIps is not None:
             dnsIps = list(dnsIps)
-            dnsIps.extend(set(newIps).difference(dnsIps))
+            dnsIps.extend(ip for ip in newIps if ip not in dnsIps)
         else:
             dnsIps = newIps
         # Setting DNS search order...
-        code = config.setDnsSearchOrder(dnsIps)
-        if code != NetConfigCode.SUCCESSFUL:
-            if code.__doc__ is None:
-                msg = _('SETTING_IPS_FAILED').format(code.name)
-            else:
-                msg = _('SETTING_IPS_FAILED').format(code.__doc__)
-            self._msgvw.AddMessage(msg)
+        self._submitDnsOrder(config, dnsIps)
     
     def _delDnsSearchOrder(self) -> None:
         """Removes selected IPs in the IPs view to the DNS search order of the
@@ -956,9 +1146,67 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
                 type_=MessageType.ERROR)
             return
         #
-        ips = config.DNSServerSearchOrder
-        ips = list(filter((lambda ip: ip not in delIps), ips))
-        config.setDnsSearchOrder(ips)
+        ips = self._getDnsSearchOrder(config) or ()
+        ips = [ip for ip in ips if ip not in delIps]
+        self._submitDnsOrder(config, ips)
+    
+    def _setDnsSearchOrderAll(self) -> None:
+        """Sets the selected IPs in the DNS view as the DNS search order of
+        all IP-enabled configs, all or none.
+        """
+        from utils.funcs import applyDnsToConfigs
+        ips = self._getSelectedIps()
+        if ips is None:
+            return
+        configs = [
+            config
+            for adapIdx, _adap in self._acbag.iterAdaps()
+            for _cfgIdx, config in self._acbag.iterConfigs(adapIdx)
+            if config.IPEnabled]
+        if not configs:
+            self._msgvw.AddMessage(
+                _('NO_IP_ENABLED_CONFIG'),
+                type_=MessageType.ERROR)
+            return
+        self._asyncMngr.InitiateOp(
+            start_cb=applyDnsToConfigs,
+            start_args=(configs, ips,),
+            finish_cb=self._onDnsBatchApplied,
+            widgets=(self._adapsvw,))
+    
+    def _onDnsBatchApplied(self, fut: Future[DnsBatchRes]) -> None:
+        try:
+            res = fut.result()
+        except CancelledError:
+            self._msgvw.AddMessage(
+                _('X_CANCELED').format(_('APPLYING_DNS_BATCH')),
+                type_=MessageType.INFO)
+            return
+        if res.succeeded():
+            self._msgvw.AddMessage(
+                _('DNS_BATCH_APPLIED').format(
+                    len(res.applied),
+                    len(res.skipped)),
+                type_=MessageType.INFO)
+            return
+        for idx, outcome in res.failed.items():
+            if isinstance(outcome, NetConfigCode):
+                reason = outcome.__doc__ or outcome.name
+            else:
+                reason = str(outcome)
+            self._msgvw.AddMessage(
+                _('SETTING_IPS_FAILED').format(reason),
+                _('CONFIG_TITLE').format(idx),
+                type_=MessageType.ERROR)
+        if res.rollbackFailed:
+            self._msgvw.AddMessage(
+                _('DNS_ROLLBACK_FAILED').format(
+                    ', '.join(str(idx) for idx in res.rollbackFailed)),
+                type_=MessageType.ERROR)
+        elif res.rolledBack:
+            self._msgvw.AddMessage(
+                _('DNS_ROLLED_BACK').format(len(res.rolledBack)),
+                type_=MessageType.WARNING)
     
     def _testUrl(self) -> None:
         #
@@ -983,7 +1231,8 @@ class DnsWin(tk.Tk, LicWinMixin, InfoWinMixin):
             self._IMG_REDX,
             self._IMG_ARROW,
             self._GIF_DWAIT,
-            delimiter=self._SEP_DNS_NAMES)
+            delimiter=self._SEP_DNS_NAMES,
+            rtt_tracker=self._rttTracker)
         dns = dnsDialog.showDialog()
         if dns is None:
             return
@@ -127,6 +127,9 @@ class Widtrix:
 
 
 class IpsView(ttk.Frame):
+    FIELDS = frozenset(('DNSServerSearchOrder', 'DHCPEnabled', 'DHCPServer',))
+    """The fields of configs this view displays."""
+
     def __init__(
             self,
             master: tk.Misc | None = None,
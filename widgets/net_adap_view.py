@@ -26,6 +26,17 @@ class _ConnFlags(enum.IntFlag):
 
 
 class NetAdapsView(tk.Frame):
+    ADAP_FIELDS = frozenset(('NetConnectionID', 'NetConnectionStatus',))
+    """The fields of adapters their rows display."""
+    CONFIG_FIELDS = frozenset(('IPEnabled', 'IPAddress', 'MACAddress',
+        'DefaultIPGateway', 'DNSServerSearchOrder', 'DHCPEnabled',
+        'DHCPServer',))
+    """The fields of configs the connectivity image of their adapter rows
+    depends on.
+    """
+    CONFIG_ROW_FIELDS = frozenset(('Index',))
+    """The fields of configs their rows display."""
+
     def __init__(
             self,
             master: tk.Misc,
@@ -205,8 +216,8 @@ class NetAdapsView(tk.Frame):
         """
         iid = self._acidxToIid(idx)
         self._trvw.delete(iid)
-        del self._mpIdxIid[idx]
-        del self._mpIidIdx[iid]
+        self._mpIdxIid.pop(idx, None)
+        self._mpIidIdx.pop(iid, None)
 
     def changeAdap(self, adap: NetAdap, adap_idx: ACIdx) -> None:
         iid = self._acidxToIid(adap_idx)
@@ -5,7 +5,7 @@
 from ipaddress import IPv4Address as IPv4, IPv6Address as IPv6
 import logging
 from queue import Empty, Queue
-from threading import Event, Thread
+from threading import Event, Lock, Thread
 import tkinter as tk
 from tkinter import ttk
 from typing import Callable, TYPE_CHECKING, Iterable, Iterator
@@ -14,6 +14,8 @@ from urllib.parse import ParseResult
 from db import DnsServer
 from ntwrk import NetConfig, NetConfigCode
 from utils.keyboard import KeyCodes, Modifiers
+from utils.result_sink import IResultSink
+from utils.rtt_tracker import RttTracker
 from utils.types import GifImage, TkImg
 
 type _Iid = str
@@ -41,10 +43,20 @@ class _HttpRes:
             code: int | None = None,
             latency: float = 0.0,
             description: str = '',
+            dns_latency: float = 0.0,
             ) -> None:
         self.code = code
         self.latency = latency
+        """The time spent on accessing the URL."""
         self.description = description
+        self.dnsLatency = dns_latency
+        """The time spent on setting the DNS search order."""
+
+
+type _TestReq = tuple[_Iid, Iterable[IPv4 | IPv6]] | None
+"""A request to test the iid with the IPs, or `None` to stop the tester."""
+type _TestRes = tuple[_Iid, str | _Error | _HttpRes]
+"""A message, an error or a response of testing an iid."""
 
 
 class DnsTesterThrd(Thread):
@@ -52,9 +64,15 @@ class DnsTesterThrd(Thread):
             self,
             url: str,
             config: NetConfig,
-            ips_q: Queue[Iterable[IPv4 | IPv6]],
-            res_q: Queue[str | _Error | _HttpRes],
+            ips_q: Queue[_TestReq],
+            res_q: Queue[_TestRes],
+            rtt_tracker: RttTracker,
+            notify_cb: Callable[[], None],
             ) -> None:
+        """Initializes a new tester. The thread blocks on `ips_q` until a
+        request or `None` arrives, and calls `notify_cb` after putting
+        every result into `res_q`.
+        """
         super().__init__(
             group=None,
             target=None,
@@ -69,55 +87,72 @@ class DnsTesterThrd(Thread):
         """
         self._qIps = ips_q
         self._qRes = res_q
+        self._rtts = rtt_tracker
+        """The tracker which gives timeouts based on the history of every
+        URL and DNS IPs pair and detects dead ones.
+        """
+        self._notify = notify_cb
         self._cancel: Event | None = Event()
-        self._TIMNT_WAIT = 0.1
-        """The timeout waiting for new DNS server."""
+    
+    def _putRes(self, iid: _Iid, res: str | _Error | _HttpRes) -> None:
+        self._qRes.put((iid, res,))
+        self._notify()
     
     def run(self) -> None:
         import socket
-        from time import sleep, monotonic
+        from ntwrk.backend import getBackend
+        from time import monotonic
         from urllib.error import HTTPError, URLError
         from urllib.request import Request, urlopen
         # Getting current DNS
         origIps = self._config.DNSServerSearchOrder
         # Starting main loop...
         while True:
+            # Waiting for the next DNS test or the stop sentinel...
+            req = self._qIps.get()
             # Checking cancel is requested...
-            if self._cancel.is_set(): # type: ignore
+            if req is None or self._cancel.is_set(): # type: ignore
                 self._cancel = None
                 break
-            # Getting next DNS test...
-            try:
-                ips = self._qIps.get_nowait()
-            except Empty:
-                sleep(self._TIMNT_WAIT)
+            iid, ips = req
+            # Skipping servers which have failed consecutively...
+            key = (self._url, tuple(ips),)
+            if self._rtts.isDead(key):
+                self._putRes(iid, _Error(_('SERVER_UNREACHABLE').format(
+                    self._rtts.getFailures(key))))
                 continue
             # Setting new DNS...
-            self._qRes.put(_('SETTING_DNS'))
+            self._putRes(iid, _('SETTING_DNS'))
+            dnsStartTime = monotonic()
             code = self._config.setDnsSearchOrder(ips)
+            dnsLatency = monotonic() - dnsStartTime
             if code != NetConfigCode.SUCCESSFUL:
                 if code.__doc__ is None:
                     msg = _('UNABLE_CHANGE_IPS').format(code.name)
                 else:
                     msg = _('UNABLE_CHANGE_IPS').format(code.__doc__)
-                self._qRes.put(_Error(msg))
+                self._putRes(iid, _Error(msg))
                 continue
             # Checking accessibility of the URL through the newly-set DNS...
-            self._qRes.put(_('ACCESSING_URL'))
-            response = _HttpRes()
+            self._putRes(iid, _('ACCESSING_URL'))
+            response = _HttpRes(dns_latency=dnsLatency)
             startTime = monotonic()
             try:
                 httpReq = Request(self._url, method='HEAD')
-                urlObj = urlopen(httpReq, timeout=5.0)
+                urlObj = urlopen(httpReq, timeout=self._rtts.getTimeout(key))
             except HTTPError as err:
                 finishTime = monotonic()
                 response.code = err.code
                 response.description = _codeToDescr(err.code)
-            except URLError as err:
+                self._rtts.addSample(key, finishTime - startTime)
+            except (URLError, TimeoutError) as err:
                 finishTime = monotonic()
                 # Check if the reason for the URLError is a timeout
-                if isinstance(err.reason, socket.timeout):
+                if isinstance(err, TimeoutError) or isinstance(
+                        err.reason, socket.timeout):
                     response.description = _('TIMEOUT')
+                    # Only timeouts say the servers might be dead...
+                    self._rtts.addFailure(key)
                 else:
                     response.description = str(err)
             else:
@@ -125,25 +160,23 @@ class DnsTesterThrd(Thread):
                 response.code = urlObj.getcode()
                 response.description = _codeToDescr(response.code)
                 urlObj.close()
+                self._rtts.addSample(key, finishTime - startTime)
             response.latency = finishTime - startTime
             # Sending back the result...
-            self._qRes.put(response)
+            self._putRes(iid, response)
         # Rolling back the DNS...
         if origIps is not None:
             self._config.setDnsSearchOrder(origIps)
+        getBackend().release()
     
     def cancel(self) -> None:
+        """Requests the thread to stop. It wakes the thread up immediately
+        if it is waiting for a request.
+        """
         if self._cancel:
             self._cancel.set()
+            self._qIps.put(None)
     
-    def abortCanceling(self) -> None:
-        """Aborts canceling. If canceling is in progress, it raises
-        `TypeError`.
-        """
-        if self._cancel is None:
-            raise TypeError()
-        self._cancel.clear()
-
 
 class UrlDialog(tk.Toplevel):
     def __init__(
@@ -157,9 +190,12 @@ class UrlDialog(tk.Toplevel):
             arrow_img: TkImg,
             wait_gif: GifImage,
             delimiter: str,
+            rtt_tracker: RttTracker | None = None,
             ) -> None:
         """Important arguments:
         * `names_sep`: The delimiter that does not exist in DNS names
+        * `rtt_tracker`: the tracker which keeps round-trip times of URL
+        and DNS IPs pairs across dialogs. If omitted, a fresh one is used.
         """
         super().__init__(master)
         self.title(_('TEST_URL'))
@@ -188,13 +224,31 @@ class UrlDialog(tk.Toplevel):
         self._RES_COL_IDX = 2
         self._DELAY_COL_IDX = 3
         self._TIMINT_AFTER = 40
+        """The interval of animating the wait GIF in milliseconds."""
         self._afterId: str | None = None
+        self._currIid: _Iid | None = None
+        """The iid being tested, or `None` if no test is running."""
+        self._nRemaining = 0
+        """The number of iids whose final results have not arrived."""
         self._SEP = delimiter
         """The delimiter which does not exist in DNS names."""
         self._urlParts: ParseResult | None = None
         self._dnsTester: DnsTesterThrd | None = None
-        self._qIps = Queue[Iterable[IPv4 | IPv6]]()
-        self._qRes = Queue[str | _Error | _HttpRes]()
+        self._qIps = Queue[_TestReq]()
+        self._qRes = Queue[_TestRes]()
+        self._lockNotify = Lock()
+        self._notifyPending = False
+        """Whether a `<<DnsTestResults>>` event is generated but not yet
+        handled, so the tester does not flood the event queue.
+        """
+        self._closing = False
+        self._rtts = RttTracker() if rtt_tracker is None else rtt_tracker
+        self._sink: IResultSink | None = None
+        """The sink which results are written to as they arrive."""
+        self._sinkFile: str = ''
+        """The file chosen by the user to export results to."""
+        self._runId = ''
+        """The unique ID of the current test run."""
         # Initializing the GUI...
         self._initGui()
         self._populateDnses()
@@ -203,6 +257,7 @@ class UrlDialog(tk.Toplevel):
         self.bind('<Escape>', lambda _: self._onCanceled())
         self.bind('<Key>', self._onKeyPressed)
         self.protocol('WM_DELETE_WINDOW', self._onCanceled)
+        self.bind('<<DnsTestResults>>', self._onTestResults)
         #
         self.after(10, self._centerDialog, master)
     
@@ -223,19 +278,38 @@ class UrlDialog(tk.Toplevel):
         y = int(y) + (parent.winfo_height() - self.winfo_height()) // 2
         self.geometry(f'+{x}+{y}')
     
-    def _onApproved(self) -> None:
+    def _stopTester(self) -> None:
+        """Cancels the tester and destroys the dialog once the tester has
+        rolled back the DNS. It returns immediately and is safe to call
+        more than once.
+        """
+        if self._closing:
+            return
+        self._closing = True
+        if self._afterId:
+            self.after_cancel(self._afterId)
+            self._afterId = None
         if self._dnsTester:
             self._dnsTester.cancel()
-            self._dnsTester.join()
-        self._result = None
+        self._closeSink()
+        self._destroyWhenStopped()
+    
+    def _destroyWhenStopped(self) -> None:
+        """Polls the tester from the Tk event loop and destroys the dialog
+        after the tester exits, so the Tk thread never blocks on it.
+        """
+        if self._dnsTester and self._dnsTester.is_alive():
+            self.after(self._TIMINT_AFTER, self._destroyWhenStopped)
+            return
         self.destroy()
 
+    def _onApproved(self) -> None:
+        self._result = None
+        self._stopTester()
+
     def _onCanceled(self) -> None:
-        if self._dnsTester:
-            self._dnsTester.cancel()
-            self._dnsTester.join()
         self._result = None
-        self.destroy()
+        self._stopTester()
     
     def _initGui(self) -> None:
         #
@@ -333,6 +407,92 @@ class UrlDialog(tk.Toplevel):
             width=10,
             command=self._onCanceled)
         self._btn_cancel.pack(side=tk.RIGHT, padx=5, pady=5)
+        #
+        self._btn_export = ttk.Button(
+            self._frm_btns,
+            text=_('EXPORT'),
+            width=10,
+            command=self._chooseSinkFile)
+        self._btn_export.pack(side=tk.LEFT, padx=5, pady=5)
+        #
+        self._lbl_export = ttk.Label(self._frm_btns)
+        self._lbl_export.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+    
+    def _chooseSinkFile(self) -> None:
+        """Asks the user for the file to export results to."""
+        from tkinter.filedialog import asksaveasfilename
+        file = asksaveasfilename(
+            parent=self,
+            title=_('EXPORT'),
+            defaultextension='.csv',
+            filetypes=(
+                (_('CSV_FILES'), '*.csv'),
+                (_('JSONL_FILES'), '*.jsonl'),
+                (_('SQLITE_FILES'), '*.db3'),))
+        if not file:
+            return
+        self._sinkFile = file
+        self._lbl_export.config(text=file)
+    
+    def _openSink(self) -> None:
+        """Opens the sink of the chosen file if any. Upon failure, it
+        informs the user and the run goes on without exporting.
+        """
+        from utils.result_sink import openSink
+        if not self._sinkFile:
+            return
+        try:
+            self._sink = openSink(self._sinkFile)
+        except (OSError, ValueError) as err:
+            logging.error('cannot open %s: %s', self._sinkFile, err)
+            self._lbl_export.config(text=_('EXPORT_FAILED').format(err))
+    
+    def _closeSink(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+    
+    def _exportRes(
+            self,
+            iid: _Iid,
+            res: _HttpRes | None = None,
+            err_msg: str = '',
+            ) -> None:
+        """Writes the result of the specified iid, either a `_HttpRes` or
+        an error message, to the sink if any.
+        """
+        from utils.result_sink import ResultRecord
+        if self._sink is None:
+            return
+        iid_ = self._getIssuedIid(iid)
+        if iid_ == self._getIssuedIid('DHCP'):
+            server, ip = _('DHCP'), ''
+        else:
+            server = iid_.split(self._SEP)[0]
+            ip = str(self._getIpByIid(iid))
+        if res is None:
+            record = ResultRecord(
+                self._runId,
+                self._svar_url.get(),
+                server,
+                ip,
+                status=err_msg,)
+        else:
+            record = ResultRecord(
+                self._runId,
+                self._svar_url.get(),
+                server,
+                ip,
+                dns_secs=res.dnsLatency,
+                url_secs=res.latency,
+                code=res.code,
+                status=res.description,)
+        try:
+            self._sink.write(record)
+        except Exception as err:
+            logging.error('exporting results failed: %s', err)
+            self._lbl_export.config(text=_('EXPORT_FAILED').format(err))
+            self._closeSink()
     
     def _getSelectedValues(
             self,
@@ -394,78 +554,86 @@ class UrlDialog(tk.Toplevel):
                     self._mpReqIssued[reqIid] = issuedIid
     
     def _start(self) -> None:
+        from uuid import uuid4
         self._btn_startOk.config(text=_('OK'))
         self._btn_startOk.config(state=tk.DISABLED)
         self._entry_url.config(state=tk.DISABLED)
-        #
-        ipsIter = self._iterChildIids()
-        iid = self._getIssuedIid('DHCP')
-        self._qIps.put([])
+        self._btn_export.config(state=tk.DISABLED)
+        self._runId = uuid4().hex
+        self._openSink()
+        # Enqueuing all tests upfront followed by the stop sentinel...
+        self._qIps.put((self._getIssuedIid('DHCP'), [],))
+        self._nRemaining = 1
+        for iid in self._iterChildIids():
+            self._qIps.put((iid, [self._getIpByIid(iid)],))
+            self._nRemaining += 1
+        self._qIps.put(None)
         #
         self._dnsTester = DnsTesterThrd(
             self._svar_url.get(),
             self._config,
             self._qIps,
-            self._qRes)
+            self._qRes,
+            self._rtts,
+            self._notifyResults)
         self._dnsTester.start()
-        self._afterId = self.after(
-            self._TIMINT_AFTER,
-            self._pollResult,
-            iid,
-            ipsIter)
+        self._afterId = self.after(self._TIMINT_AFTER, self._animateWait)
     
-    def _pollResult(
-            self,
-            curr_iid: _Iid,
-            iter_: Iterator[_Iid],
-            ) -> None:
-        # Polling for the result...
-        try:
-            res = self._qRes.get_nowait()
-        except Empty:
-            self._updateWaitGif(curr_iid)
-            nextIp = False
-        else:
+    def _notifyResults(self) -> None:
+        """Called by the tester thread after putting a result. It
+        generates `<<DnsTestResults>>` only if there is no such event
+        pending, so results arriving meanwhile are handled in one batch.
+        """
+        with self._lockNotify:
+            if self._notifyPending or self._closing:
+                return
+            self._notifyPending = True
+        self.event_generate('<<DnsTestResults>>', when='tail')
+    
+    def _onTestResults(self, _: tk.Event | None = None) -> None:
+        """Handles all results available in the queue."""
+        with self._lockNotify:
+            self._notifyPending = False
+        if self._closing:
+            return
+        while True:
+            try:
+                iid, res = self._qRes.get_nowait()
+            except Empty:
+                break
             if isinstance(res, str):
-                self._showMsg(curr_iid, res)
-                self._updateWaitGif(curr_iid)
-                nextIp = False
+                self._currIid = iid
+                self._showMsg(iid, res)
+                continue
             elif isinstance(res, _Error):
-                self._showMsg(curr_iid, res.msg)
-                self._showErrImg(curr_iid)
-                nextIp = True
+                self._showMsg(iid, res.msg)
+                self._showErrImg(iid)
+                self._exportRes(iid, err_msg=res.msg)
             elif isinstance(res, _HttpRes):
-                self._mpNameRes[curr_iid] = res
-                self._showRes(curr_iid, res)
-                self._showResImg(curr_iid)
-                nextIp = True
-        # Scheduling next action...
-        if nextIp: # type: ignore
-            self._afterId = self.after(
-                self._TIMINT_AFTER,
-                self._testNextIp,
-                iter_,)
-        else:
-            self._afterId = self.after(
-                self._TIMINT_AFTER,
-                self._pollResult,
-                curr_iid,
-                iter_,)
+                self._mpNameRes[iid] = res
+                self._showRes(iid, res)
+                self._showResImg(iid)
+                self._exportRes(iid, res)
+            self._currIid = None
+            self._nRemaining -= 1
+        if self._nRemaining <= 0 and self._dnsTester:
+            self._finish()
     
-    def _testNextIp(self, child_iter: Iterator[_Iid]) -> None:
-        try:
-            curr_iid = next(child_iter)
-        except StopIteration:
-            # Process finished...
-            self._btn_startOk.config(state=tk.NORMAL)
-        else:
-            ip = self._getIpByIid(curr_iid)
-            self._qIps.put([ip,])
-            self._afterId = self.after(
-                self._TIMINT_AFTER,
-                self._pollResult,
-                curr_iid,
-                child_iter,)
+    def _finish(self) -> None:
+        """Finalizes the run after the last result."""
+        if self._afterId:
+            self.after_cancel(self._afterId)
+            self._afterId = None
+        self._closeSink()
+        self._btn_startOk.config(state=tk.NORMAL)
+    
+    def _animateWait(self) -> None:
+        """Animates the wait GIF of the iid being tested while the run is
+        in progress.
+        """
+        if self._currIid is not None:
+            self._updateWaitGif(self._currIid)
+        self._afterId = self.after(self._TIMINT_AFTER, self._animateWait)
     
     def _updateWaitGif(self, iid: _Iid) -> None:
         self._trvw.see(iid)